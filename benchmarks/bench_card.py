@@ -0,0 +1,52 @@
+"""
+Compares the memory taken by the full dataset as dicts and as `Card` records.
+
+`data/full.csv` is loaded twice, as the plain dicts `read_from_csv` used to return
+and as `Card` records, and the memory allocated for each is measured with
+`tracemalloc`.
+
+From the project root directory, type:
+    python -m benchmarks.bench_card
+"""
+import csv
+import gc
+import tracemalloc
+from tcg.card import Card
+from tcg.utils import DEFAULT_EMPTY
+
+FULL_CSV = "data/full.csv"
+
+
+def load_dicts() -> list[dict[str, str | None]]:
+    with open(FULL_CSV, mode="r", newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        return [{k: v if v != "" else DEFAULT_EMPTY for k, v in row.items()} for row in reader]
+
+
+def load_cards() -> list[Card]:
+    return [Card.from_dict(row) for row in load_dicts()]
+
+
+def measure(load) -> tuple[int, int]:
+    """Returns the number of cards loaded and the memory (in bytes) they hold."""
+    gc.collect()
+    tracemalloc.start()
+    cards = load()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(cards), size
+
+
+def main():
+    num_cards, dict_size = measure(load_dicts)
+    _, card_size = measure(load_cards)
+
+    print(f"{num_cards} cards")
+    print(f" dicts: {dict_size / 1e6:6.2f} MB ({dict_size / num_cards:6.0f} B/card)")
+    print(f" Cards: {card_size / 1e6:6.2f} MB ({card_size / num_cards:6.0f} B/card)")
+    print(f"Cards take {card_size / dict_size:.0%} of the memory of dicts")
+
+
+if __name__ == "__main__":
+    main()
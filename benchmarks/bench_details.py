@@ -0,0 +1,71 @@
+"""
+Compares scanning the details table of a card page with parsing the whole page.
+
+Card pages on Game8 weigh hundreds of KB (navigation, comments, related cards...)
+while the fields read by `extract_extra_card_details` sit in one table near the
+top. The recorded detail pages of `tests/fixtures/pages` are padded with `--kb` KB
+of filler markup before and after the details table, and each page is read with
+`parser_scan.scan_card_details` and with `parser.parse_card_details` (BeautifulSoup).
+
+From the project root directory, type:
+    python -m benchmarks.bench_details --kb 300
+"""
+import argparse
+import time
+import tracemalloc
+from tcg.parser import parse_card_details
+from tcg.parser_scan import find_details_table, scan_card_details
+from tests.server import DETAIL_EXTS, PAGES_DIR
+
+# Markup repeated to pad the pages, like the lists and blocks around the details table
+FILLER_BLOCK = (
+    '<div class="a-block"><ul class="a-list"><li><a href="/games/pokemon-tcg-pocket/archives/1">'
+    '<img src="https://img.game8.co/1.png" alt="Card" width="40"> Related card</a></li></ul>'
+    "<!-- ad slot --><p>Some <b>text</b> about the card.</p></div>\n"
+)
+
+
+def build_detail_page(ext: str, size_kb: int) -> str:
+    """Returns a recorded detail page with `size_kb` KB of filler, split around the details table."""
+    page_html = (PAGES_DIR / f"{ext}.html").read_text(encoding="utf-8")
+    filler = FILLER_BLOCK * (size_kb * 1024 // len(FILLER_BLOCK) // 2)
+    start = find_details_table(page_html)
+    body_end = page_html.rindex("</body>")
+    return page_html[:start] + filler + page_html[start:body_end] + filler + page_html[body_end:]
+
+
+def run(name: str, parse, pages: list[tuple[str, bool]], repeat: int) -> tuple[list[dict], float, float]:
+    """Times `parse` on every page, keeping the best of `repeat` runs, and measures its peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        details = [parse(page_html, is_trainer) for page_html, is_trainer in pages]
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    for page_html, is_trainer in pages:
+        parse(page_html, is_trainer)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"{name:>5}: {best / len(pages) * 1e3:8.2f} ms/page | peak memory {peak / 1e6:7.2f} MB")
+    return details, best, peak
+
+
+def main(size_kb: int = 300, repeat: int = 3):
+    pages = [(build_detail_page(ext, size_kb), is_trainer) for ext in DETAIL_EXTS for is_trainer in (False, True)]
+    print(f"{len(pages)} card pages of {len(pages[0][0]) / 1e3:.0f} KB")
+
+    scan_details, scan_time, scan_peak = run("scan", scan_card_details, pages, repeat)
+    full_details, full_time, full_peak = run("full", parse_card_details, pages, repeat)
+
+    assert scan_details == full_details, "The parsers returned different details"
+    print(f"Speedup: x{full_time / scan_time:.1f}, peak memory x{full_peak / scan_peak:.1f} lower")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--kb", type=int, default=300, help="Size of the filler of each page in KB (default: 300).")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per parser, best is kept (default: 3).")
+    args = arg_parser.parse_args()
+    main(size_kb=args.kb, repeat=args.repeat)
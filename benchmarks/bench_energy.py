@@ -0,0 +1,77 @@
+"""
+Compares the per-energy `rsplit` parsing of move costs with `parse_energy_costs`.
+
+Both call sites are measured on the move costs of `data/raw_from_web3.json`:
+- the cost icons of a move (`extract_move_info`), given as a list of `alt` texts
+  (e.g. `["Grass 2", "Colorless"]`),
+- the cost strings of `json_convert.clean_csv` (e.g. `"Grass 2:Colorless"`).
+
+From the project root directory, type:
+    python -m benchmarks.bench_energy
+"""
+import json
+import timeit
+from tcg.utils import ENERGY_SYMBOLS, _tokenize_energy_costs, parse_energy_costs
+
+RAW_JSON = "data/raw_from_web3.json"
+REPEATS = 5
+
+
+def legacy_parse_energy_cost(energy_str: str) -> str:
+    """`parse_energy_cost` before the tokenizer: one `rsplit` and lookup per energy."""
+    parts = energy_str.rsplit(" ", 1)
+    match len(parts):
+        case 1:
+            type_name = energy_str
+            count = 1
+        case 2:
+            type_name = parts[0]
+            count = int(parts[1]) if parts[1].isdigit() else 1
+    return ENERGY_SYMBOLS.get(type_name, "?") * count
+
+
+def legacy_alts(cost_alts: list[str]) -> str:
+    return "".join(legacy_parse_energy_cost(alt) for alt in cost_alts)
+
+
+def legacy_text(text: str) -> str:
+    textlist = text.split(":") if ":" in text else text.split(";")
+    return "".join([legacy_parse_energy_cost(x.strip()) for x in textlist])
+
+
+def load_costs() -> list[str]:
+    with open(RAW_JSON, "r", encoding="utf-8") as f:
+        cards = json.load(f)["cardArraySchema"]["cards"]
+    return [
+        move["energy_cost"]
+        for card in cards
+        if card.get("card_type") == "Pokemon"
+        for move in card.get("moves", [])
+        if move.get("energy_cost")
+    ]
+
+
+def best_time(func, inputs) -> float:
+    return min(timeit.repeat(lambda: [func(x) for x in inputs], number=1, repeat=REPEATS))
+
+
+def main():
+    texts = load_costs()
+    alts = [[alt.strip() for alt in text.split(":")] for text in texts]
+
+    for site, inputs, legacy in [
+        ("extract_move_info (alt lists)", alts, legacy_alts),
+        ("clean_csv (cost strings)", texts, legacy_text),
+    ]:
+        assert [legacy(x) for x in inputs] == [parse_energy_costs(x) for x in inputs]
+        _tokenize_energy_costs.cache_clear()
+        legacy_time = best_time(legacy, inputs)
+        new_time = best_time(parse_energy_costs, inputs)
+        print(f"{site}: {len(inputs)} costs")
+        print(f" rsplit per energy: {legacy_time * 1e3:7.2f} ms")
+        print(f" parse_energy_costs: {new_time * 1e3:7.2f} ms ({legacy_time / new_time:.1f}x)")
+    print(_tokenize_energy_costs.cache_info())
+
+
+if __name__ == "__main__":
+    main()
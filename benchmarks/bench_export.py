@@ -0,0 +1,70 @@
+"""
+Compares loading the cards from `data/full.csv` and from its Parquet export.
+
+The CSV is loaded the way downstream code does it (`pd.read_csv`, then retyping
+the integer and categorical columns), and the Parquet dataset with `read_parquet`,
+both in full and for two columns only.
+
+With `--scale N` the cards are repeated N times, to see how both loads grow
+with the number of cards.
+
+From the project root directory, type:
+    python -m benchmarks.bench_export --scale 50
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+from tcg.export import CATEGORICAL_COLUMNS, INT_COLUMNS, read_parquet, write_parquet
+from tcg.io import read_from_csv, write_to_csv
+
+FULL_CSV = Path("data/full.csv")
+
+
+def load_csv(csv_file: Path) -> pd.DataFrame:
+    """Loads and retypes a card CSV like the Parquet export is typed."""
+    df = pd.read_csv(csv_file)
+    for column in INT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int32")
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype("category")
+    return df
+
+
+def best_time(func, repeat: int = 10) -> float:
+    """Returns the best duration (in seconds) of `repeat` calls to `func`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(scale: int = 1):
+    cards_data = read_from_csv(FULL_CSV) * scale
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = Path(tmp_dir) / "full.csv"
+        dataset_dir = Path(tmp_dir) / "full_parquet"
+        write_to_csv(cards_data, csv_file)
+        write_parquet(cards_data, dataset_dir)
+
+        csv_size = csv_file.stat().st_size
+        parquet_size = sum(path.stat().st_size for path in dataset_dir.rglob("*.parquet"))
+        print(f"{len(cards_data)} cards")
+        print(f"Size: CSV {csv_size / 1e3:.0f} kB | Parquet {parquet_size / 1e3:.0f} kB")
+
+        csv_time = best_time(lambda: load_csv(csv_file))
+        parquet_time = best_time(lambda: read_parquet(dataset_dir))
+        columns_time = best_time(lambda: read_parquet(dataset_dir, columns=["number", "HP"]))
+        print(f"Load all columns: CSV {csv_time * 1e3:.1f} ms | Parquet {parquet_time * 1e3:.1f} ms")
+        print(f"Load number and HP: Parquet {columns_time * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--scale", type=int, default=1, help="Times the cards are repeated (default: 1).")
+    args = arg_parser.parse_args()
+    main(scale=args.scale)
@@ -0,0 +1,105 @@
+"""
+Times the JSON to cleaned CSV conversion of `tcg.json_convert` on larger dumps.
+
+The cards of `data/raw_from_web3.json` are repeated 1, 10 and 100 times, then
+flattened and cleaned twice: with the row-by-row loops and `Series.apply` the
+conversion used to run, and with `flatten_cards` / `clean_csv`. Both must give
+the same cleaned CSV.
+
+From the project root directory, type:
+    python -m benchmarks.bench_json_convert [--scales 1 10 100]
+"""
+import argparse
+import json
+import time
+import pandas as pd
+from tcg import utils
+from tcg.json_convert import (
+    CLEANED_COLUMNS,
+    COLUMNS_TO_REMOVE,
+    RENAMED_COLUMNS,
+    clean_csv,
+    flatten_cards,
+)
+
+RAW_JSON = "data/raw_from_web3.json"
+
+
+def legacy_flatten(cards, list_key="moves"):
+    max_items = max(len(card.get(list_key, [])) for card in cards)
+    nested_keys = []
+    for card in cards:
+        for item in card.get(list_key, []):
+            nested_keys += [key for key in item if key not in nested_keys]
+
+    flattened_list = []
+    for card in cards:
+        flat_card = {k: v for k, v in card.items() if k != list_key}
+        current_nested_list = card.get(list_key, [])
+        for i in range(max_items):
+            move_data = current_nested_list[i] if i < len(current_nested_list) else {}
+            for key in nested_keys:
+                flat_card[f"{list_key}{i + 1}_{key}"] = move_data.get(key, "")
+        flattened_list.append(flat_card)
+    return pd.DataFrame(flattened_list)
+
+
+def legacy_clean(df):
+    df = df.drop(columns=COLUMNS_TO_REMOVE, errors="ignore").rename(columns=RENAMED_COLUMNS)
+    df = df[[col for col in CLEANED_COLUMNS if col in df.columns]]
+
+    df["ex"] = df["ex"].apply(lambda v: 2 if v == "ex" else 3 if v == "Mega Evolution ex" else 1)
+    df.loc[(df["ex"] == 1) & (df["card_type"] != "Pokemon"), "ex"] = 0
+
+    def energy_text_to_symbols(text):
+        if not text:
+            return ""
+        textlist = text.split(":") if ":" in text else text.split(";")
+        return "".join([utils.parse_energy_cost(x.strip()) for x in textlist])
+
+    df["move1_cost"] = df["move1_cost"].apply(energy_text_to_symbols)
+    df["move2_cost"] = df["move2_cost"].apply(energy_text_to_symbols)
+    df.loc[df["card_type"] == "Trainer", "move1_cost"] = ""
+    df.loc[df["card_type"] == "Trainer", "move2_cost"] = ""
+    df.loc[df["card_type"] == "Trainer", "stage"] = ""
+    df.loc[df["pokemon_type"] == "Tool", "pokemon_type"] = "Pokemon Tool"
+    df.loc[df["id"] == "A4 177", "hp"] = "60"
+    return df
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(scales: list[int]):
+    with open(RAW_JSON, "r", encoding="utf-8") as f:
+        cards = json.load(f)["cardArraySchema"]["cards"]
+
+    for scale in scales:
+        scaled_cards = cards * scale
+        print(f"x{scale}: {len(scaled_cards)} cards")
+
+        flat, legacy_flatten_time = timed(legacy_flatten, scaled_cards)
+        legacy_csv, legacy_clean_time = timed(legacy_clean, flat)
+        del flat
+
+        flat, flatten_time = timed(flatten_cards, scaled_cards)
+        cleaned, clean_time = timed(clean_csv, flat)
+        del flat
+
+        assert cleaned.to_csv(index=False) == legacy_csv.to_csv(index=False)
+        for step, legacy_time, new_time in [
+            ("flatten", legacy_flatten_time, flatten_time),
+            ("clean", legacy_clean_time, clean_time),
+        ]:
+            print(f" {step:8} row-wise: {legacy_time:7.2f} s  vectorized: {new_time:7.2f} s"
+                  f" ({legacy_time / new_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Dump sizes, as multiples of the raw dump.")
+    args = parser.parse_args()
+    main(args.scales)
@@ -0,0 +1,67 @@
+"""
+Compares the peak memory of loading a JSON dump whole and of streaming it.
+
+Dumps with the cards of `data/raw_from_web3.json` repeated 1, 10 (and more)
+times are written to a temporary directory, then converted to the flattened and
+cleaned CSVs with `flatten_pokemon_data` + `clean_csv` (whole dump in memory) and
+with `convert_json_streaming`. The peak memory allocated during each conversion
+is measured with `tracemalloc`.
+
+From the project root directory, type:
+    python -m benchmarks.bench_json_ingest [--scales 1 10]
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from tcg.json_convert import clean_csv, convert_json_streaming, flatten_pokemon_data
+
+RAW_JSON = "data/raw_from_web3.json"
+
+
+def convert_whole(input_json_path, flattened_path, cleaned_path):
+    df = flatten_pokemon_data(input_json_path)
+    df.to_csv(flattened_path, index=False, encoding="utf-8")
+    clean_csv(df).to_csv(cleaned_path, index=False, encoding="utf-8")
+
+
+def measure(convert, *args) -> tuple[float, int]:
+    """Returns the time (in s) and peak memory (in bytes) of `convert(*args)`."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    convert(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(scales: list[int]):
+    with open(RAW_JSON, "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+    cards = raw_data["cardArraySchema"]["cards"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dump = os.path.join(tmp_dir, "dump.json")
+        outputs = [os.path.join(tmp_dir, name) for name in ("flattened.csv", "cleaned.csv")]
+        for scale in scales:
+            raw_data["cardArraySchema"]["cards"] = cards * scale
+            with open(dump, "w", encoding="utf-8") as f:
+                json.dump(raw_data, f, ensure_ascii=False)
+            size = os.path.getsize(dump)
+
+            print(f"x{scale}: {len(cards) * scale} cards, {size / 1e6:.0f} MB dump")
+            for mode, convert in [("whole", convert_whole), ("stream", convert_json_streaming)]:
+                elapsed, peak = measure(convert, dump, *outputs)
+                print(f" {mode:6}: {elapsed:6.2f} s, peak {peak / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="Dump sizes, as multiples of the raw dump.")
+    args = parser.parse_args()
+    main(args.scales)
@@ -0,0 +1,66 @@
+"""
+Times the extraction of several cached packs with 1, 2, 4... processes.
+
+Packs are built by repeating the rows of the recorded pack page in
+`tests/fixtures/pages` and served by the local `FixtureServer`. A first pass fills
+a temporary response cache, so the timed passes only read pages from the cache
+and the time is spent parsing, as when re-running on cached pages.
+
+From the project root directory, type:
+    python -m benchmarks.bench_packs --packs 16 --rows 200 --processes 1 2 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from tcg import web
+from tcg.cache import ResponseCache
+from tcg.io import iter_packs, set_parser
+from tests.server import PAGES_DIR, FixtureServer, build_pack_page
+
+
+def extract(pack_urls: list[str], processes: int) -> tuple[list, float]:
+    """Returns the cards of every pack and the time taken, with the output of the extraction hidden."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cards = list(iter_packs(pack_urls, processes=processes))
+    return cards, time.perf_counter() - start
+
+
+def main(num_packs: int, num_rows: int, processes_counts: list[int], parser: str):
+    set_parser(parser)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pages_dir = shutil.copytree(PAGES_DIR, Path(tmp_dir) / "pages")
+        page_html = build_pack_page(lambda rows: [rows[i % len(rows)] for i in range(num_rows)])
+        exts = [str(900000 + i) for i in range(num_packs)]
+        for ext in exts:
+            (pages_dir / f"{ext}.html").write_text(page_html, encoding="utf-8")
+
+        web.set_cache(ResponseCache(Path(tmp_dir) / "cache"))
+        with FixtureServer(pages_dir=pages_dir) as server:
+            pack_urls = [server.url(ext) for ext in exts]
+            expected, _ = extract(pack_urls, processes=1)
+
+            print(f"{num_packs} packs x {num_rows} rows, {parser} parser, {os.cpu_count()} CPUs")
+            base_time = None
+            for processes in processes_counts:
+                cards, elapsed = extract(pack_urls, processes)
+                assert cards == expected
+                base_time = base_time or elapsed
+                print(f" {processes:2} processes: {elapsed:6.2f} s ({base_time / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packs", type=int, default=16, help="Number of packs (default: 16).")
+    parser.add_argument("--rows", type=int, default=200, help="Card rows per pack (default: 200).")
+    parser.add_argument(
+        "--processes", type=int, nargs="+", default=[1, 2, 4], help="Process counts to time (default: 1 2 4)."
+    )
+    parser.add_argument("--parser", choices=["bs4", "lxml"], default="bs4", help="Pack table parser (default: bs4).")
+    args = parser.parse_args()
+    main(args.packs, args.rows, args.processes, args.parser)
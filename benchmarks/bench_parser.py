@@ -0,0 +1,79 @@
+"""
+Compares the BeautifulSoup and lxml pack table parsers.
+
+A large pack page is built by repeating the rows of the recorded pack page in
+`tests/fixtures/pages`, and both parsers extract every card from it. The detail
+page download is replaced by fixed values so only the row parsing is timed.
+
+From the project root directory, type:
+    python -m benchmarks.bench_parser --rows 1000
+"""
+import argparse
+import time
+from bs4 import BeautifulSoup
+from tcg import parser, parser_lxml
+from tests.server import build_pack_page
+
+
+def bs4_rows(page_html: str) -> list:
+    """Finds the card rows the same way as `fetch_html_table` and `fetch_card_rows`."""
+    soup = BeautifulSoup(page_html, "lxml")
+    for table in soup.find_all("table", class_=["a-table", "table--fixed", "flexible-cell"]):
+        thead = table.find("thead")
+        if thead and thead.find("tr").find(["th", "td"]).get_text(strip=True) == "✔":
+            return table.find("tbody").find_all("tr")
+    return []
+
+
+def run(name: str, find_rows, extract_card, page_html: str, repeat: int) -> tuple[list[dict], float, float]:
+    """Times `find_rows` and `extract_card` on `page_html`, keeping the best of `repeat` runs."""
+    best_parse = best_extract = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = find_rows(page_html)
+        parsed = time.perf_counter()
+        cards = [extract_card(row) for row in rows]
+        done = time.perf_counter()
+        best_parse = min(best_parse, parsed - start)
+        best_extract = min(best_extract, done - parsed)
+
+    per_row = best_extract / len(rows) * 1e6
+    print(
+        f"{name:>5}: page parse {best_parse * 1e3:8.1f} ms | "
+        f"rows {best_extract * 1e3:8.1f} ms ({per_row:6.1f} us/row)"
+    )
+    return cards, best_parse, best_extract
+
+
+def main(num_rows: int = 1000, repeat: int = 3):
+    page_html = build_pack_page(lambda rows: [rows[i % len(rows)] for i in range(num_rows)])
+    page_html = page_html.replace("{base}", "https://game8.co")
+    print(f"Pack page with {num_rows} rows ({len(page_html) / 1e6:.1f} MB)")
+
+    # Only time the row parsing, not the detail page downloads
+    parser.extract_extra_card_details = lambda url, is_trainer: {
+        "generation": "1",
+        "illustrator": "Illustrator",
+        "weakness": None if is_trainer else "Fire",
+    }
+
+    bs4_cards, bs4_parse, bs4_extract = run(
+        "bs4", bs4_rows, parser.extract_card, page_html, repeat
+    )
+    lxml_cards, lxml_parse, lxml_extract = run(
+        "lxml", parser_lxml.find_card_rows, parser_lxml.extract_card, page_html, repeat
+    )
+
+    assert lxml_cards == bs4_cards, "The parsers returned different cards"
+    print(
+        f"Speedup: page parse x{bs4_parse / lxml_parse:.1f}, rows x{bs4_extract / lxml_extract:.1f}, "
+        f"total x{(bs4_parse + bs4_extract) / (lxml_parse + lxml_extract):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=1000, help="Number of card rows (default: 1000).")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per parser, best is kept (default: 3).")
+    args = arg_parser.parse_args()
+    main(num_rows=args.rows, repeat=args.repeat)
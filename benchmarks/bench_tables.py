@@ -0,0 +1,64 @@
+"""
+Compares the full and partial (`SoupStrainer`) parse of a pack page in `find_html_table`.
+
+A pack page is built from the recorded one in `tests/fixtures/pages`, with its card
+rows repeated and its comment section padded to look like a real Game8 page. Both
+modes must find the same table; their time and peak memory are printed.
+
+From the project root directory, type:
+    python -m benchmarks.bench_tables --rows 300 --comments 3000
+"""
+import argparse
+import time
+import tracemalloc
+from tcg.io import find_html_table
+from tests.server import build_pack_page
+
+COMMENT = (
+    '<div class="comment"><div class="comment__header"><span class="name">Anonymous</span>'
+    '<span class="date">2025-01-01</span></div><p class="comment__body">Great list! '
+    '<a href="/games/Pokemon-TCG-Pocket">Top</a></p></div>'
+)
+
+
+def measure(page_html: str, partial: bool, repeat: int) -> tuple[str, float, float]:
+    """Returns the found table, the best time (in seconds) and the peak memory (in bytes)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = find_html_table(page_html, "pack", partial=partial)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    find_html_table(page_html, "pack", partial=partial)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return str(table), best, peak
+
+
+def main(num_rows: int = 300, num_comments: int = 3000, repeat: int = 3):
+    page_html = build_pack_page(lambda rows: [rows[i % len(rows)] for i in range(num_rows)]).replace(
+        '<section class="comments">', '<section class="comments">' + COMMENT * num_comments
+    )
+    print(f"Pack page with {num_rows} rows and {num_comments} comments ({len(page_html) / 1e6:.1f} MB)")
+
+    full_table, full_time, full_peak = measure(page_html, partial=False, repeat=repeat)
+    partial_table, partial_time, partial_peak = measure(page_html, partial=True, repeat=repeat)
+    assert partial_table == full_table, "The parse modes found different tables"
+
+    for name, seconds, peak in [
+        ("full", full_time, full_peak),
+        ("partial", partial_time, partial_peak),
+    ]:
+        print(f"{name:>7}: {seconds * 1e3:8.1f} ms | peak memory {peak / 1e6:7.1f} MB")
+    print(f"Partial parse: time x{full_time / partial_time:.1f}, memory x{full_peak / partial_peak:.1f}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=300, help="Number of card rows (default: 300).")
+    arg_parser.add_argument("--comments", type=int, default=3000, help="Number of comments (default: 3000).")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per mode, best is kept (default: 3).")
+    args = arg_parser.parse_args()
+    main(num_rows=args.rows, num_comments=args.comments, repeat=args.repeat)
@@ -0,0 +1,195 @@
+"""
+Offline benchmark suite of the parsing pipeline.
+
+Every stage runs on the recorded Game8 pages of `tests/fixtures/pages` (main page,
+pack page and card detail pages, served by the local `FixtureServer` through a
+temporary response cache), so no network access is needed:
+- `find_html_table[main]` / `find_html_table[pack]`: the parsing done by `fetch_html_table`
+- `extract_cell9`, `extract_move_info`, `extract_card`: the row parsers of `tcg.parser`
+- `write_to_csv`: writing `CSV_CARDS` cards
+- `clean_csv`: cleaning the flattened `data/raw_from_web3.json`
+
+Each stage reports its time per call, its throughput (cards, moves or pages per
+second) and the peak memory allocated during one call (`tracemalloc`). Results are
+appended to `benchmarks/results.jsonl` with the current commit, and compared to the
+previous run so regressions between commits stand out.
+
+From the project root directory, type:
+    python -m benchmarks.suite [--only extract_card clean_csv] [--no-save]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+from tcg import web
+from tcg.cache import ResponseCache
+from tcg.io import find_html_table, write_to_csv
+from tcg.json_convert import clean_csv, flatten_pokemon_data, input_json_path
+from tcg.parser import TRAINER_TYPES, extract_card, extract_cell9, extract_move_info
+from tcg.utils import clean_str
+from tests.server import MAIN_EXT, PACK_EXT, PAGES_DIR, FixtureServer
+
+RESULTS_FILE = Path(__file__).resolve().parent / "results.jsonl"
+
+# Number of cards written by the `write_to_csv` stage
+CSV_CARDS = 5000
+
+# Relative change of throughput or peak memory reported as a regression
+# (runs of the same commit vary by ~10% on a busy machine)
+REGRESSION_THRESHOLD = 0.20
+
+
+def current_commit() -> str:
+    """Returns the short hash of `HEAD`, with `-dirty` if the tree has uncommitted changes."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_stages(server: FixtureServer, tmp_dir: Path) -> dict[str, tuple]:
+    """
+    Prepares the inputs of every stage.
+
+    Returns
+    -------
+    stages : dict[str, tuple[Callable[[], object], int, str]]
+        For each stage, the function running it once, the number of items it
+        processes and their unit.
+    """
+    main_html = (PAGES_DIR / f"{MAIN_EXT}.html").read_text(encoding="utf-8").replace("{base}", server.base)
+    pack_html = (PAGES_DIR / f"{PACK_EXT}.html").read_text(encoding="utf-8").replace("{base}", server.base)
+
+    rows = find_html_table(pack_html, "pack").find("tbody").find_all("tr")
+    cells = []
+    for row in rows:
+        tds = row.find_all("td")
+        card_type = clean_str(tds[5].find("img")["alt"].split("-")[-1])
+        cells.append((tds[9], card_type in TRAINER_TYPES))
+
+    moves = []
+    for cell9, is_trainer in cells:
+        move_divs = [] if is_trainer else cell9.find_all("div", class_="align")[1:]
+        moves += [(div, move_divs[i + 1] if i + 1 < len(move_divs) else None) for i, div in enumerate(move_divs)]
+
+    # Fill the response cache, so `extract_card` reads the detail pages from it
+    cards = [extract_card(row) for row in rows]
+    csv_cards = [cards[i % len(cards)] for i in range(CSV_CARDS)]
+    flattened = flatten_pokemon_data(input_json_path)
+
+    return {
+        "find_html_table[main]": (lambda: find_html_table(main_html, "main"), 1, "pages"),
+        "find_html_table[pack]": (lambda: find_html_table(pack_html, "pack"), len(rows), "cards"),
+        "extract_cell9": (lambda: [extract_cell9(cell9, is_trainer) for cell9, is_trainer in cells], len(cells), "cards"),
+        "extract_move_info": (lambda: [extract_move_info(div, next_div) for div, next_div in moves], len(moves), "moves"),
+        "extract_card": (lambda: [extract_card(row) for row in rows], len(rows), "cards"),
+        "write_to_csv": (lambda: write_to_csv(csv_cards, tmp_dir / "full.csv"), len(csv_cards), "cards"),
+        "clean_csv": (lambda: clean_csv(flattened), len(flattened), "cards"),
+    }
+
+
+def measure(func, num_items: int, repeat: int) -> dict[str, float]:
+    """Times `func` (best of `repeat` runs) and measures the peak memory of one call."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "throughput": num_items / seconds, "peak_bytes": peak}
+
+
+def load_results(results_file: Path) -> list[dict]:
+    """Returns every run stored in `results_file`, oldest first."""
+    if not results_file.exists():
+        return []
+    with open(results_file, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline(history: list[dict], commit: str) -> dict | None:
+    """Returns the latest run of another commit than `commit` (or the latest run)."""
+    for run in reversed(history):
+        if run["commit"] != commit:
+            return run
+    return history[-1] if history else None
+
+
+def report(results: dict[str, dict], units: dict[str, str], previous: dict | None, threshold: float):
+    """Prints the results, with the change since the `previous` run."""
+    if previous is not None:
+        print(f"Compared to {previous['commit']} ({previous['date']})")
+    for name, result in results.items():
+        line = (
+            f"{name:22} {result['seconds'] * 1e3:9.3f} ms  "
+            f"{result['throughput']:10.0f} {units[name]}/s  "
+            f"peak {result['peak_bytes'] / 1e6:7.2f} MB"
+        )
+        old = previous and previous["results"].get(name)
+        if old:
+            speed = result["throughput"] / old["throughput"] - 1
+            memory = result["peak_bytes"] / old["peak_bytes"] - 1 if old["peak_bytes"] else 0.0
+            regressed = speed < -threshold or memory > threshold
+            line += f"  ({speed:+.0%} speed, {memory:+.0%} memory){'  <- regression' if regressed else ''}"
+        print(line)
+
+
+def main(only: list[str] | None, repeat: int, results_file: Path, save: bool, threshold: float):
+    previous_cache = web.CACHE
+    with tempfile.TemporaryDirectory() as tmp_dir, FixtureServer() as server:
+        tmp_dir = Path(tmp_dir)
+        web.set_cache(ResponseCache(tmp_dir / "cache"))
+        try:
+            stages = build_stages(server, tmp_dir)
+            if only:
+                stages = {name: stage for name, stage in stages.items() if name in only}
+
+            results = {name: measure(func, num_items, repeat) for name, (func, num_items, _) in stages.items()}
+        finally:
+            web.set_cache(previous_cache)
+
+    history = load_results(results_file)
+    run = {
+        "commit": current_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    units = {name: stage[2] for name, stage in stages.items()}
+    report(results, units, baseline(history, run["commit"]), threshold)
+
+    if save:
+        with open(results_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+        print(f"Results saved to {results_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", default=None, help="Only run these stages (e.g. extract_card).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage, the best is kept (default: 5).")
+    parser.add_argument(
+        "--results", type=Path, default=RESULTS_FILE, help="File the results are appended to and compared with."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help=f"Relative slowdown or memory growth flagged as a regression (default: {REGRESSION_THRESHOLD}).",
+    )
+    parser.add_argument("--no-save", action="store_true", help="Only print the results.")
+    args = parser.parse_args()
+    main(args.only, args.repeat, args.results, save=not args.no_save, threshold=args.threshold)
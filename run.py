@@ -1,3 +1,111 @@
+import argparse
+from tcg import io, profiling, web
+from tcg.cache import ResponseCache, DEFAULT_TTL
 from tcg.driver import main
 
-main()
\ No newline at end of file
+parser = argparse.ArgumentParser(description="Scrape all Pokémon TCG Pocket cards into data/full.csv.")
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of cards extracted concurrently within each pack (default: 1).",
+)
+parser.add_argument(
+    "--processes",
+    type=int,
+    default=1,
+    help="Number of processes parsing packs in parallel during a full run (default: 1).",
+)
+parser.add_argument(
+    "--max-per-host",
+    type=int,
+    default=8,
+    help="Maximum number of requests in flight to Game8 at once (default: 8).",
+)
+parser.add_argument(
+    "--pool-size",
+    type=int,
+    default=16,
+    help="Number of keep-alive connections kept open per host (default: 16).",
+)
+parser.add_argument(
+    "--retries",
+    type=int,
+    default=4,
+    help="Number of times a request failing with a connection error, 429 or 5xx is retried (default: 4).",
+)
+parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="Only re-extract cards that are new or changed since the previous run.",
+)
+parser.add_argument(
+    "--resume",
+    action="store_true",
+    help="Continue an interrupted full run from the last card written to data/full.csv.partial.",
+)
+parser.add_argument(
+    "--direct",
+    action="store_true",
+    help="Refresh cards from their own pages listed in data/page_mappings.json, skipping pack tables.",
+)
+parser.add_argument(
+    "--cards",
+    nargs="+",
+    default=None,
+    help="With --direct, only refresh these cards (e.g. --cards \"A1 001\" \"A1 002\").",
+)
+parser.add_argument(
+    "--packs",
+    nargs="+",
+    default=None,
+    help="With --direct, only refresh the cards of these packs (e.g. --packs A1 P-A).",
+)
+parser.add_argument(
+    "--parser",
+    choices=io.PARSERS,
+    default="bs4",
+    help="Parser used for the pack tables; lxml gives the same cards faster (default: bs4).",
+)
+parser.add_argument(
+    "--parquet",
+    action="store_true",
+    help="Also export the cards to data/full_parquet, a typed Parquet dataset partitioned by pack.",
+)
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="Always download pages instead of using the on-disk cache in .cache/http.",
+)
+parser.add_argument(
+    "--cache-ttl",
+    type=float,
+    default=DEFAULT_TTL,
+    help="Seconds a cached page is used before it is revalidated with Game8 (default: 6 hours).",
+)
+parser.add_argument(
+    "--metrics",
+    default=None,
+    help="Save the time, downloads and errors of every stage per pack to this file "
+    "(Prometheus text format if it ends with .prom, JSON otherwise).",
+)
+profiling.add_arguments(parser)
+args = parser.parse_args()
+
+web.set_client(web.HttpClient(pool_size=args.pool_size, max_retries=args.retries))
+web.set_cache(None if args.no_cache else ResponseCache(ttl=args.cache_ttl))
+io.set_parser(args.parser)
+
+with profiling.from_args(args):
+    main(
+        workers=args.workers,
+        max_per_host=args.max_per_host,
+        incremental=args.incremental,
+        direct=args.direct,
+        card_ids=args.cards,
+        packs=args.packs,
+        resume=args.resume,
+        parquet=args.parquet,
+        processes=args.processes,
+        metrics_file=args.metrics,
+    )
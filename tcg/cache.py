@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+
+# Project level directory for cached HTTP responses (ignored by git)
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "http"
+
+# Cached responses younger than this (in seconds) are used without contacting the server
+DEFAULT_TTL = 6 * 60 * 60
+
+# Total size (in bytes) of the compressed bodies kept on disk before the oldest are evicted
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache for HTTP response bodies.
+
+    The cache is split in two directories inside `cache_dir`:
+    - `meta/` holds one small JSON file per cached URL (named by the SHA-256 of the key)
+      with the validators (`ETag`, `Last-Modified`), timestamps and the body's hash.
+    - `objects/` holds the zlib-compressed bodies, named by the SHA-256 of their content.
+      Identical bodies served under different URLs are therefore only stored once.
+
+    Entries younger than `ttl` seconds are considered fresh and can be used without any
+    network access. Older entries should be revalidated with a conditional request
+    built from `validators()`. Once the bodies take more than `max_bytes`, the least
+    recently used entries are evicted.
+
+    Parameters
+    ----------
+    cache_dir : str | Path
+        The directory the cache lives in. It is created on the first write.
+    ttl : float
+        The number of seconds an entry stays fresh after being fetched or revalidated.
+    max_bytes : int
+        The maximum total size of the compressed bodies.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    @property
+    def meta_dir(self) -> Path:
+        return self.cache_dir / "meta"
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.cache_dir / "objects"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.meta_dir / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def lookup(self, key: str) -> dict | None:
+        """
+        Returns the metadata stored for `key`, or `None` if it isn't cached.
+
+        The returned dict has the fields `key`, `etag`, `last_modified`, `encoding`,
+        `object`, `size`, `fetched_at` and `accessed_at`.
+        """
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if not (self.objects_dir / meta["object"]).is_file():
+            return None
+        return meta
+
+    def is_fresh(self, meta: dict) -> bool:
+        """Whether the entry `meta` was fetched or revalidated less than `ttl` seconds ago."""
+        return time.time() - meta["fetched_at"] < self.ttl
+
+    def validators(self, meta: dict) -> dict[str, str]:
+        """Returns the headers needed to revalidate the entry `meta` with a conditional GET."""
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def read_text(self, meta: dict) -> str | None:
+        """
+        Returns the decoded body of the entry `meta` and marks it as recently used.
+
+        `None` is returned if the body is gone, e.g. evicted by another thread since
+        `lookup`, so the caller should treat the entry as a cache miss.
+        """
+        try:
+            with open(self.objects_dir / meta["object"], "rb") as f:
+                body = zlib.decompress(f.read())
+        except FileNotFoundError:
+            return None
+
+        meta["accessed_at"] = time.time()
+        self._write_meta(meta)
+        return body.decode(meta["encoding"] or "utf-8", errors="replace")
+
+    def refresh(self, meta: dict):
+        """Marks the entry `meta` as fresh again (after a `304 Not Modified`)."""
+        meta["fetched_at"] = time.time()
+        self._write_meta(meta)
+
+    def store(self, key: str, body: bytes, headers: dict, encoding: str | None) -> dict:
+        """
+        Saves the body and validators of a `200` response under `key`.
+
+        Parameters
+        ----------
+        key : str
+            The cache key (usually the URL of the request).
+        body : bytes
+            The raw content of the response.
+        headers : dict
+            The response headers, used for `ETag` and `Last-Modified`.
+        encoding : str | None
+            The text encoding used to decode `body`.
+
+        Returns
+        -------
+        meta : dict
+            The metadata stored for `key` (see `lookup`).
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self.objects_dir / digest
+
+        now = time.time()
+        meta = {
+            "key": key,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "encoding": encoding,
+            "object": digest,
+            "size": 0,
+            "fetched_at": now,
+            "accessed_at": now,
+        }
+
+        with self._lock:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            if not object_path.is_file():
+                compressed = zlib.compress(body)
+                _atomic_write(object_path, compressed)
+                self._add_bytes(len(compressed))
+            meta["size"] = object_path.stat().st_size
+
+        self._write_meta(meta)
+
+        if self.total_bytes() > self.max_bytes:
+            self.evict()
+        return meta
+
+    def total_bytes(self) -> int:
+        """Returns the total size of the stored bodies."""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(
+                    path.stat().st_size for path in self._iter_dir(self.objects_dir)
+                )
+            return self._total_bytes
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the bodies fit in `max_bytes`.
+
+        Bodies that are no longer referenced by any entry are deleted as well.
+        """
+        with self._lock:
+            entries = []
+            for path in self._iter_dir(self.meta_dir):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        entries.append((path, json.load(f)))
+                except (OSError, json.JSONDecodeError):
+                    path.unlink(missing_ok=True)
+
+            entries.sort(key=lambda entry: entry[1]["accessed_at"], reverse=True)
+
+            # Keep the most recently used entries that fit in the budget
+            kept_objects = set()
+            used_bytes = 0
+            for path, meta in entries:
+                if meta["object"] in kept_objects:
+                    continue
+                if used_bytes + meta["size"] <= self.max_bytes:
+                    kept_objects.add(meta["object"])
+                    used_bytes += meta["size"]
+                else:
+                    path.unlink(missing_ok=True)
+
+            for path, meta in entries:
+                if meta["object"] not in kept_objects:
+                    path.unlink(missing_ok=True)
+            for path in self._iter_dir(self.objects_dir):
+                if path.name not in kept_objects:
+                    path.unlink(missing_ok=True)
+
+            self._total_bytes = used_bytes
+
+    def clear(self):
+        """Removes every cached entry."""
+        with self._lock:
+            for path in self._iter_dir(self.meta_dir):
+                path.unlink(missing_ok=True)
+            for path in self._iter_dir(self.objects_dir):
+                path.unlink(missing_ok=True)
+            self._total_bytes = 0
+
+    def _write_meta(self, meta: dict):
+        path = self._meta_path(meta["key"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, json.dumps(meta).encode("utf-8"))
+
+    def _add_bytes(self, size: int):
+        if self._total_bytes is not None:
+            self._total_bytes += size
+
+    @staticmethod
+    def _iter_dir(directory: Path):
+        if not directory.is_dir():
+            return []
+        return [path for path in directory.iterdir() if not path.name.endswith(".tmp")]
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Writes `data` to `path` through a temporary file so readers never see partial files."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,155 @@
+from dataclasses import dataclass, fields
+from tcg.utils import COLUMNS, DEFAULT_EMPTY, clean_str
+
+# Columns whose values repeat across many cards (types, rarities, packs, illustrators...)
+# Equal values of these columns share a single string object from `_interned`.
+INTERNED_COLUMNS = frozenset(
+    {
+        "rarity",
+        "stage",
+        "HP",
+        "type",
+        "weakness",
+        "retreat_cost",
+        "ultra_beast",
+        "generation",
+        "illustrator",
+        "pack_name",
+        "pack_points",
+        "move1_cost",
+        "move1_damage",
+        "move2_cost",
+        "move2_damage",
+    }
+)
+
+# Table of the interned values, shared by every card
+_interned: dict[str, str] = {}
+
+
+def intern_value(value: str | None) -> str | None:
+    """Returns the shared copy of `value` from the interned-string table."""
+    if value is None:
+        return value
+    return _interned.setdefault(value, value)
+
+
+@dataclass(slots=True, eq=False)
+class Card:
+    """
+    A single card, with one field per column of `COLUMNS`.
+
+    Cards have no per-instance dict (`__slots__`), and the values of
+    `INTERNED_COLUMNS` are shared between cards, so a card takes a fraction of the
+    memory of the equivalent dict. A card also behaves like that dict: fields can
+    be read and set with `card["name"]`, it has `keys`, `items`, `get`, `update`
+    and `|`, it can be written with `csv.DictWriter`, and it compares equal to a
+    dict with the same fields.
+    """
+
+    number: str | None = DEFAULT_EMPTY
+    name: str | None = DEFAULT_EMPTY
+    rarity: str | None = DEFAULT_EMPTY
+    stage: str | None = DEFAULT_EMPTY
+    HP: str | None = DEFAULT_EMPTY
+    type: str | None = DEFAULT_EMPTY
+    weakness: str | None = DEFAULT_EMPTY
+    retreat_cost: str | None = DEFAULT_EMPTY
+    ultra_beast: str | None = DEFAULT_EMPTY
+    generation: str | None = DEFAULT_EMPTY
+    illustrator: str | None = DEFAULT_EMPTY
+    pack_name: str | None = DEFAULT_EMPTY
+    pack_points: str | None = DEFAULT_EMPTY
+    ability_name: str | None = DEFAULT_EMPTY
+    ability_effect: str | None = DEFAULT_EMPTY
+    move1_name: str | None = DEFAULT_EMPTY
+    move1_cost: str | None = DEFAULT_EMPTY
+    move1_damage: str | None = DEFAULT_EMPTY
+    move1_effect: str | None = DEFAULT_EMPTY
+    move2_name: str | None = DEFAULT_EMPTY
+    move2_cost: str | None = DEFAULT_EMPTY
+    move2_damage: str | None = DEFAULT_EMPTY
+    move2_effect: str | None = DEFAULT_EMPTY
+    image: str | None = DEFAULT_EMPTY
+    url: str | None = DEFAULT_EMPTY
+
+    def __post_init__(self):
+        for column in INTERNED_COLUMNS:
+            setattr(self, column, intern_value(getattr(self, column)))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str | None], clean: bool = False) -> "Card":
+        """
+        Builds a card from a dict keyed by the columns of `COLUMNS`.
+
+        Parameters
+        ----------
+        data : dict[str, str | None]
+            The fields of the card (e.g. a row of `csv.DictReader`). Missing
+            columns are left as `DEFAULT_EMPTY`.
+        clean : bool
+            If `True`, every value is normalized with `clean_str` first.
+        """
+        if clean:
+            return cls(**{k: clean_str(v) for k, v in data.items()})
+        return cls(**data)
+
+    def to_dict(self) -> dict[str, str | None]:
+        """Returns the card as a dict, with the keys in `COLUMNS` order."""
+        return {column: getattr(self, column) for column in COLUMNS}
+
+    def keys(self):
+        return _KEYS
+
+    def items(self) -> list[tuple[str, str | None]]:
+        return [(column, getattr(self, column)) for column in COLUMNS]
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in _FIELDS else default
+
+    def copy(self) -> "Card":
+        return Card(**self.to_dict())
+
+    def update(self, other: dict[str, str | None]):
+        for key, value in other.items():
+            self[key] = value
+
+    def __or__(self, other: dict[str, str | None]) -> "Card":
+        card = self.copy()
+        card.update(other)
+        return card
+
+    def __getitem__(self, key: str) -> str | None:
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: str | None):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        setattr(self, key, intern_value(value) if key in INTERNED_COLUMNS else value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELDS
+
+    def __iter__(self):
+        return iter(COLUMNS)
+
+    def __len__(self) -> int:
+        return len(COLUMNS)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Card):
+            return all(getattr(self, column) == getattr(other, column) for column in COLUMNS)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    # Cards are mutable, so they are not hashable
+    __hash__ = None
+
+
+_FIELDS = frozenset(field.name for field in fields(Card))
+# Set-like view of the columns, like `dict.keys()` (needed by `csv.DictWriter`)
+_KEYS = dict.fromkeys(COLUMNS).keys()
+assert [field.name for field in fields(Card)] == COLUMNS, "Card fields must follow COLUMNS"
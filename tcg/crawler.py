@@ -0,0 +1,107 @@
+import asyncio
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio tasks.
+
+    Tokens are added continuously at `rate` per second, up to `capacity`. Each call
+    to `acquire` takes one token, waiting until one is available. Short bursts of up
+    to `capacity` requests are therefore allowed, while the long-run average stays
+    at `rate` requests per second.
+
+    Parameters
+    ----------
+    rate : float
+        The number of tokens added per second.
+    capacity : float | None
+        The maximum number of stored tokens. Defaults to `rate` (one second of burst).
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError(f"rate was <{rate}> but must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    async def acquire(self):
+        """Waits until a token is available and takes it."""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def scan_exts(
+    exts: Iterable[int],
+    probe: Callable[[int], object],
+    record: Callable[[int, object], None],
+    concurrency: int = 16,
+    rate: float | None = None,
+    checkpoint: Callable[[], None] | None = None,
+    checkpoint_every: int = 1000,
+) -> int:
+    """
+    Probes many URL extensions in parallel.
+
+    `probe` is a blocking function (e.g. one doing an HTTP request), so it runs on a
+    pool of `concurrency` threads while the event loop schedules the probes. Results
+    are handed to `record` on the event loop thread, one at a time, so `record` never
+    needs any locking.
+
+    Parameters
+    ----------
+    exts : Iterable[int]
+        The URL extensions to probe.
+    probe : Callable[[int], object]
+        Blocking function returning the result for one extension.
+    record : Callable[[int, object], None]
+        Stores the result of `probe` for an extension.
+    concurrency : int
+        The maximum number of probes in flight at the same time.
+    rate : float | None
+        The maximum number of probes started per second (`None` for no limit).
+    checkpoint : Callable[[], None] | None
+        Called after every `checkpoint_every` recorded results, and once at the end,
+        to persist progress so an interrupted scan can resume.
+    checkpoint_every : int
+        The number of recorded results between two checkpoints.
+
+    Returns
+    -------
+    num_probed : int
+        The number of extensions probed.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate) if rate else None
+    num_probed = 0
+
+    async def probe_ext(ext: int):
+        nonlocal num_probed
+        async with semaphore:
+            if bucket is not None:
+                await bucket.acquire()
+            result = await loop.run_in_executor(executor, probe, ext)
+
+        record(ext, result)
+        num_probed += 1
+        if checkpoint is not None and num_probed % checkpoint_every == 0:
+            checkpoint()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        await asyncio.gather(*(probe_ext(ext) for ext in exts))
+
+    if checkpoint is not None:
+        checkpoint()
+    return num_probed
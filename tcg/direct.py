@@ -0,0 +1,135 @@
+import requests
+from tcg.card import Card
+from tcg.io import extract_row, fetch_card_rows, get_pack_names_and_urls, map_rows, row_number
+from tcg.page_mappings import PageMappings
+from tcg.parser import TRAINER_TYPES, extract_extra_card_details
+from tcg.utils import clean_str
+
+# Prefix of every card page; the URL extension from `page_mappings.json` is appended to it
+ARCHIVE_URL = "https://game8.co/games/Pokemon-TCG-Pocket/archives/"
+
+
+def card_pack_id(card_id: str) -> str:
+    """Returns the pack ID of a card ID (e.g. `"A1"` for `"A1 001"`)."""
+    return card_id.split(" ")[0]
+
+
+def _safe_row_number(card_html) -> str | None:
+    """Returns the card number of a pack table row, or `None` if the row is malformed."""
+    try:
+        return row_number(card_html)
+    except (IndexError, AttributeError):
+        return None
+
+
+def refresh_card(card: Card | dict, card_full_url: str) -> Card | None:
+    """
+    Updates the detail-page fields of a previously extracted card.
+
+    Only the card's own page is downloaded; the pack-table fields are kept from `card`.
+
+    Parameters
+    ----------
+    card : dict
+        The card as previously extracted by `extract_card`.
+    card_full_url : str
+        The URL of the card's detail page.
+
+    Returns
+    -------
+    card : Card | None
+        A new card with fresh `generation`, `illustrator` and `weakness`, or
+        `None` if the detail page could not be read. Like `extract_card`, it is not
+        passed through the manual fixes (see `parser.fix_cards`).
+    """
+    is_trainer = card["type"] in TRAINER_TYPES
+    try:
+        card_extra_details = extract_extra_card_details(card_full_url, is_trainer=is_trainer)
+    except (requests.exceptions.RequestException, AttributeError, IndexError):
+        print(f"! ERROR FOR CARD <{card['number']}> !")
+        return None
+
+    # Same cleaning as `extract_card`
+    card = Card.from_dict(dict(card)) | {k: clean_str(v) for k, v in card_extra_details.items()}
+    card["url"] = card_full_url
+
+    print(f"  Refreshed card <{card['number']}>")
+    return card
+
+
+def extract_cards_direct(
+    page_mappings: PageMappings,
+    previous_cards: dict[str, dict],
+    card_ids: list[str],
+    workers: int = 1,
+    pack_names_urls: dict[str, str] | None = None,
+    archive_url: str = ARCHIVE_URL,
+) -> list[dict]:
+    """
+    Extracts cards straight from their detail pages, skipping the pack tables when possible.
+
+    A card is refreshed directly (see `refresh_card`) when `page_mappings` knows its
+    page and its pack-table fields are available in `previous_cards`. Every other card
+    falls back to its pack table, which is only downloaded for the packs that need it.
+
+    Parameters
+    ----------
+    page_mappings : PageMappings
+        The URL extensions of every known card page (from `data/page_mappings.json`).
+    previous_cards : dict[str, dict]
+        The cards of the previous run, keyed by card number.
+    card_ids : list[str]
+        The cards to extract (e.g. `["A1 001", "A1 002"]`).
+    workers : int
+        The number of detail pages (and fallback rows) extracted at the same time.
+    pack_names_urls : dict[str, str] | None
+        The pack page URLs keyed by pack ID (see `get_pack_names_and_urls`). Only
+        downloaded when a fallback is needed and none are given.
+    archive_url : str
+        The prefix the URL extensions are appended to.
+
+    Returns
+    -------
+    cards_data : list[dict]
+        The extracted cards: first the ones refreshed directly (in `card_ids` order),
+        then the ones from pack tables (in table order), without the manual fixes
+        (see `parser.fix_cards`).
+    """
+    direct_ids = [
+        card_id
+        for card_id in card_ids
+        if card_id in previous_cards and page_mappings.ext_for_card(card_id) is not None
+    ]
+    fallback_ids = set(card_ids) - set(direct_ids)
+    print(f"Refreshing {len(direct_ids)} cards from their own pages")
+
+    # Download only the detail pages, in parallel
+    refreshed = map_rows(
+        lambda card_id: refresh_card(
+            previous_cards[card_id], archive_url + str(page_mappings.ext_for_card(card_id))
+        ),
+        direct_ids,
+        workers=workers,
+    )
+    cards_data = [card for card in refreshed if card is not None]
+    if not fallback_ids:
+        return cards_data
+
+    # Fall back to the pack tables for the cards the mapping (or previous run) lacks
+    print(f"Falling back to pack tables for {len(fallback_ids)} cards")
+    if pack_names_urls is None:
+        pack_names_urls = get_pack_names_and_urls()
+
+    for pack_id in sorted({card_pack_id(card_id) for card_id in fallback_ids}):
+        if pack_id not in pack_names_urls:
+            print(f"! No pack page for <{pack_id}> !")
+            continue
+        rows = [
+            card_html
+            for card_html in fetch_card_rows(pack_names_urls[pack_id])
+            if _safe_row_number(card_html) in fallback_ids
+        ]
+        extracted = map_rows(extract_row, rows, workers=workers)
+        cards_data.extend(card for card in extracted if card is not None)
+
+    return cards_data
@@ -1,13 +1,29 @@
 from bs4 import BeautifulSoup
 from pathlib import Path
-from tcg.io import get_pack_names_and_urls, extract_pack, write_to_csv
+from tcg import metrics, overrides, utils, web
+from tcg.direct import card_pack_id, extract_cards_direct
+from tcg.incremental import extract_pack_incremental, load_manifest, save_manifest
+from tcg.io import CsvStreamWriter, get_pack_names_and_urls, iter_packs, read_from_csv
+from tcg.page_mappings import PageMappings
+from tcg.parser import fix_cards
 
 
 # Raw data found at
 # https://game8.co/games/Pokemon-TCG-Pocket/archives/482685
 
 
-def main():
+def main(
+    workers: int = 1,
+    max_per_host: int = web.MAX_PER_HOST,
+    incremental: bool = False,
+    direct: bool = False,
+    card_ids: list[str] | None = None,
+    packs: list[str] | None = None,
+    resume: bool = False,
+    parquet: bool = False,
+    processes: int = 1,
+    metrics_file: str | Path | None = None,
+):
     """
     Main driver function for HTML parsing and CSV writing.
 
@@ -16,8 +32,47 @@ def main():
     - Parses it with BeautifulSoup
     - Extracts rows from the main table
     - Converts it to a structured dictionary
+    - Applies the manual fixes of `data/overrides.csv` to every card in one stage (see `fix_cards`)
     - Writes it to a CSV file
+
+    Parameters
+    ----------
+    workers : int
+        The number of cards of a pack extracted concurrently (see `extract_pack`).
+    max_per_host : int
+        The maximum number of requests in flight to Game8 at any time.
+    incremental : bool
+        If `True`, only cards that are new or changed since the previous run are
+        extracted again (see `extract_pack_incremental`). The rest are copied from
+        the existing CSV, and the fingerprints are saved to `data/full_manifest.json`.
+    direct : bool
+        If `True`, cards are refreshed straight from their own pages using
+        `data/page_mappings.json`, and pack tables are only downloaded for cards the
+        mapping or the existing CSV lacks (see `extract_cards_direct`).
+    card_ids : list[str] | None
+        With `direct`, only refresh these cards (e.g. `["A1 001"]`). Defaults to every card.
+        The other cards are copied from `data/full.csv`, which must exist.
+    packs : list[str] | None
+        With `direct`, only refresh the cards of these packs (e.g. `["A1", "P-A"]`).
+        The other cards are copied from `data/full.csv`, which must exist.
+    resume : bool
+        If `True`, continue the full run that was interrupted, from the last card
+        written to `data/full.csv.partial` (see `CsvStreamWriter`).
+    parquet : bool
+        If `True`, the CSV is also exported to `data/full_parquet`, a typed Parquet
+        dataset partitioned by pack (see `tcg.export.write_parquet`).
+    processes : int
+        The number of processes parsing packs at the same time during a full run
+        (see `iter_packs`). The cards are written in the same order as with one.
+    metrics_file : str | Path | None
+        If given, the time, downloads and errors of every stage, per pack, are saved
+        to this file: in the Prometheus text format for a `.prom` file, as a JSON
+        report otherwise (see `metrics.RunMetrics`).
     """
+    web.set_max_per_host(max_per_host)
+    metrics.reset()
+    overrides.reset_matches()
+
     # Define project root as two levels up from this file
     driver_file = Path(__file__).resolve()
     PROJ_ROOT = driver_file.parent.parent
@@ -28,22 +83,136 @@ def main():
 
     # Define output path
     output_file = data_dir / "full.csv"
+    manifest_file = data_dir / "full_manifest.json"
+
+    if incremental and direct:
+        raise ValueError("Use only one of `incremental` and `direct`")
+    if resume and (incremental or direct):
+        raise ValueError("`resume` is only available for a full run")
+    if processes > 1 and (incremental or direct):
+        raise ValueError("`processes` is only available for a full run")
+    if direct and (card_ids is not None or packs is not None) and not output_file.exists():
+        # The CSV would only hold the requested cards
+        raise FileNotFoundError(
+            f"Refreshing some cards needs the cards of a previous run in {output_file.name}, "
+            "run without `card_ids` and `packs` first"
+        )
+
+    # Cards from the previous run
+    previous_cards = {}
+    if (incremental or direct) and output_file.exists():
+        previous_cards = {card["number"]: card for card in read_from_csv(output_file)}
+
+    # Cards are flushed to disk one by one as they are extracted
+    with CsvStreamWriter(output_file, resume=resume) as writer:
+        if direct:
+            page_mappings = PageMappings.load(data_dir / "page_mappings.json")
+
+            # Build the card list straight from the mapping (plus cards it is missing)
+            if card_ids is None:
+                card_ids = list(page_mappings.good_exts)
+                card_ids += [
+                    card_id for card_id in previous_cards if card_id not in page_mappings.good_exts
+                ]
+            if packs is not None:
+                card_ids = [card_id for card_id in card_ids if card_pack_id(card_id) in packs]
+
+            refreshed = extract_cards_direct(
+                page_mappings, previous_cards, card_ids, workers=workers
+            )
+
+            # Merge into the previous cards, keeping their order and appending new ones
+            merged = dict(previous_cards)
+            merged.update((card["number"], card) for card in refreshed)
+            cards = merged.values()
+
+        elif incremental:
+            pack_names_urls = get_pack_names_and_urls()
+
+            # Fingerprints from the previous run
+            manifest = load_manifest(manifest_file)
+            new_manifest = {}
 
-    # List to hold all cards
-    cards_data = []
+            def incremental_cards():
+                seen = set()
+                for pack_url in pack_names_urls.values():
+                    with metrics.pack(pack_url):
+                        pack_data = extract_pack_incremental(
+                            pack_url, previous_cards, manifest, new_manifest, workers=workers
+                        )
+                    for card in pack_data:
+                        yield card
+                        seen.add(card["number"])
 
-    pack_names_urls = get_pack_names_and_urls()
+                # Keep previous cards that were not seen in any pack table during this run
+                for number, card in previous_cards.items():
+                    if number not in seen:
+                        yield card
 
-    # Go through all pages and extract all cards from each pack
-    for pack_url in pack_names_urls.values():
-        pack_data = extract_pack(pack_url)
-        cards_data.extend(pack_data)
+            cards = incremental_cards()
 
-    # Export the parsed data to CSV
-    write_to_csv(cards_data, output_file)
+        else:
+            pack_names_urls = get_pack_names_and_urls()
+
+            # Skip the packs finished before the interruption (packs are written in order)
+            pack_ids = list(pack_names_urls)
+            if writer.last_id is not None:
+                print(f"Resuming after card <{writer.last_id}>")
+                last_pack_id = card_pack_id(writer.last_id)
+                if last_pack_id in pack_ids:
+                    pack_ids = pack_ids[pack_ids.index(last_pack_id) :]
+
+            # Go through all pages and extract all cards from each pack
+            cards = iter_packs(
+                [pack_names_urls[pack_id] for pack_id in pack_ids],
+                workers=workers,
+                processes=processes,
+                skip_ids=writer.resumed_ids,
+            )
+
+        # Patch every card the same way, whether it was extracted, refreshed or copied
+        for card in fix_cards(cards):
+            writer.write(card)
+
+    if incremental:
+        save_manifest(new_manifest, manifest_file)
 
     print(f"CSV file created: {output_file.relative_to(PROJ_ROOT)}")
 
+    if parquet:
+        # Imported here so pyarrow is only needed for the export
+        from tcg.export import csv_to_parquet
+
+        dataset_dir = data_dir / "full_parquet"
+        csv_to_parquet(output_file, dataset_dir)
+        print(f"Parquet dataset created: {dataset_dir.relative_to(PROJ_ROOT)}")
+
+    for host, counts in web.CLIENT.stats_by_host().items():
+        print(
+            f"{host}: {counts['requests']} requests, {counts['retries']} retries, "
+            f"{counts['bytes']} bytes downloaded"
+        )
+
+    print(overrides.get_overrides("web").summary())
+
+    # Slowest stages first (stages contain each other, e.g. `extract_card` includes `download`)
+    stages = sorted(metrics.METRICS.by_stage().items(), key=lambda item: -item[1].get("seconds", 0))
+    for stage, counts in stages:
+        print(
+            f"{stage}: {counts.get('calls', 0)} calls, {counts.get('seconds', 0):.2f} s, "
+            f"{counts.get('errors', 0)} errors"
+        )
+    if metrics_file is not None:
+        metrics.METRICS.save(metrics_file)
+        print(f"Run metrics saved to {metrics_file}")
+
+    for label, counts in [
+        ("Unknown energy types", utils.UNKNOWN_ENERGY_TYPES),
+        ("Misspelled energy types", utils.TYPO_ENERGY_TYPES),
+    ]:
+        if counts:
+            print(f"{label}: " + ", ".join(f"<{t}> x{n}" for t, n in counts.most_common()))
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,164 @@
+import argparse
+import shutil
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tcg.direct import card_pack_id
+from tcg.io import read_from_csv
+from tcg.utils import COLUMNS
+
+# Columns stored as integers instead of text
+INT_COLUMNS = {
+    "HP": pa.int16(),
+    "retreat_cost": pa.int16(),
+    "pack_points": pa.int32(),
+    "generation": pa.int16(),
+}
+
+# Columns with few distinct values, stored dictionary-encoded (categoricals in pandas)
+CATEGORICAL_COLUMNS = ["rarity", "type", "stage"]
+
+# Column the dataset is partitioned by (one directory per pack, e.g. `pack=A1`)
+PARTITION_COLUMN = "pack"
+
+# Typed layout of the cards: every other column of `COLUMNS` is a nullable string
+SCHEMA = pa.schema(
+    [
+        pa.field(
+            column,
+            INT_COLUMNS.get(column)
+            or (pa.dictionary(pa.int8(), pa.string()) if column in CATEGORICAL_COLUMNS else pa.string()),
+        )
+        for column in COLUMNS
+    ]
+    + [pa.field(PARTITION_COLUMN, pa.string())]
+)
+
+
+def to_int(value: str | None, column: str, number: str) -> int | None:
+    """Converts a text field to an int, reporting (and dropping) values that are not integers."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        print(f"! Non-integer {column} <{value}> for card <{number}> !")
+        return None
+
+
+def cards_to_table(cards_data: list[dict[str, str | None]]) -> pa.Table:
+    """
+    Converts cards (as written to `data/full.csv`) into a typed Arrow table.
+
+    Parameters
+    ----------
+    cards_data : list[dict[str, str | None]]
+        The cards, e.g. from `read_from_csv`.
+
+    Returns
+    -------
+    table : pyarrow.Table
+        The cards with the `SCHEMA` types, plus the `pack` column (e.g. `"A1"`).
+    """
+    columns = {column: [card.get(column) for card in cards_data] for column in COLUMNS}
+    for column in INT_COLUMNS:
+        columns[column] = [
+            to_int(value, column, card["number"])
+            for value, card in zip(columns[column], cards_data)
+        ]
+    columns[PARTITION_COLUMN] = [card_pack_id(card["number"]) for card in cards_data]
+
+    arrays = []
+    for field in SCHEMA:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], field.type))
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def write_parquet(cards_data: list[dict[str, str | None]], dataset_dir: str | Path):
+    """
+    Writes the cards as a Parquet dataset partitioned by pack.
+
+    Each pack is written to `<dataset_dir>/pack=<PACK_ID>/part-0.parquet`. The whole
+    dataset is replaced, so packs that disappeared do not linger.
+
+    Parameters
+    ----------
+    cards_data : list[dict[str, str | None]]
+        The cards, e.g. from `read_from_csv`.
+    dataset_dir : str | Path
+        The directory of the dataset (e.g. `data/full_parquet`).
+    """
+    dataset_dir = Path(dataset_dir)
+    table = cards_to_table(cards_data)
+
+    # Write next to the dataset and swap it in, so readers never see a half-written one
+    tmp_dir = dataset_dir.with_name(dataset_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    pq.write_to_dataset(
+        table,
+        root_path=tmp_dir,
+        partition_cols=[PARTITION_COLUMN],
+        basename_template="part-{i}.parquet",
+        compression="zstd",
+    )
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    tmp_dir.rename(dataset_dir)
+
+
+def read_parquet(
+    dataset_dir: str | Path,
+    columns: list[str] | None = None,
+    packs: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Loads cards from a dataset written by `write_parquet`.
+
+    Only the requested columns and packs are read from disk.
+
+    Parameters
+    ----------
+    dataset_dir : str | Path
+        The directory of the dataset (e.g. `data/full_parquet`).
+    columns : list[str] | None
+        The columns to load (e.g. `["number", "HP"]`). Defaults to every column.
+    packs : list[str] | None
+        The packs to load (e.g. `["A1", "P-A"]`). Defaults to every pack.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The cards, with nullable integer and categorical columns.
+    """
+    filters = [(PARTITION_COLUMN, "in", packs)] if packs is not None else None
+    table = pq.read_table(dataset_dir, columns=columns, filters=filters)
+    return table.to_pandas(types_mapper={pa.int16(): pd.Int16Dtype(), pa.int32(): pd.Int32Dtype()}.get)
+
+
+def csv_to_parquet(csv_file: str | Path, dataset_dir: str | Path) -> int:
+    """
+    Exports a CSV written by `write_to_csv` (e.g. `data/full.csv`) to a Parquet dataset.
+
+    Returns
+    -------
+    num_cards : int
+        The number of cards exported.
+    """
+    cards_data = read_from_csv(csv_file)
+    write_parquet(cards_data, dataset_dir)
+    return len(cards_data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a card CSV to a Parquet dataset partitioned by pack.")
+    parser.add_argument("--csv", default="data/full.csv", help="The CSV to export (default: data/full.csv).")
+    parser.add_argument(
+        "--out", default="data/full_parquet", help="The dataset directory (default: data/full_parquet)."
+    )
+    args = parser.parse_args()
+
+    num_cards = csv_to_parquet(args.csv, args.out)
+    print(f"Exported {num_cards} cards to {args.out}")
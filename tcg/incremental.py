@@ -0,0 +1,168 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+import requests
+from tcg import web
+from tcg.io import extract_row, fetch_card_rows, map_rows, row_html, row_number, row_url
+
+# Start of the card information table on a card's detail page
+DETAIL_TABLE_START = re.compile(r"<table[^>]*\btable--fixed\b[^>]*>")
+
+
+def fingerprint(text: str) -> str:
+    """Returns a short, stable hash of `text`."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def detail_fingerprint(page_html: str) -> str:
+    """
+    Fingerprints the part of a card's detail page that `extract_extra_card_details` reads.
+
+    Only the first `table--fixed` table is hashed, so ads, comments and other
+    content that changes on every visit does not mark the card as changed.
+    The whole page is hashed if the table cannot be found.
+
+    Parameters
+    ----------
+    page_html : str
+        The raw HTML of the card's detail page.
+
+    Returns
+    -------
+    fingerprint : str
+        The hash of the card information table.
+    """
+    start = DETAIL_TABLE_START.search(page_html)
+    if start is None:
+        return fingerprint(page_html)
+
+    end = page_html.find("</table>", start.start())
+    return fingerprint(page_html[start.start() : end if end != -1 else len(page_html)])
+
+
+def fingerprint_row(card_html) -> tuple[str | None, dict[str, str | None]]:
+    """
+    Fingerprints a pack table `<tr>` together with its card's detail page.
+
+    The detail page goes through `web.fetch_text`, so it is only free while its
+    cached copy is fresh (`--cache-ttl`, 6 hours by default). After that, every card
+    costs a conditional request (about 1,300 for a full run), which Game8 answers
+    with `304 Not Modified` when the page did not change.
+
+    Parameters
+    ----------
+    card_html : bs4.element.Tag | lxml.html.HtmlElement
+        A `<tr>` element from the `<tbody>` of a pack table. The row hash depends on
+        the parser that produced it (see `tcg.io.PARSER`).
+
+    Returns
+    -------
+    number : str | None
+        The card number (e.g. `"A1 001"`), or `None` if the row is malformed.
+    card_fingerprint : dict[str, str | None]
+        `{"row": <hash>, "detail": <hash>}`, where `"detail"` is `None` if the
+        detail page could not be downloaded.
+    """
+    card_fingerprint = {"row": fingerprint(row_html(card_html)), "detail": None}
+    try:
+        number = row_number(card_html)
+        card_full_url = row_url(card_html)
+    except (IndexError, AttributeError):
+        return None, card_fingerprint
+
+    try:
+        card_fingerprint["detail"] = detail_fingerprint(web.fetch_text(card_full_url))
+    except requests.RequestException:
+        # Treated as changed, so `extract_card` downloads it again (and reports the error)
+        pass
+
+    return number, card_fingerprint
+
+
+def load_manifest(manifest_file: str | Path) -> dict[str, dict[str, str | None]]:
+    """
+    Loads the fingerprints saved by the previous incremental run.
+
+    Returns
+    -------
+    manifest : dict[str, dict[str, str | None]]
+        `{"<CARD_ID>": {"row": <hash>, "detail": <hash>}}`, or `{}` if no manifest exists.
+    """
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(manifest: dict[str, dict[str, str | None]], manifest_file: str | Path):
+    """Writes the fingerprints of this run to `manifest_file`."""
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+
+def extract_pack_incremental(
+    pack_url: str,
+    previous_cards: dict[str, dict],
+    manifest: dict[str, dict[str, str | None]],
+    new_manifest: dict[str, dict[str, str | None]],
+    workers: int = 1,
+) -> list[dict]:
+    """
+    Extracts the cards of a pack, re-running `extract_card` only for new or changed rows.
+
+    A row is unchanged when both its `<tr>` HTML and its detail page table have the
+    same fingerprints as in `manifest`, and the card was present in the previous CSV.
+    Unchanged cards are copied from `previous_cards`.
+
+    Parameters
+    ----------
+    pack_url : str
+        The URL for the Game8 page containing the pack's table of cards.
+    previous_cards : dict[str, dict]
+        The cards of the previous run, keyed by card number.
+    manifest : dict[str, dict[str, str | None]]
+        The fingerprints of the previous run (see `load_manifest`).
+    new_manifest : dict[str, dict[str, str | None]]
+        Updated in-place with the fingerprints of every card successfully extracted or reused.
+    workers : int
+        The number of threads used to fingerprint and extract cards at the same time.
+
+    Returns
+    -------
+    pack_data : list[dict]
+        The cards of the pack, in the same order as the rows of the pack table. The
+        extracted cards are not passed through the manual fixes (see `parser.fix_cards`).
+    """
+    card_tr_elements = fetch_card_rows(pack_url)
+    fingerprints = map_rows(fingerprint_row, card_tr_elements, workers=workers)
+
+    changed = [
+        card_html
+        for card_html, (number, card_fingerprint) in zip(card_tr_elements, fingerprints)
+        if number not in previous_cards
+        or card_fingerprint["detail"] is None
+        or manifest.get(number) != card_fingerprint
+    ]
+    print(f"  {len(changed)} of {len(card_tr_elements)} cards are new or changed")
+    extracted = iter(map_rows(extract_row, changed, workers=workers))
+
+    pack_data = []
+    changed_ids = {id(card_html) for card_html in changed}
+    for card_html, (number, card_fingerprint) in zip(card_tr_elements, fingerprints):
+        if id(card_html) in changed_ids:
+            card = next(extracted)
+            if card is None:
+                # Keep the previous version of a card that failed to extract
+                card = previous_cards.get(number)
+            else:
+                new_manifest[card["number"]] = card_fingerprint
+        else:
+            card = previous_cards[number]
+            new_manifest[number] = card_fingerprint
+
+        if card is not None:
+            pack_data.append(card)
+
+    return pack_data
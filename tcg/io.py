@@ -1,11 +1,42 @@
+import contextvars
 import csv
-import requests
-from bs4 import BeautifulSoup, element
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from bs4 import BeautifulSoup, SoupStrainer, element
+from tcg import metrics, parser_lxml, web
+from tcg.cache import ResponseCache
+from tcg.card import Card
 from tcg.parser import extract_card
-from tcg.utils import COLUMNS, clean_str
+from tcg.utils import COLUMNS, DEFAULT_EMPTY, clean_str
 
+# Parsers available for pack tables:
+# - "bs4": BeautifulSoup tree walks (`tcg.parser`)
+# - "lxml": precompiled XPath on `lxml.html` elements (`tcg.parser_lxml`), same output but faster
+PARSERS = ("bs4", "lxml")
 
-def fetch_html_table(page_url: str, page_type: str = "") -> element.Tag:
+# Parser used by `fetch_card_rows`
+PARSER = "bs4"
+
+
+def set_parser(name: str):
+    """Selects the parser (one of `PARSERS`) used for the rows of every pack table."""
+    global PARSER
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser <{name}>, use one of {list(PARSERS)}")
+    PARSER = name
+
+
+# `class` filters of the wanted `<table>` on each type of page
+TABLE_CLASSES = {
+    "main": "a-table a-table table--fixed",
+    "pack": ["a-table", "table--fixed", "flexible-cell"],
+}
+
+
+@metrics.timed("fetch_html_table")
+def fetch_html_table(page_url: str, page_type: str = "", partial: bool = True) -> element.Tag:
     """
     Fetch the HTML table from the given URL. This table should either be:
     - The table on the [Pokémon TCG Pocket main page](https://game8.co/games/Pokemon-TCG-Pocket/archives/482685) which contains links to each pack page
@@ -19,6 +50,9 @@ def fetch_html_table(page_url: str, page_type: str = "") -> element.Tag:
         The type of page containing tables. It is one of:
         - 'main' for the initial page with the table of packs
         - 'pack' for each pack page with the tables of cards
+    partial : bool
+        If `True` (the default), only the candidate `<table>` subtrees are built
+        (see `find_html_table`). Use `False` to parse the whole page.
 
     Returns
     -------
@@ -32,40 +66,11 @@ def fetch_html_table(page_url: str, page_type: str = "") -> element.Tag:
     RuntimeError
         If no `<table>` is found in the fetched HTML.
     """
-    # Download pack page
-    response = requests.get(page_url)
-    response.raise_for_status()
-
-    # Parse total HTML with BeautifulSoup
-    soup = BeautifulSoup(response.text, "lxml")
-
-    # Locate the table we want
-    if page_type == "main":
-        table = soup.find("table", {"class": "a-table a-table table--fixed"})
-    elif page_type == "pack":
-        tables = soup.find_all("table", class_=["a-table", "table--fixed", "flexible-cell"])
-        # Find the correct table
-        table = None
-        for t in tables:
-            thead = t.find("thead")
-            if not thead:
-                continue
-
-            first_row = thead.find("tr")
-            if not first_row:
-                continue
-
-            first_cell = first_row.find(["th", "td"])
-            if not first_cell:
-                continue
-
-            # The table with card info has first cell with a checkmark
-            if first_cell.get_text(strip=True) == "✔":
-                table = t
-                break
-    else:
-        raise ValueError("Please use on of ['main', 'mode'] for `page_type`")
+    # Download pack page (or reuse the cached copy)
+    page_html = web.fetch_text(page_url)
 
+    with metrics.METRICS.time("parse_table"):
+        table = find_html_table(page_html, page_type, partial=partial)
     if table is None:
         raise RuntimeError(
             f"Could not find the card-dex table with `{page_type}` on page {page_url}"
@@ -74,6 +79,63 @@ def fetch_html_table(page_url: str, page_type: str = "") -> element.Tag:
     return table
 
 
+def find_html_table(page_html: str, page_type: str, partial: bool = True) -> element.Tag | None:
+    """
+    Locates the wanted table in the HTML of a main or pack page (see `fetch_html_table`).
+
+    With `partial`, a `SoupStrainer` makes BeautifulSoup keep only the `<table>`
+    elements while the page is parsed, so the navigation, ads and comments are
+    never built into the tree. The search over the tables is the same as for a
+    full parse.
+
+    Parameters
+    ----------
+    page_html : str
+        The raw HTML of the page.
+    page_type : str
+        Either `'main'` or `'pack'`.
+    partial : bool
+        If `False`, the whole page is parsed.
+
+    Returns
+    -------
+    bs4.element.Tag | None
+        The `<table>` element, or `None` if the page has none.
+    """
+    if page_type not in TABLE_CLASSES:
+        raise ValueError("Please use on of ['main', 'mode'] for `page_type`")
+    table_class = TABLE_CLASSES[page_type]
+
+    # Parse only the candidate tables, or the total HTML
+    # (the strainer sees the raw `class` attribute, so the classes are matched afterwards)
+    parse_only = SoupStrainer("table") if partial else None
+    soup = BeautifulSoup(page_html, "lxml", parse_only=parse_only)
+
+    # Locate the table we want
+    if page_type == "main":
+        return soup.find("table", class_=table_class)
+
+    # Find the correct table
+    for t in soup.find_all("table", class_=table_class):
+        thead = t.find("thead")
+        if not thead:
+            continue
+
+        first_row = thead.find("tr")
+        if not first_row:
+            continue
+
+        first_cell = first_row.find(["th", "td"])
+        if not first_cell:
+            continue
+
+        # The table with card info has first cell with a checkmark
+        if first_cell.get_text(strip=True) == "✔":
+            return t
+
+    return None
+
+
 def get_pack_names_and_urls() -> dict[str, str]:
     """
     Looks through the [Pokémon TCG Pocket main page](https://game8.co/games/Pokemon-TCG-Pocket/archives/482685) to extract the urls for each of the packs.
@@ -112,9 +174,98 @@ def get_pack_names_and_urls() -> dict[str, str]:
     return pack_names_urls
 
 
-def extract_pack(pack_url: str) -> list[dict]:
+def extract_row(card_html: element.Tag) -> dict | None:
     """
-    Appends json card information to list for all cards in the pack
+    Extracts a single card from its `<tr>` element, reporting any failure.
+
+    Parameters
+    ----------
+    card_html : bs4.element.Tag | lxml.html.HtmlElement
+        A `<tr>` element from the `<tbody>` of a pack table (see `fetch_card_rows`).
+
+    Returns
+    -------
+    row : dict | None
+        The card dictionary from `extract_card`, or `None` if extraction failed.
+    """
+    id = None
+    with metrics.METRICS.time("extract_card"):
+        try:
+            id = row_number(card_html)
+            if isinstance(card_html, element.Tag):
+                row = extract_card(card_html)
+            else:
+                row = parser_lxml.extract_card(card_html)
+            print(f"  Extracted card <{id}>")
+            return row
+        except Exception as e:
+            print(f"! ERROR FOR CARD <{id}> !")
+            metrics.METRICS.count("extract_card", errors=1)
+            return None
+
+
+def row_number(card_html) -> str | None:
+    """Returns the card number (e.g. `"A1 001"`) of a pack table row from either parser."""
+    if isinstance(card_html, element.Tag):
+        return clean_str(card_html.find_all("td")[1].text)
+    return parser_lxml.row_number(card_html)
+
+
+def row_url(card_html) -> str | None:
+    """Returns the URL of the detail page linked from a pack table row from either parser."""
+    if isinstance(card_html, element.Tag):
+        return card_html.find_all("td")[2].find("a").get("href")
+    return parser_lxml.row_url(card_html)
+
+
+def row_html(card_html) -> str:
+    """Returns the HTML of a pack table row from either parser."""
+    if isinstance(card_html, element.Tag):
+        return str(card_html)
+    return parser_lxml.row_html(card_html)
+
+
+def map_rows(func, items: list, workers: int = 1) -> list:
+    """
+    Applies `func` to every item, optionally on a pool of threads.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to apply to each item.
+    items : list
+        The items (usually `<tr>` elements) to process.
+    workers : int
+        The number of threads to use. With `1` every item is processed serially.
+
+    Returns
+    -------
+    results : list
+        The results of `func`, in the same order as `items`.
+    """
+    return list(imap_rows(func, items, workers=workers))
+
+
+def imap_rows(func, items: list, workers: int = 1):
+    """
+    Lazy version of `map_rows`: yields each result as soon as it and every result
+    before it are ready, so the caller can consume them while later items are processed.
+    """
+    # `executor.map` yields results in input order, so the table order is kept
+    if workers > 1:
+        # Threads run in a copy of the caller's context, so their work is recorded under its pack
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(lambda item: context.copy().run(func, item), items)
+    else:
+        for item in items:
+            yield func(item)
+
+
+@metrics.timed("fetch_html_table")
+def fetch_card_rows(pack_url: str) -> list[element.Tag]:
+    """
+    Downloads a pack page and returns the `<tr>` element of every card in its table.
 
     Parameters
     ----------
@@ -123,34 +274,215 @@ def extract_pack(pack_url: str) -> list[dict]:
 
     Returns
     -------
-    pack_data : list[dict]
-        The list containing all dictionaries representing cards in the pack
+    card_tr_elements : list[bs4.element.Tag] | list[lxml.html.HtmlElement]
+        The `<tr>` elements of the `<tbody>`, in table order (see `find_card_rows`).
     """
     # Pipeline input data directly from page
     print(f"Fetching HTML Table from {pack_url}")
-    pokemon_table = fetch_html_table(page_url=pack_url, page_type="pack")
+    return find_card_rows(web.fetch_text(pack_url), pack_url)
 
-    # Extract all <tr> elements of the <tbody>
-    card_tr_elements = pokemon_table.find("tbody").find_all("tr")
+
+@metrics.timed("parse_table")
+def find_card_rows(page_html: str, pack_url: str = "") -> list[element.Tag]:
+    """
+    Returns the `<tr>` element of every card in the table of a downloaded pack page.
+
+    Parameters
+    ----------
+    page_html : str
+        The raw HTML of the pack page.
+    pack_url : str
+        The URL of the page, for error messages.
+
+    Returns
+    -------
+    card_tr_elements : list[bs4.element.Tag] | list[lxml.html.HtmlElement]
+        The `<tr>` elements of the `<tbody>`, in table order. They are `lxml.html`
+        elements when `PARSER` is `"lxml"`; `extract_row` handles both.
+    """
+    if PARSER == "lxml":
+        card_tr_elements = parser_lxml.find_card_rows(page_html)
+    else:
+        pokemon_table = find_html_table(page_html, page_type="pack")
+        if pokemon_table is None:
+            raise RuntimeError(f"Could not find the card-dex table with `pack` on page {pack_url}")
+        # Extract all <tr> elements of the <tbody>
+        card_tr_elements = pokemon_table.find("tbody").find_all("tr")
     if not card_tr_elements:
         raise ValueError("No <tr> elements found int <tbody>")
+    return card_tr_elements
+
+
+def extract_pack(pack_url: str, workers: int = 1) -> list[dict]:
+    """
+    Appends json card information to list for all cards in the pack
+
+    Parameters
+    ----------
+    pack_url : str
+        The URL for the Game8 page containing the `table.a-table.table--fixed.flexible-cell` table of Pokemon
+    workers : int
+        The number of threads used to extract cards (and download their detail pages)
+        at the same time. With `1` (the default) every card is extracted serially.
+        The number of requests to a single host is further capped by `web.MAX_PER_HOST`.
+
+    Returns
+    -------
+    pack_data : list[dict]
+        The list containing all dictionaries representing cards in the pack,
+        in the same order as the rows of the pack table. The cards are as found on
+        Game8, without the manual fixes of `data/overrides.csv` (see `parser.fix_cards`).
+    """
+    return list(iter_pack(pack_url, workers=workers))
+
+
+def iter_pack(pack_url: str, workers: int = 1, skip_ids=frozenset()):
+    """
+    Generator version of `extract_pack`, yielding each card as soon as it is extracted.
+
+    Parameters
+    ----------
+    pack_url : str
+        The URL for the Game8 page containing the pack's table of cards.
+    workers : int
+        The number of threads used to extract cards at the same time (see `extract_pack`).
+    skip_ids : Container[str]
+        Card numbers that are not extracted (e.g. cards already written by an interrupted run).
+
+    Yields
+    ------
+    card : dict
+        The cards of the pack, in the same order as the rows of the pack table,
+        without the manual fixes (see `extract_pack`). Cards that fail to extract are left out.
+    """
+    with metrics.pack(pack_url), metrics.METRICS.time("extract_pack"):
+        yield from _extract_rows(fetch_card_rows(pack_url), workers, skip_ids)
+
+
+def extract_pack_html(
+    page_html: str, pack_url: str = "", workers: int = 1, skip_ids=frozenset()
+) -> list[Card]:
+    """
+    Extracts the cards of an already downloaded pack page (see `iter_pack`).
+
+    This is the work done by each process of `iter_packs`.
+    """
+    return list(_extract_rows(find_card_rows(page_html, pack_url), workers, skip_ids))
 
-    # Create list to store dict of cleaned card data
-    pack_data = []
+
+def _extract_pack_in_process(page_html: str, pack_url: str, workers: int, skip_ids) -> tuple[list[Card], dict]:
+    """Runs `extract_pack_html` in a pack process, returning the cards with the metrics recorded for them."""
+    metrics.reset()
+    with metrics.pack(pack_url), metrics.METRICS.time("extract_pack"):
+        cards = extract_pack_html(page_html, pack_url, workers, skip_ids)
+    return cards, metrics.METRICS.snapshot()
+
+
+def _extract_rows(card_tr_elements: list, workers: int, skip_ids):
+    """Yields the cards of the rows of a pack table, leaving out `skip_ids` and failed rows."""
+    if skip_ids:
+        card_tr_elements = [row for row in card_tr_elements if row_number(row) not in skip_ids]
 
     # Iterate over each <tr> element representing all metadata for one card
-    for card_html in card_tr_elements:
+    for row in imap_rows(extract_row, card_tr_elements, workers=workers):
+        if row is not None:
+            yield row
+
+
+def iter_packs(pack_urls: list[str], workers: int = 1, processes: int = 1, skip_ids=frozenset()):
+    """
+    Yields the cards of several packs, pack after pack in the order of `pack_urls`.
+
+    With `processes > 1`, the pack pages are downloaded here and each one is parsed
+    by a pool of processes (`extract_pack_html`), so packs are parsed on several CPU
+    cores at once. The cards are still yielded in the same order as with a single
+    process. If the pool cannot be started (e.g. the platform lacks the needed
+    primitives), the packs are parsed in this process instead.
+
+    Parameters
+    ----------
+    pack_urls : list[str]
+        The URLs of the pack pages.
+    workers : int
+        The number of threads used to extract the cards of a pack (see `extract_pack`).
+    processes : int
+        The number of processes parsing packs at the same time.
+    skip_ids : Container[str]
+        Card numbers that are not extracted (see `iter_pack`).
+
+    Yields
+    ------
+    card : Card
+        The cards of every pack, in pack order then table order, without the manual
+        fixes (see `extract_pack`).
+    """
+    if processes > 1:
         try:
-            id = card_html.find_all("td")[1].text
-            row = extract_card(card_html)
-            print(f"  Extracted card <{id}>")
-            pack_data.append(row)
-        except Exception as e:
-            print(f"! ERROR FOR CARD <{id}> !")
+            executor = ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_pack_process, initargs=_pack_process_settings(processes)
+            )
+        except (ImportError, NotImplementedError, OSError) as e:
+            print(f"! Could not start {processes} processes ({e}), parsing packs in this process !")
+        else:
+            yield from _iter_packs_in_pool(executor, pack_urls, workers, skip_ids)
+            return
+
+    for pack_url in pack_urls:
+        yield from iter_pack(pack_url, workers=workers, skip_ids=skip_ids)
+
+
+def _iter_packs_in_pool(executor: ProcessPoolExecutor, pack_urls: list[str], workers: int, skip_ids):
+    """Downloads the pack pages and yields the cards parsed by `executor`, in pack order."""
+    pending = deque()
+
+    def next_pack() -> list[Card]:
+        cards, pack_metrics = pending.popleft().result()
+        metrics.METRICS.merge(pack_metrics)
+        return cards
+
+    try:
+        for pack_url in pack_urls:
+            print(f"Fetching HTML Table from {pack_url}")
+            with metrics.pack(pack_url):
+                page_html = web.fetch_text(pack_url)
+            pending.append(executor.submit(_extract_pack_in_process, page_html, pack_url, workers, skip_ids))
+            # Hand over the packs parsed so far (in order) while the next pages download
+            while pending and pending[0].done():
+                yield from next_pack()
+
+        while pending:
+            yield from next_pack()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _pack_process_settings(processes: int) -> tuple:
+    """
+    Returns the settings of this process that the pack processes must share.
+
+    Processes may not inherit the module state (e.g. with the "spawn" start method),
+    so the parser, cache and client settings are passed explicitly. The per-host
+    limit is split between the processes, so the total stays `web.MAX_PER_HOST`.
+    """
+    cache = web.CACHE
+    client = web.CLIENT
+    return (
+        PARSER,
+        None if cache is None else (cache.cache_dir, cache.ttl, cache.max_bytes),
+        (client.pool_size, client.max_retries, client.backoff, client.max_backoff),
+        max(1, web.MAX_PER_HOST // processes),
+    )
+
 
-    return pack_data
+def _init_pack_process(parser: str, cache_settings: tuple | None, client_settings: tuple, max_per_host: int):
+    """Applies the settings of `_pack_process_settings` in a pack process."""
+    set_parser(parser)
+    web.set_cache(None if cache_settings is None else ResponseCache(*cache_settings))
+    web.set_client(web.HttpClient(*client_settings))
+    web.set_max_per_host(max_per_host)
 
 
+@metrics.timed("write_to_csv")
 def write_to_csv(cards_data: list[dict[str, str]], output_file: str):
     """
     Writes a list of dictionaries containing card data to a CSV file.
@@ -169,3 +501,109 @@ def write_to_csv(cards_data: list[dict[str, str]], output_file: str):
         writer.writeheader()
         for card in cards_data:
             writer.writerow(card)
+
+
+def read_from_csv(input_file: str) -> list[Card]:
+    """
+    Reads back a CSV file written by `write_to_csv`.
+
+    Empty fields are converted back to `DEFAULT_EMPTY`, so the returned cards
+    are identical to the ones originally written.
+
+    Args:
+        input_file (str): The path of the csv to read.
+
+    Returns:
+        cards_data (list): A list of `Card` records containing the card attributes, in file order.
+    """
+    with open(input_file, mode="r", newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        return [
+            Card.from_dict({k: v if v != "" else DEFAULT_EMPTY for k, v in row.items()})
+            for row in reader
+        ]
+
+
+class CsvStreamWriter:
+    """
+    Writes cards to a CSV one at a time, flushing every row as soon as it is written.
+
+    Rows go to `<output_file>.partial`, which is renamed to `output_file` once the
+    writer is closed without an error. A crash therefore keeps every card written so
+    far in the partial file while leaving the previous `output_file` untouched, and
+    only the card being written is ever held in memory.
+
+    With `resume`, an existing partial file is continued instead of started over:
+    a row left unfinished by the crash is dropped, and the numbers of the cards
+    already written are available in `resumed_ids` (the last one in `last_id`).
+
+    Parameters
+    ----------
+    output_file : str | Path
+        The path of the final CSV, with the same layout as `write_to_csv`.
+    resume : bool
+        If `True`, append to the partial file of an interrupted run.
+
+    Examples
+    --------
+    >>> with CsvStreamWriter("data/full.csv") as writer:
+    ...     for card in iter_pack(pack_url):
+    ...         writer.write(card)
+    """
+
+    def __init__(self, output_file: str | Path, resume: bool = False):
+        self.output_file = Path(output_file)
+        self.partial_file = self.output_file.with_name(self.output_file.name + ".partial")
+        self.resumed_ids: set[str] = set()
+        self.last_id: str | None = None
+        self.num_written = 0
+
+        # An empty partial file (e.g. cut in its header) is started over
+        if resume and self.partial_file.exists() and self._drop_partial_row() > 0:
+            for card in read_from_csv(self.partial_file):
+                self.resumed_ids.add(card["number"])
+                self.last_id = card["number"]
+            self._file = open(self.partial_file, mode="a", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=COLUMNS)
+        else:
+            self._file = open(self.partial_file, mode="w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=COLUMNS)
+            self._writer.writeheader()
+            self._file.flush()
+
+    def _drop_partial_row(self) -> int:
+        """
+        Cuts a row left unfinished by a crash (every complete row ends with a line break).
+
+        Returns the size of the partial file left.
+        """
+        with open(self.partial_file, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+                return content.rfind(b"\n") + 1
+            return len(content)
+
+    def write(self, card: dict[str, str | None]):
+        """Appends one card and flushes it to the partial file."""
+        with metrics.METRICS.time("write_to_csv"):
+            self._writer.writerow(card)
+            self._file.flush()
+        self.last_id = card["number"]
+        self.num_written += 1
+
+    def close(self, complete: bool = True):
+        """
+        Closes the partial file, renaming it to `output_file` if `complete`.
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+        if complete:
+            os.replace(self.partial_file, self.output_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(complete=exc_type is None)
@@ -1,14 +1,79 @@
+import argparse
 import json
+import ijson
 import pandas as pd
-import utils
 import time
-import requests
 import os
+from dataclasses import dataclass
+from tcg import utils, web
+from tcg.overrides import get_overrides
 
 input_json_path = "data/raw_from_web3.json"
 flattend_csv_path = "data/flattened_pokemon.csv"
 cleaned_csv_path = "data/cleaned_pokemon.csv"
 
+# Flattened columns dropped by `clean_csv`
+COLUMNS_TO_REMOVE = [
+    "owned",
+    "trainer_type",
+    "moves3_damage",
+    "moves3_energy_cost",
+    "moves3_name",
+    "moves3_description",
+]
+
+# Flattened columns renamed by `clean_csv`
+RENAMED_COLUMNS = {
+    "evolution_stage": "stage",
+    "ability": "ability_name",
+    "image_url": "image",
+    "archive_url": "page",
+    "moves1_damage": "move1_damage",
+    "moves1_energy_cost": "move1_cost",
+    "moves1_name": "move1_name",
+    "moves1_description": "move1_description",
+    "moves2_damage": "move2_damage",
+    "moves2_energy_cost": "move2_cost",
+    "moves2_name": "move2_name",
+    "moves2_description": "move2_description",
+}
+
+# Columns of the cleaned CSV, in order
+CLEANED_COLUMNS = [
+    "id",
+    "name",
+    "card_type",
+    "pokemon_type",
+    "hp",
+    "ex",
+    "stage",
+    "rarity",
+    "set",
+    "subset",
+    "ability_name",
+    "move1_name",
+    "move1_cost",
+    "move1_damage",
+    "move1_description",
+    "move2_name",
+    "move2_cost",
+    "move2_damage",
+    "move2_description",
+    "image",
+    "page",
+]
+
+# Value of the cleaned `ex` column for each `ex` text
+EX_LEVELS = {"ex": 2, "Mega Evolution ex": 3}
+
+# Game8 endpoint serving the JSON dump of the cards
+STRUCTURAL_MAPPINGS_URL = "https://game8.co/api/tool_structural_mappings/551.json"
+
+# Path of the card list in the JSON dumps, as an ijson prefix
+CARDS_PREFIX = "cardArraySchema.cards.item"
+
+# Number of cards flattened and cleaned at once by `convert_json_streaming`
+CHUNK_SIZE = 5000
 
 
 def flatten_pokemon_data(input_json_path, list_key="moves"):
@@ -22,66 +87,222 @@ def flatten_pokemon_data(input_json_path, list_key="moves"):
         print("No cards found in the JSON.")
         return
 
-    # 2. Determine the maximum number of nested items (e.g., moves)
-    # This ensures we create enough columns for the card with the MOST moves.
-    max_items = 0
-    nested_keys = set()
+    return flatten_cards(cards, list_key)
+
+
+@dataclass
+class CardSchema:
+    """
+    The columns of the flattened cards of a JSON dump.
+
+    Attributes
+    ----------
+    card_keys : list[str]
+        The keys of the cards (except the nested list), in order of appearance.
+    nested_keys : list[str]
+        The keys of the items of the nested list (e.g. the move `name`, `damage`...).
+    max_items : int
+        The length of the longest nested list.
+    """
+
+    card_keys: list[str]
+    nested_keys: list[str]
+    max_items: int
+
+    def nested_columns(self, list_key: str = "moves") -> list[str]:
+        """Returns the flattened columns of the nested list (e.g. `moves1_name`)."""
+        return [
+            f"{list_key}{slot}_{key}"
+            for slot in range(1, self.max_items + 1)
+            for key in self.nested_keys
+        ]
+
+
+def flatten_cards(cards, list_key="moves", schema=None):
+    """
+    Flattens the nested list `list_key` of each card into numbered columns.
+
+    Each item of the list becomes the columns `<list_key><slot>_<key>` (e.g.
+    `moves1_name`, `moves1_damage`, ...), with as many slots as the card with the
+    most items. Missing items and keys are filled with empty strings.
+
+    Parameters
+    ----------
+    cards : list[dict]
+        The cards of the JSON dump (`cardArraySchema.cards`).
+    list_key : str
+        The key of the nested list to flatten.
+    schema : CardSchema | None
+        The columns to give the cards (e.g. from `scan_card_schema`), so every chunk
+        of a dump gets the same columns. Defaults to the columns found in `cards`.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        One row per card.
+    """
+    # 2. One column per card key, the nested lists stay as objects
+    # (`pd.DataFrame` is much faster than `pd.json_normalize` for flat records)
+    df = pd.DataFrame(cards)
+    nested = df.pop(list_key) if list_key in df.columns else pd.Series(index=df.index, dtype=object)
+    if schema is not None:
+        df = df.reindex(columns=schema.card_keys)
+
+    # 3. One row per nested item (e.g. move), indexed by (card row, slot number)
+    items = nested.explode().dropna()
+    slots = items.groupby(level=0).cumcount() + 1
+    max_items = int(slots.max()) if len(slots) else 0
+    items_df = pd.DataFrame(items.tolist(), index=[items.index, slots.to_numpy()], dtype=object)
+    if schema is None:
+        schema = CardSchema(list(df.columns), list(items_df.columns), max_items)
+        print(f"Done! Processed {len(df)} cards. Max {list_key} found: {max_items}")
+
+    # 4. Spread the slots into columns: moves1_name, moves1_damage, ..., moves2_name, ...
+    if schema.max_items:
+        wide = items_df.fillna("").unstack(fill_value="")
+        wide = wide.reindex(
+            columns=[(key, slot) for slot in range(1, schema.max_items + 1) for key in schema.nested_keys]
+        )
+        wide.columns = schema.nested_columns(list_key)
+        df = df.join(wide)
+        df[wide.columns] = df[wide.columns].fillna("")
+
+    return df
+
+
+def iter_cards(input_json_path):
+    """
+    Yields the cards of a JSON dump one at a time, without loading the whole file.
+    """
+    with open(input_json_path, "rb") as f:
+        yield from ijson.items(f, CARDS_PREFIX, use_float=True)
+
+
+def scan_card_schema(input_json_path, list_key="moves"):
+    """
+    Finds the columns of the flattened cards of a JSON dump.
+
+    The cards are streamed from the dump and only their keys are kept, so the scan
+    takes constant memory.
+
+    Parameters
+    ----------
+    input_json_path : str
+        The JSON dump (e.g. `data/raw_from_web3.json`).
+    list_key : str
+        The key of the nested list to flatten.
+
+    Returns
+    -------
+    schema : CardSchema
+        The columns, in the order `flatten_cards` gives them for the whole dump.
+    num_cards : int
+        The number of cards of the dump.
+    """
+    return card_schema(iter_cards(input_json_path), list_key)
+
+
+def card_schema(cards, list_key="moves"):
+    """
+    Finds the columns of the flattened `cards` (see `scan_card_schema`).
+
+    Parameters
+    ----------
+    cards : Iterable[dict]
+        The cards, e.g. from `iter_cards`. They are only iterated once.
+    list_key : str
+        The key of the nested list to flatten.
+
+    Returns
+    -------
+    schema : CardSchema
+        The columns, in the order `flatten_cards` gives them for all the cards.
+    num_cards : int
+        The number of cards.
+    """
+    card_keys, nested_keys = {}, {}
+    max_items = num_cards = 0
 
     for card in cards:
+        num_cards += 1
+        card_keys.update(dict.fromkeys(card))
         nested_list = card.get(list_key, [])
         max_items = max(max_items, len(nested_list))
-        # Identify all keys inside the nested objects (e.g., name, damage, etc.)
         for item in nested_list:
-            if isinstance(item, dict):
-                nested_keys.update(item.keys())
+            nested_keys.update(dict.fromkeys(item))
 
-    # 3. Flatten the data
-    flattened_list = []
+    card_keys.pop(list_key, None)
+    return CardSchema(list(card_keys), list(nested_keys), max_items), num_cards
 
-    for card in cards:
-        # Create a copy of the card excluding the nested list
-        flat_card = {k: v for k, v in card.items() if k != list_key}
 
-        # Get the actual moves for this card
-        current_nested_list = card.get(list_key, [])
+def convert_json_streaming(
+    input_json_path, flattened_path, cleaned_path, list_key="moves", chunk_size=CHUNK_SIZE
+):
+    """
+    Flattens and cleans a JSON dump into CSVs, `chunk_size` cards at a time.
+
+    Writes the same CSVs as `flatten_pokemon_data` and `clean_csv`, but the cards
+    are streamed from the dump, so memory does not grow with the size of the dump.
+
+    Parameters
+    ----------
+    input_json_path : str
+        The JSON dump (e.g. `data/raw_from_web3.json`).
+    flattened_path, cleaned_path : str
+        The flattened and cleaned CSVs to write.
+    list_key : str
+        The key of the nested list to flatten.
+    chunk_size : int
+        The number of cards converted at once.
+
+    Returns
+    -------
+    num_cards : int
+        The number of cards converted.
+    """
+    schema, num_cards = scan_card_schema(input_json_path, list_key)
+    if not num_cards:
+        print("No cards found in the JSON.")
+        return 0
 
-        # Loop through every possible slot up to the global maximum
-        for i in range(max_items):
-            slot_num = i + 1
+    with (
+        open(flattened_path, "w", newline="", encoding="utf-8") as flattened_file,
+        open(cleaned_path, "w", newline="", encoding="utf-8") as cleaned_file,
+    ):
+        chunk = []
+        first = True
+        for card in iter_cards(input_json_path):
+            chunk.append(card)
+            if len(chunk) == chunk_size:
+                _write_chunk(chunk, schema, list_key, flattened_file, cleaned_file, header=first)
+                chunk, first = [], False
+        if chunk:
+            _write_chunk(chunk, schema, list_key, flattened_file, cleaned_file, header=first)
 
-            if i < len(current_nested_list):
-                # Card has a move at this index
-                move_data = current_nested_list[i]
-                for key in nested_keys:
-                    # Column name format: move1_name, move1_damage, etc.
-                    flat_card[f"{list_key}{slot_num}_{key}"] = move_data.get(key, "")
-            else:
-                # Card doesn't have a move at this index; fill with empty strings
-                for key in nested_keys:
-                    flat_card[f"{list_key}{slot_num}_{key}"] = ""
+    print(f"Done! Processed {num_cards} cards. Max {list_key} found: {schema.max_items}")
+    return num_cards
 
-        flattened_list.append(flat_card)
 
-    print(f"Done! Processed {len(cards)} cards. Max {list_key} found: {max_items}")
-
-    # Return the DataFrame
-    df = pd.DataFrame(flattened_list)
-    return df
+def _write_chunk(cards, schema, list_key, flattened_file, cleaned_file, header):
+    """Appends a chunk of cards to the flattened and cleaned CSVs."""
+    df = flatten_cards(cards, list_key, schema=schema)
+    df.to_csv(flattened_file, index=False, header=header)
+    clean_csv(df).to_csv(cleaned_file, index=False, header=header)
 
 
 def fetch_structural_mappings(updated_at: int = None):
     """Fetch JSON from game8 structural mappings endpoint.
 
     The endpoint expects an `updatedAt` Unix timestamp. If not provided,
-    this function uses the current epoch seconds.
+    this function uses the current epoch seconds. The response goes through
+    the shared on-disk cache of `tcg.web`.
     """
     if updated_at is None:
         updated_at = int(time.time())
 
-    url = f"https://game8.co/api/tool_structural_mappings/551.json?updatedAt={updated_at}"
-    resp = requests.get(url)
-    resp.raise_for_status()
-    raw_json = resp.json()
+    url = f"{STRUCTURAL_MAPPINGS_URL}?updatedAt={updated_at}"
+    # `updatedAt` only busts caches, so the response is cached under the bare URL
+    raw_json = json.loads(web.fetch_text(url, cache_key=STRUCTURAL_MAPPINGS_URL))
     os.makedirs("data", exist_ok=True)
     with open("./data/RAWJSON.json", "w", encoding="utf-8") as f:
         json.dump(raw_json, f, ensure_ascii=False, indent=2)
@@ -89,113 +310,87 @@ def fetch_structural_mappings(updated_at: int = None):
     return raw_json
 
 
+def map_distinct(series, func):
+    """
+    Applies `func` once per distinct value of `series` instead of once per row.
+
+    Missing values are mapped to an empty string.
+    """
+    codes, uniques = pd.factorize(series)
+    mapped = pd.Series([func(value) for value in uniques] + [""], dtype=object)
+    # code -1 (missing value) picks the trailing ""
+    return pd.Series(mapped.to_numpy()[codes], index=series.index)
+
+
 def clean_csv(df):
     if df is None:
         df = pd.read_csv(flattend_csv_path)
 
     # Remove unnecessary columns
-    columns_to_remove = [
-        "owned",
-        "trainer_type",
-        "moves3_damage",
-        "moves3_energy_cost",
-        "moves3_name",
-        "moves3_description",
-    ]
-    df = df.drop(columns=columns_to_remove, errors="ignore")
+    df = df.drop(columns=COLUMNS_TO_REMOVE, errors="ignore")
 
     # Rename columns
-    renamed_columns = {
-        "evolution_stage": "stage",
-        "ability": "ability_name",
-        "image_url": "image",
-        "archive_url": "page",
-        "moves1_damage": "move1_damage",
-        "moves1_energy_cost": "move1_cost",
-        "moves1_name": "move1_name",
-        "moves1_description": "move1_description",
-        "moves2_damage": "move2_damage",
-        "moves2_energy_cost": "move2_cost",
-        "moves2_name": "move2_name",
-        "moves2_description": "move2_description",
-    }
-    df = df.rename(columns=renamed_columns)
+    df = df.rename(columns=RENAMED_COLUMNS)
 
     # Reorder columns
-    desired_order = [
-        "id",
-        "name",
-        "card_type",
-        "pokemon_type",
-        "hp",
-        "ex",
-        "stage",
-        "rarity",
-        "set",
-        "subset",
-        "ability_name",
-        "move1_name",
-        "move1_cost",
-        "move1_damage",
-        "move1_description",
-        "move2_name",
-        "move2_cost",
-        "move2_damage",
-        "move2_description",
-        "image",
-        "page",
-    ]
-    df = df[[col for col in desired_order if col in df.columns]]
-
-    # Clean up the ex column
-    def convert_ex(value):
-        if value == "ex":
-            return 2
-        elif value == "Mega Evolution ex":
-            return 3
-        else:
-            return 1
+    df = df[[col for col in CLEANED_COLUMNS if col in df.columns]]
 
-    df["ex"] = df["ex"].apply(convert_ex)
-    # Update ex column based on card_type
+    # Clean up the ex column (1 for other Pokemon, 0 for other card types)
+    df["ex"] = df["ex"].map(EX_LEVELS).fillna(1).astype("int64")
     df.loc[(df["ex"] == 1) & (df["card_type"] != "Pokemon"), "ex"] = 0
 
     # Clean up move_cost columns by converting energy text to symbols
     def energy_text_to_symbols(text):
         if text:
-            textlist = text.split(":") if ":" in text else text.split(";")
-            return "".join([utils.parse_energy_cost(x.strip()) for x in textlist])
+            return utils.parse_energy_costs(text)
         else:
             return ""
 
     # Update move cost columns
-    df["move1_cost"] = df["move1_cost"].apply(energy_text_to_symbols)
-    df["move2_cost"] = df["move2_cost"].apply(energy_text_to_symbols)
-    df.loc[df["card_type"] == "Trainer", "move1_cost"] = ""
-    df.loc[df["card_type"] == "Trainer", "move2_cost"] = ""
+    df["move1_cost"] = map_distinct(df["move1_cost"], energy_text_to_symbols)
+    df["move2_cost"] = map_distinct(df["move2_cost"], energy_text_to_symbols)
 
-    # Update stage column
-    df.loc[df["card_type"] == "Trainer", "stage"] = ""
+    # Trainers have no move costs nor stage
+    df.loc[df["card_type"] == "Trainer", ["move1_cost", "move2_cost", "stage"]] = ""
 
     # Update pokemon_type column
     df.loc[df["pokemon_type"] == "Tool", "pokemon_type"] = "Pokemon Tool"
 
-    # Misc corrections
-    df.loc[df["id"] == "A4 177", "hp"] = "60"
+    # Misc corrections (the "json" rows of `data/overrides.csv`)
+    get_overrides("json").apply_frame(df)
 
     # Return final cleaned df
     return df
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flatten and clean a JSON dump of the cards into CSVs.")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the cards from the dump in chunks instead of loading it whole (flat memory use).",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help=f"Cards per chunk with --stream (default: {CHUNK_SIZE})."
+    )
+    args = parser.parse_args()
+
     # print("Obtaining json.")
     # fetch_structural_mappings(1777341550)
 
     print("Starting json converstion!")
-    df = flatten_pokemon_data(input_json_path)
-    df.to_csv(flattend_csv_path, index=False, encoding="utf-8")
-    print(f"Flattened {len(df)} rows!")
-
-    df = clean_csv(df)
-    df.to_csv(cleaned_csv_path, index=False, encoding="utf-8")
-    print(f"Cleaned {len(df)} rows!")
+    if args.stream:
+        num_cards = convert_json_streaming(
+            input_json_path, flattend_csv_path, cleaned_csv_path, chunk_size=args.chunk_size
+        )
+        print(f"Flattened and cleaned {num_cards} rows!")
+        print(get_overrides("json").summary())
+    else:
+        df = flatten_pokemon_data(input_json_path)
+        df.to_csv(flattend_csv_path, index=False, encoding="utf-8")
+        print(f"Flattened {len(df)} rows!")
+
+        df = clean_csv(df)
+        df.to_csv(cleaned_csv_path, index=False, encoding="utf-8")
+        print(f"Cleaned {len(df)} rows!")
+        print(get_overrides("json").summary())
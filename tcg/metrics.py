@@ -0,0 +1,171 @@
+import contextvars
+import datetime
+import functools
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+# Pack whose work is being recorded (`""` outside of a pack), kept per thread of execution
+_current_pack: contextvars.ContextVar[str] = contextvars.ContextVar("pack", default="")
+
+# Description of each counter in the Prometheus export (`tcg_stage_<counter>_total`)
+COUNTER_HELP = {
+    "calls": "Number of times the stage ran.",
+    "seconds": "Wall time spent in the stage, in seconds.",
+    "errors": "Number of times the stage failed.",
+    "requests": "Number of HTTP requests sent.",
+    "retries": "Number of HTTP requests retried.",
+    "bytes": "Number of bytes downloaded.",
+    "full_parses": "Number of card pages parsed whole because the details table could not be scanned.",
+}
+
+
+class RunMetrics:
+    """
+    Timings and counters of a scrape run, per stage and per pack.
+
+    Every stage (e.g. `extract_card` or `download`) gets counters such as `calls`,
+    `seconds`, `errors` or `bytes`, recorded under the pack being extracted at the
+    time (see `pack`). It is safe to record from many threads at once.
+
+    Examples
+    --------
+    >>> with METRICS.time("extract_card"):
+    ...     card = extract_card(row)
+    >>> METRICS.count("download", bytes=1024)
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.stages: dict[tuple[str, str], dict[str, float]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def count(self, stage: str, **counts: float):
+        """Adds `counts` (e.g. `errors=1`) to the counters of `stage` in the current pack."""
+        key = (stage, _current_pack.get())
+        with self._lock:
+            for name, value in counts.items():
+                self.stages[key][name] += value
+
+    @contextmanager
+    def time(self, stage: str):
+        """
+        Records one call of `stage` and its wall time. An exception escaping the block
+        is counted in the `errors` of `stage` before being raised again.
+        """
+        start = time.perf_counter()
+        errors = 0
+        try:
+            yield
+        except BaseException:
+            errors = 1
+            raise
+        finally:
+            self.count(stage, calls=1, seconds=time.perf_counter() - start, errors=errors)
+
+    def merge(self, stages: dict[tuple[str, str], dict[str, float]]):
+        """Adds the counters of another run (e.g. from `snapshot` in a pack process)."""
+        with self._lock:
+            for key, counts in stages.items():
+                for name, value in counts.items():
+                    self.stages[key][name] += value
+
+    def snapshot(self) -> dict[tuple[str, str], dict[str, float]]:
+        """Returns a copy of the counters, keyed by `(stage, pack)`."""
+        with self._lock:
+            return {key: dict(counts) for key, counts in self.stages.items()}
+
+    def by_stage(self) -> dict[str, dict[str, float]]:
+        """Returns the counters of every stage, summed over the packs."""
+        totals = defaultdict(lambda: defaultdict(int))
+        for (stage, _), counts in self.snapshot().items():
+            for name, value in counts.items():
+                totals[stage][name] += value
+        return {stage: dict(counts) for stage, counts in totals.items()}
+
+    def report(self) -> dict:
+        """
+        Returns the run report.
+
+        Returns
+        -------
+        report : dict
+            `{"started": <ISO date>, "seconds": <run time>, "stages": {<stage>: {<counter>: ...}},
+            "packs": {<pack URL>: {<stage>: {<counter>: ...}}}}`, where work done outside of
+            a pack is left out of `packs`.
+        """
+        packs = defaultdict(dict)
+        for (stage, pack), counts in sorted(self.snapshot().items()):
+            if pack:
+                packs[pack][stage] = counts
+        return {
+            "started": datetime.datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "seconds": time.time() - self.started,
+            "stages": self.by_stage(),
+            "packs": dict(packs),
+        }
+
+    def to_prometheus(self) -> str:
+        """Returns the counters in the Prometheus text format, one series per stage and pack."""
+        series = defaultdict(list)
+        for (stage, pack), counts in sorted(self.snapshot().items()):
+            for name, value in counts.items():
+                labels = f'stage="{_escape_label(stage)}",pack="{_escape_label(pack)}"'
+                series[name].append(f"tcg_stage_{name}_total{{{labels}}} {value:g}")
+
+        lines = []
+        for name, samples in series.items():
+            lines.append(f"# HELP tcg_stage_{name}_total {COUNTER_HELP.get(name, name)}")
+            lines.append(f"# TYPE tcg_stage_{name}_total counter")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str | Path):
+        """Writes the run report to `path`: Prometheus text for a `.prom` file, JSON otherwise."""
+        path = Path(path)
+        with open(path, "w", encoding="utf-8") as f:
+            if path.suffix == ".prom":
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.report(), f, indent=4)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Metrics of the current run
+METRICS = RunMetrics()
+
+
+def reset():
+    """Starts recording a new run."""
+    global METRICS
+    METRICS = RunMetrics()
+
+
+@contextmanager
+def pack(pack_url: str):
+    """Records the work done inside the block (and in threads it starts, see `io.imap_rows`) under `pack_url`."""
+    token = _current_pack.set(pack_url)
+    try:
+        yield
+    finally:
+        _current_pack.reset(token)
+
+
+def timed(stage: str):
+    """Decorator recording every call of the function as one call of `stage` (see `RunMetrics.time`)."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.time(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,177 @@
+import csv
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+import pandas as pd
+from tcg.utils import DEFAULT_EMPTY
+
+# Manual fixes of card data: one row per card `number`, `field` and `scope`
+OVERRIDES_FILE = Path(__file__).resolve().parent.parent / "data" / "overrides.csv"
+
+# Pipelines the fixes apply to:
+# - "web": cards written by `driver.main` (extracted, refreshed or copied from the previous CSV), with
+#   the fields of `COLUMNS`
+# - "json": the cleaned JSON dump (`json_convert.clean_csv`), with the columns of `CLEANED_COLUMNS`
+SCOPES = ("web", "json")
+
+
+class Overrides:
+    """
+    Manual fixes for card data that is missing or wrong on the source, indexed by card number.
+
+    Every applied fix is recorded, so a run can report which fixes matched a card,
+    which ones the source already gets right and which ones matched nothing (e.g. a
+    card that was renumbered).
+
+    Parameters
+    ----------
+    fixes : list[tuple[str, str, str | None]]
+        The `(number, field, value)` of every fix.
+    """
+
+    def __init__(self, fixes: list[tuple[str, str, str | None]]):
+        self.fixes = pd.DataFrame(fixes, columns=["number", "field", "value"], dtype=object)
+        self.by_number: dict[str, dict[str, str | None]] = {}
+        for number, field, value in fixes:
+            self.by_number.setdefault(number, {})[field] = value
+
+        # `(number, field)` of every fix that matched a card -> whether it changed the value
+        self.matches: dict[tuple[str, str], bool] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, scope: str, overrides_file: str | Path = OVERRIDES_FILE) -> "Overrides":
+        """
+        Reads the fixes of `scope` (one of `SCOPES`) from `overrides_file`.
+
+        An empty `value` stands for a missing value (`DEFAULT_EMPTY` for "web", `""` for "json").
+        """
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope <{scope}>, use one of {list(SCOPES)}")
+        empty = DEFAULT_EMPTY if scope == "web" else ""
+        with open(overrides_file, "r", newline="", encoding="utf-8") as f:
+            fixes = [
+                (row["number"], row["field"], row["value"] or empty)
+                for row in csv.DictReader(f)
+                if row["scope"] == scope
+            ]
+        return cls(fixes)
+
+    def __len__(self) -> int:
+        return len(self.fixes)
+
+    def apply(self, card):
+        """
+        Applies the fixes of one card in-place.
+
+        Parameters
+        ----------
+        card : Card | dict[str, str | None]
+            A card as returned by `extract_card`.
+        """
+        matches = {}
+        self._fix(card, matches)
+        self.record(matches)
+
+    def patch(self, cards: Iterable) -> Iterator:
+        """
+        Applies the fixes to a stream of cards in-place, yielding each card once fixed.
+
+        The matches of the whole stream are recorded once, when it ends.
+
+        Parameters
+        ----------
+        cards : Iterable[Card | dict[str, str | None]]
+            Cards as returned by `extract_card`, `refresh_card` or `read_from_csv`.
+
+        Yields
+        ------
+        card : Card | dict[str, str | None]
+            The same cards, in the same order.
+        """
+        matches = {}
+        try:
+            for card in cards:
+                self._fix(card, matches)
+                yield card
+        finally:
+            self.record(matches)
+
+    def _fix(self, card, matches: dict[tuple[str, str], bool]):
+        """Applies the fixes of `card`, adding them to `matches`."""
+        fixes = self.by_number.get(card["number"])
+        if not fixes:
+            return
+        for field, value in fixes.items():
+            matches[(card["number"], field)] = card[field] != value
+            card[field] = value
+
+    def apply_frame(self, df: pd.DataFrame, id_column: str = "id") -> pd.DataFrame:
+        """
+        Applies every fix to a table of cards at once.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            One card per row, with the card numbers in `id_column`. It is modified in-place.
+        id_column : str
+            The column holding the card numbers.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The same table.
+        """
+        fixes = self.fixes[self.fixes["number"].isin(df[id_column]) & self.fixes["field"].isin(df.columns)]
+        matches = {}
+        for field, field_fixes in fixes.groupby("field", sort=False):
+            values = df[id_column].map(dict(zip(field_fixes["number"], field_fixes["value"])))
+            rows = values.notna()
+            changed = df.loc[rows, field].astype(str) != values[rows]
+            matches.update(zip(zip(df.loc[rows, id_column], [field] * len(changed)), changed))
+            df.loc[rows, field] = values[rows]
+        self.record(matches)
+        return df
+
+    def record(self, matches: dict[tuple[str, str], bool]):
+        """Adds matched fixes (e.g. from `matches` in another process)."""
+        with self._lock:
+            for key, changed in matches.items():
+                self.matches[key] = self.matches.get(key, False) or changed
+
+    def summary(self) -> str:
+        """Describes how many fixes changed a card, were already right and matched no card."""
+        with self._lock:
+            matches = dict(self.matches)
+        changed = sum(matches.values())
+        unmatched = [
+            f"<{number}> {field}"
+            for number, field in zip(self.fixes["number"], self.fixes["field"])
+            if (number, field) not in matches
+        ]
+        summary = (
+            f"Overrides: {changed} applied, {len(matches) - changed} already correct, "
+            f"{len(unmatched)} matched no card"
+        )
+        return summary + (f" ({', '.join(unmatched)})" if unmatched else "")
+
+
+# Fixes of each scope, loaded the first time they are used
+_overrides: dict[str, Overrides] = {}
+_overrides_lock = threading.Lock()
+
+
+def get_overrides(scope: str) -> Overrides:
+    """Returns the fixes of `scope` from `OVERRIDES_FILE`, loading them once."""
+    with _overrides_lock:
+        if scope not in _overrides:
+            _overrides[scope] = Overrides.load(scope)
+        return _overrides[scope]
+
+
+def reset_matches():
+    """Forgets the fixes matched so far (e.g. at the start of a run)."""
+    with _overrides_lock:
+        for overrides in _overrides.values():
+            with overrides._lock:
+                overrides.matches.clear()
@@ -1,11 +1,16 @@
 from bs4 import BeautifulSoup
+from collections.abc import Callable, Iterable
 import argparse
+import asyncio
 import json
 import matplotlib.pyplot as plt
 import os
 import pandas as pd
 import re
 import requests
+from tcg import web
+from tcg.crawler import scan_exts
+from tcg.page_mappings import PageMappings, ProbeJournal
 
 
 GAMECO_PREFIX = "https://game8.co/games/Pokemon-TCG-Pocket/archives/"
@@ -68,9 +73,7 @@ def extract_single_card_page(url: str, page_html: str = None) -> dict[str, int]:
     """
     if page_html is None:
         try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            page_html = response.text
+            page_html = web.fetch_text(url, timeout=15)
         except requests.RequestException as e:
             print(f"Error 404: {url}")
             return {}
@@ -87,7 +90,7 @@ def extract_single_card_page(url: str, page_html: str = None) -> dict[str, int]:
         return {}
 
     card_id_pattern = r"\b((A|B)\d(a|b)?|P-A) \d{3}\b"
-    html_first_line = response.text.partition("\n")[0]
+    html_first_line = page_html.partition("\n")[0]
     id_match = re.search(card_id_pattern, html_first_line)
     if id_match:
         card_id = id_match.group()
@@ -99,65 +102,146 @@ def extract_single_card_page(url: str, page_html: str = None) -> dict[str, int]:
         return {cleaned_title: -1}
 
 
-def handle_ext(ext: int, page_mappings: dict):
+def is_known_ext(ext: int, page_mappings: PageMappings, verbose: bool = True) -> bool:
     """
-    Determines how to hendle the 6 digit url extention.
-
-    - If `ext` already exists in `GOOD_EXTS`, the lookup is skipped.
-    - If `ext` is in `"BAD_EXTS`, the lookup is also skipped
-    - Otherwise we attempt to go to the `game8.co/.../ext` page
-      - If something goes wrong, `ext` is added to `BAD_EXTS`
-      - Otherwise we add `{"<CARD_ID>": ext}` to `GOOD_EXTS`
+    Whether `ext` was already probed and stored in one of the `page_mappings` categories.
 
     Parameters
     ----------
     ext : int
         The 6 digit extention at the end of a `https://game8.co/games/Pokemon-TCG-Pocket/archives/` url
-    page_mappings : dict
-        The dictionary housing the `"<CARD ID>": "<URL_EXT>"` pairs in `"GOOD_EXTS"` and the `"BAD_EXTS"` list
+    page_mappings : PageMappings
+        The store housing the `"<CARD ID>": "<URL_EXT>"` pairs in `"GOOD_EXTS"`, `"WRONG_EXTS"` and `"BAD_EXTS"`
+    verbose : bool
+        If `True`, prints which category `ext` belongs to.
     """
+    category = page_mappings.category(ext)
+
     # we've already added this card page to the dict
-    if ext in page_mappings["GOOD_EXTS"].values():
-        pack_code = list(page_mappings["GOOD_EXTS"].keys())[
-            list(page_mappings["GOOD_EXTS"].values()).index(ext)
-        ]
+    if category == "GOOD_EXTS" and verbose:
+        pack_code = page_mappings.card_for_ext(ext)
         print(f"{ext} is a good ext. ({pack_code})")
-        return
 
     # page was not a card page (it didn't have an card in title ID)
-    if str(ext) in page_mappings["WRONG_EXTS"]:
-        page_title = page_mappings["WRONG_EXTS"][str(ext)]
+    elif category == "WRONG_EXTS" and verbose:
+        page_title = page_mappings.wrong_exts[ext]
         print(f"{ext} is not a card page. ({page_title})")
-        return
 
-    # page caused an error
-    if ext in page_mappings["BAD_EXTS"]:
-        # print(f"{ext} is a bad ext.")
-        return
+    # page caused an error (BAD_EXTS) is skipped silently
+    return category is not None
+
+
+def probe_ext(ext: int) -> dict[str, int]:
+    """Downloads the page for `ext` and returns its mapping (see `extract_single_card_page`)."""
+    return extract_single_card_page(GAMECO_PREFIX + str(ext))
 
-    full_url = GAMECO_PREFIX + str(ext)
-    current_page_mapping = extract_single_card_page(full_url)
+
+def record_page_mapping(
+    ext: int, current_page_mapping: dict[str, int], page_mappings: PageMappings
+):
+    """
+    Stores the result of probing `ext` in the right `page_mappings` category.
+
+    Parameters
+    ----------
+    ext : int
+        The 6 digit extention that was probed.
+    current_page_mapping : dict[str, int]
+        The result of `extract_single_card_page` for the page of `ext`.
+    page_mappings : PageMappings
+        The store housing the `"<CARD ID>": "<URL_EXT>"` pairs in `"GOOD_EXTS"`, `"WRONG_EXTS"` and `"BAD_EXTS"`
+    """
     # If page_data is empty, then we had an error with the page,
     #   so add ext to the list of bad exts
     if not current_page_mapping:
-        page_mappings["BAD_EXTS"] += [ext]
+        page_mappings.add_bad(ext)
         return
 
     # Append incorrect page ext and title to "WRONG_EXTS"
-    if list(current_page_mapping.values())[0] == -1:
+    card_id, url_ext = next(iter(current_page_mapping.items()))
+    if url_ext == -1:
         # wrong_page_mapping = {dddddd : page_title}
-        wrong_page_mapping = {ext: list(current_page_mapping.keys())[0]}
+        wrong_page_mapping = {ext: card_id}
         print(f"Encountered non-card page:\n  {wrong_page_mapping}")
-        page_mappings["WRONG_EXTS"] |= wrong_page_mapping
+        page_mappings.add_wrong(ext, card_id)
         return
 
     # Append new page data to "GOOD_EXTS"
-    page_mappings["GOOD_EXTS"] |= current_page_mapping
+    page_mappings.add_good(card_id, url_ext)
     print(f"{current_page_mapping} added!")
     return
 
 
-def update_page_mappings():
+def handle_ext(ext: int, page_mappings: PageMappings):
+    """
+    Determines how to hendle the 6 digit url extention.
+
+    - If `ext` already exists in `GOOD_EXTS`, the lookup is skipped.
+    - If `ext` is in `"BAD_EXTS`, the lookup is also skipped
+    - Otherwise we attempt to go to the `game8.co/.../ext` page
+      - If something goes wrong, `ext` is added to `BAD_EXTS`
+      - Otherwise we add `{"<CARD_ID>": ext}` to `GOOD_EXTS`
+
+    Parameters
+    ----------
+    ext : int
+        The 6 digit extention at the end of a `https://game8.co/games/Pokemon-TCG-Pocket/archives/` url
+    page_mappings : PageMappings
+        The store housing the `"<CARD ID>": "<URL_EXT>"` pairs in `"GOOD_EXTS"`, `"WRONG_EXTS"` and `"BAD_EXTS"`
+    """
+    if is_known_ext(ext, page_mappings):
+        return
+
+    record_page_mapping(ext, probe_ext(ext), page_mappings)
+
+
+def scan_page_mappings(
+    exts: Iterable[int],
+    page_mappings: PageMappings,
+    concurrency: int = 16,
+    rate: float | None = None,
+    checkpoint: Callable[[], None] | None = None,
+) -> int:
+    """
+    Probes every unknown extension of `exts` in parallel and stores the results in `page_mappings`.
+
+    Extensions already in `GOOD_EXTS`, `WRONG_EXTS` or `BAD_EXTS` are skipped, so a scan
+    restarted after replaying its journal only probes the extensions that are left.
+
+    Parameters
+    ----------
+    exts : Iterable[int]
+        The 6 digit extentions to scan.
+    page_mappings : PageMappings
+        The store housing the `"<CARD ID>": "<URL_EXT>"` pairs in `"GOOD_EXTS"`, `"WRONG_EXTS"` and `"BAD_EXTS"`
+    concurrency : int
+        The maximum number of pages downloaded at the same time.
+    rate : float | None
+        The maximum number of pages requested per second (`None` for no limit).
+    checkpoint : Callable[[], None] | None
+        Called every 1000 probes and at the end of the scan (e.g. `ProbeJournal.sync`).
+
+    Returns
+    -------
+    num_probed : int
+        The number of extensions that were probed.
+    """
+    unknown_exts = [ext for ext in exts if not is_known_ext(ext, page_mappings, verbose=False)]
+    print(f"Scanning {len(unknown_exts)} unknown exts with concurrency {concurrency}")
+
+    return asyncio.run(
+        scan_exts(
+            unknown_exts,
+            probe=probe_ext,
+            record=lambda ext, mapping: record_page_mapping(ext, mapping, page_mappings),
+            concurrency=concurrency,
+            rate=rate,
+            checkpoint=checkpoint,
+        )
+    )
+
+
+def update_page_mappings(concurrency: int = 16, rate: float | None = None):
     """
     Updates `/data/page_exts.json` with new page data.
 
@@ -179,75 +263,80 @@ def update_page_mappings():
             "BAD_URLS" : [476000, 476001]
         }
     ```
-    """
-    json_path = os.path.join(os.path.dirname(__file__), "..", "data", "page_mappings.json")
 
-    page_mappings = {}
-    # Read existing JSON data
-    with open(json_path, "r") as f:
-        page_mappings = json.load(f)
-        if not "GOOD_EXTS" in page_mappings:
-            page_mappings["GOOD_EXTS"] = {}
-        if not "WRONG_EXTS" in page_mappings:
-            page_mappings["WRONG_EXTS"] = {}
-        if not "BAD_EXTS" in page_mappings:
-            page_mappings["BAD_EXTS"] = []
-
-        # Catch most of them by starting at card 001 and counting up through num_cards
-        # for value in STARTING_URLS.values():
-        #     range_start = value["url_ext"]
-        #     range_end = value["url_ext"] + value["num_cards"]
-        #     for ext in range(range_start, range_end + 1):
-        #         handle_ext(ext, page_mappings)
-
-        # # Second pass through different missing matches in range [x0-n, x0+n]
-        # for value in MISSING_PATCHES.values():
-        #     range_start = value["url_ext"] - value["num_cards"]
-        #     range_end = value["url_ext"] + value["num_cards"]
-        #     for ext in range(range_start - 1, range_end + 1):
-        #         handle_ext(ext, page_mappings)
-
-        for ext in range(START_EXT, END_EXT):
-            handle_ext(ext, page_mappings)
-
-            # save every 1000 times
-            if ext % 1000 == 0:
-                save_page_mappings(page_mappings, filename="page_mappings_temp.json")
-
-        # Remove temp file
-        temp_path = json_path = os.path.join(
-            os.path.dirname(__file__), "..", "data", "page_mappings_temp.json"
+    The extensions are probed in parallel (see `scan_page_mappings`). Every probe result
+    is appended to the journal `/data/page_mappings.journal.jsonl`, which is replayed
+    on start (so an interrupted scan resumes where it stopped) and folded back into
+    `/data/page_mappings.json` once the scan is done.
+
+    Parameters
+    ----------
+    concurrency : int
+        The maximum number of pages downloaded at the same time.
+    rate : float | None
+        The maximum number of pages requested per second (`None` for no limit).
+    """
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+    json_path = os.path.join(data_dir, "page_mappings.json")
+    journal_path = os.path.join(data_dir, "page_mappings.journal.jsonl")
+
+    # Read existing JSON data, plus the probes of an interrupted scan
+    page_mappings = PageMappings.load(json_path)
+    num_replayed = page_mappings.replay(journal_path)
+    if num_replayed:
+        print(f"Resuming scan with {num_replayed} probes replayed from {journal_path}")
+
+    # Catch most of them by starting at card 001 and counting up through num_cards
+    # for value in STARTING_URLS.values():
+    #     range_start = value["url_ext"]
+    #     range_end = value["url_ext"] + value["num_cards"]
+    #     for ext in range(range_start, range_end + 1):
+    #         handle_ext(ext, page_mappings)
+
+    # # Second pass through different missing matches in range [x0-n, x0+n]
+    # for value in MISSING_PATCHES.values():
+    #     range_start = value["url_ext"] - value["num_cards"]
+    #     range_end = value["url_ext"] + value["num_cards"]
+    #     for ext in range(range_start - 1, range_end + 1):
+    #         handle_ext(ext, page_mappings)
+
+    # Allow as many requests to Game8 as there are concurrent probes
+    web.set_max_per_host(concurrency)
+    web.set_client(web.HttpClient(pool_size=concurrency))
+
+    with ProbeJournal(journal_path) as journal:
+        page_mappings.journal = journal
+        scan_page_mappings(
+            range(START_EXT, END_EXT),
+            page_mappings,
+            concurrency=concurrency,
+            rate=rate,
+            checkpoint=journal.sync,
         )
-        try:
-            os.remove(temp_path)
-        except FileNotFoundError:
-            pass
-        
+
         # Final save
-        save_page_mappings(page_mappings)
+        page_mappings.compact(json_path, journal_path)
+        page_mappings.journal = None
 
 
-def save_page_mappings(page_mappings, filename: str = "page_mappings.json"):
-    json_path = os.path.join(os.path.dirname(__file__), "..", "data", filename)
+def compact_page_mappings():
+    """
+    Folds `/data/page_mappings.journal.jsonl` into `/data/page_mappings.json` without scanning.
+    """
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+    json_path = os.path.join(data_dir, "page_mappings.json")
+    journal_path = os.path.join(data_dir, "page_mappings.journal.jsonl")
+
+    page_mappings = PageMappings.load(json_path)
+    num_replayed = page_mappings.replay(journal_path)
+    page_mappings.compact(json_path, journal_path)
+    print(f"Folded {num_replayed} journaled probes into {json_path}")
 
-    # Helper sort function for the dict
-    def sort_key(item):
-        key = item[0]
-        if key == "BAD_EXTS":
-            # Assign highest possible value to put 'BAD_EXTS' at the end
-            return (chr(255), float("inf"))
-        code, number = key.split()
-        return (code, int(number))
-
-    # Sort and write the updated data back to the file
-    page_mappings["BAD_EXTS"] = sorted(page_mappings["BAD_EXTS"])
-    page_mappings["WRONG_EXTS"] = dict(
-        sorted(page_mappings["WRONG_EXTS"].items(), key=lambda kv: int(kv[0]))
-    )
-    good_exts = dict(sorted(page_mappings["GOOD_EXTS"].items(), key=sort_key))
-    page_mappings["GOOD_EXTS"] = good_exts
-    with open(json_path, "w") as f:
-        json.dump(page_mappings, f, indent=4)
+
+def save_page_mappings(page_mappings: PageMappings, filename: str = "page_mappings.json"):
+    """Sorts and writes `page_mappings` to `filename` in `/data/`."""
+    json_path = os.path.join(os.path.dirname(__file__), "..", "data", filename)
+    page_mappings.save(json_path)
 
 
 def find_missing_cards():
@@ -318,6 +407,23 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Update or find missing card page mappings.")
     parser.add_argument("--find", action="store_true", help="Find missing cards in page mappings.")
     parser.add_argument("--update", action="store_true", help="Update page mappings JSON file.")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Fold the probe journal of an interrupted update into page_mappings.json.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Number of pages downloaded at the same time with --update (default: 16).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Maximum number of pages requested per second with --update (default: no limit).",
+    )
     parser.add_argument(
         "--visualize",
         action="store_true",
@@ -327,10 +433,12 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     if args.update:
-        update_page_mappings()
+        update_page_mappings(concurrency=args.concurrency, rate=args.rate)
+    if args.compact:
+        compact_page_mappings()
     if args.find:
         find_missing_cards()
     if args.visualize:
         visualize_page_mappings()
-    if not (args.update or args.find or args.visualize):
+    if not (args.update or args.compact or args.find or args.visualize):
         parser.print_help()
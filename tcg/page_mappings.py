@@ -0,0 +1,265 @@
+import json
+import os
+
+
+class PageMappings:
+    """
+    In-memory store of the probed Game8 URL extensions found in `data/page_mappings.json`.
+
+    Every extension belongs to at most one category:
+    - `GOOD_EXTS`: card pages, stored as `{"<CARD_ID>": URL_EXT}`
+    - `WRONG_EXTS`: pages that are not card pages, stored as `{URL_EXT: "<PAGE_TITLE>"}`
+    - `BAD_EXTS`: extensions whose page caused an error
+
+    `GOOD_EXTS` is indexed both ways (card ID to extension and extension to card ID),
+    and the other categories are hash-backed, so every lookup is O(1) no matter how many
+    extensions were already probed.
+
+    While `journal` is set, every probe result added to the store is also appended to
+    that `ProbeJournal`, so it survives a crash before the next `compact`.
+
+    Parameters
+    ----------
+    good_exts : dict[str, int] | None
+        The `{"<CARD_ID>": URL_EXT}` pairs of card pages.
+    wrong_exts : dict[int, str] | None
+        The `{URL_EXT: "<PAGE_TITLE>"}` pairs of pages that are not card pages.
+    bad_exts : Iterable[int] | None
+        The extensions whose page caused an error.
+    """
+
+    def __init__(
+        self,
+        good_exts: dict[str, int] | None = None,
+        wrong_exts: dict[int, str] | None = None,
+        bad_exts=None,
+    ):
+        self.good_exts: dict[str, int] = {}
+        self.ext_to_card: dict[int, str] = {}
+        self.wrong_exts: dict[int, str] = {}
+        self.bad_exts: set[int] = set()
+        self.journal: ProbeJournal | None = None
+
+        for card_id, ext in (good_exts or {}).items():
+            self.add_good(card_id, ext)
+        for ext, title in (wrong_exts or {}).items():
+            self.add_wrong(ext, title)
+        for ext in bad_exts or []:
+            self.add_bad(ext)
+
+    @classmethod
+    def from_dict(cls, page_mappings: dict) -> "PageMappings":
+        """Builds the store from the JSON layout of `data/page_mappings.json`."""
+        return cls(
+            good_exts=page_mappings.get("GOOD_EXTS", {}),
+            wrong_exts={int(ext): title for ext, title in page_mappings.get("WRONG_EXTS", {}).items()},
+            bad_exts=page_mappings.get("BAD_EXTS", []),
+        )
+
+    @classmethod
+    def load(cls, json_path: str) -> "PageMappings":
+        """Reads the store from a file with the layout of `data/page_mappings.json`."""
+        with open(json_path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> dict:
+        """
+        Returns the store in the JSON layout of `data/page_mappings.json`.
+
+        `GOOD_EXTS` is sorted by pack and card number, while `WRONG_EXTS` and
+        `BAD_EXTS` are sorted by extension.
+        """
+
+        # Helper sort function for the card IDs
+        def sort_key(item):
+            code, number = item[0].split()
+            return (code, int(number))
+
+        return {
+            "GOOD_EXTS": dict(sorted(self.good_exts.items(), key=sort_key)),
+            "WRONG_EXTS": {str(ext): self.wrong_exts[ext] for ext in sorted(self.wrong_exts)},
+            "BAD_EXTS": sorted(self.bad_exts),
+        }
+
+    def save(self, json_path: str):
+        """Writes the store to `json_path` in the layout of `data/page_mappings.json`."""
+        # Write to a temporary file first so a crash never leaves a truncated JSON
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+        os.replace(tmp_path, json_path)
+
+    def replay(self, journal_path: str) -> int:
+        """
+        Adds every probe result recorded in the journal at `journal_path` to the store.
+
+        Replaying is idempotent, so results already folded into the JSON are harmless.
+        A partially written line (from a crash mid-write) is skipped.
+
+        Returns
+        -------
+        num_replayed : int
+            The number of probe results read from the journal (`0` if it doesn't exist).
+        """
+        num_replayed = 0
+        try:
+            with open(journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._apply(entry["category"], entry["ext"], entry.get("value"))
+                    num_replayed += 1
+        except FileNotFoundError:
+            pass
+        return num_replayed
+
+    def compact(self, json_path: str, journal_path: str):
+        """
+        Folds the journal into the canonical JSON.
+
+        The full store is written to `json_path`, after which the journal at
+        `journal_path` is emptied. If the process dies in between, replaying the
+        journal again on the next start gives the same result.
+        """
+        if self.journal is not None:
+            self.journal.sync()
+        self.save(json_path)
+        if self.journal is not None:
+            self.journal.truncate()
+        else:
+            open(journal_path, "w").close()
+
+    def __contains__(self, ext: int) -> bool:
+        return ext in self.ext_to_card or ext in self.wrong_exts or ext in self.bad_exts
+
+    def __len__(self) -> int:
+        return len(self.ext_to_card) + len(self.wrong_exts) + len(self.bad_exts)
+
+    def category(self, ext: int) -> str | None:
+        """Returns `"GOOD_EXTS"`, `"WRONG_EXTS"` or `"BAD_EXTS"` for a probed `ext`, or `None`."""
+        if ext in self.ext_to_card:
+            return "GOOD_EXTS"
+        if ext in self.wrong_exts:
+            return "WRONG_EXTS"
+        if ext in self.bad_exts:
+            return "BAD_EXTS"
+        return None
+
+    def card_for_ext(self, ext: int) -> str | None:
+        """Returns the card ID whose page is `ext`, or `None`."""
+        return self.ext_to_card.get(ext)
+
+    def ext_for_card(self, card_id: str) -> int | None:
+        """Returns the URL extension of the page of `card_id`, or `None`."""
+        return self.good_exts.get(card_id)
+
+    def add_good(self, card_id: str, ext: int):
+        """Stores `ext` as the page of `card_id`, replacing any previous page of that card."""
+        self._apply("GOOD_EXTS", ext, card_id)
+        if self.journal is not None:
+            self.journal.append("GOOD_EXTS", ext, card_id)
+
+    def add_wrong(self, ext: int, title: str):
+        """Stores `ext` as a page that is not a card page."""
+        self._apply("WRONG_EXTS", ext, title)
+        if self.journal is not None:
+            self.journal.append("WRONG_EXTS", ext, title)
+
+    def add_bad(self, ext: int):
+        """Stores `ext` as an extension whose page caused an error."""
+        self._apply("BAD_EXTS", ext)
+        if self.journal is not None:
+            self.journal.append("BAD_EXTS", ext)
+
+    def _apply(self, category: str, ext: int, value: str | None = None):
+        """Stores a single probe result without journaling it."""
+        ext = int(ext)
+        if category == "GOOD_EXTS":
+            self._set_good(value, ext)
+        elif category == "WRONG_EXTS":
+            self.wrong_exts[ext] = value
+        elif category == "BAD_EXTS":
+            self.bad_exts.add(ext)
+        else:
+            raise ValueError(f"Unknown page mapping category <{category}>")
+
+    def _set_good(self, card_id: str, ext: int):
+        previous_ext = self.good_exts.get(card_id)
+        if previous_ext is not None:
+            self.ext_to_card.pop(previous_ext, None)
+        self.good_exts[card_id] = ext
+        self.ext_to_card[ext] = card_id
+
+
+class ProbeJournal:
+    """
+    Append-only JSON Lines journal of probe results.
+
+    Each probe result is written as one line, e.g.
+    `{"category": "GOOD_EXTS", "ext": 476002, "value": "A1 001"}`, and flushed to the
+    operating system immediately, so it survives the process crashing. The file is
+    `fsync`-ed every `sync_every` entries (and on `sync`/`close`) to also survive
+    the machine going down, while keeping the cost of each probe constant.
+
+    Parameters
+    ----------
+    journal_path : str
+        The path of the journal file. It is created if needed and appended to.
+    sync_every : int
+        The number of entries between two `fsync` calls.
+    """
+
+    def __init__(self, journal_path: str, sync_every: int = 100):
+        self.journal_path = journal_path
+        self.sync_every = sync_every
+        self._drop_partial_line()
+        self._file = open(journal_path, "a", encoding="utf-8")
+        self._unsynced = 0
+
+    def _drop_partial_line(self):
+        """Cuts a line left unfinished by a crash so new entries start on a fresh line."""
+        try:
+            with open(self.journal_path, "rb+") as f:
+                content = f.read()
+                if content and not content.endswith(b"\n"):
+                    f.truncate(content.rfind(b"\n") + 1)
+        except FileNotFoundError:
+            pass
+
+    def append(self, category: str, ext: int, value: str | None = None):
+        """Writes one probe result to the journal."""
+        entry = {"category": category, "ext": int(ext)}
+        if value is not None:
+            entry["value"] = value
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Forces every written entry to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def truncate(self):
+        """Removes every entry (once they were folded into the JSON by `PageMappings.compact`)."""
+        self._file.seek(0)
+        self._file.truncate()
+        self.sync()
+
+    def close(self):
+        """Syncs and closes the journal."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
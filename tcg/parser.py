@@ -2,14 +2,22 @@ import bs4
 from bs4 import BeautifulSoup
 import re
 import requests
+from collections.abc import Iterable, Iterator
+from tcg import metrics, web
+from tcg.card import Card
+from tcg.overrides import get_overrides
+from tcg.parser_scan import scan_card_details
 from tcg.utils import (
     clean_str,
-    parse_energy_cost,
+    parse_energy_costs,
     parse_retreat_cost,
     trim_after_second_parens,
     DEFAULT_EMPTY,
 )
 
+# Card types that are trainer cards (no stage, moves or weakness)
+TRAINER_TYPES = ["Item", "Supporter", "Pokemon Tool"]
+
 
 def extract_move_info(
     div: bs4.element.Tag, next_div: bs4.element.Tag | None
@@ -32,7 +40,7 @@ def extract_move_info(
     tuple[str, str, str, str]
         A 4-tuple:
         - `name` (`str`): The attack's name.
-        - `cost_symbols` (`str`): Symbols (e.g. `"⚫⚫"`) from `parse_energy_cost`.
+        - `cost_symbols` (`str`): Symbols (e.g. `"⚫⚫"`) from `parse_energy_costs`.
         - `damage` (`str`): Numeric damage.
         - `effect` (`str`): The textual effect
     """
@@ -42,7 +50,7 @@ def extract_move_info(
     name = name_tag.text.strip() if name_tag else DEFAULT_EMPTY
 
     cost_alts = [img["alt"] for img in div.find_all("img", alt=True)]
-    cost = "".join(parse_energy_cost(alt) for alt in cost_alts) or DEFAULT_EMPTY
+    cost = parse_energy_costs(cost_alts) or DEFAULT_EMPTY
 
     # Gather all text siblings up to next_div
     texts: list[str] = []
@@ -55,9 +63,28 @@ def extract_move_info(
         if t:
             texts.append(t)
 
-    # Decide damage/effect
+    damage, effect = split_damage_effect(texts)
+
+    return name, cost, damage, effect
+
+
+def split_damage_effect(texts: list[str]) -> tuple[str, str]:
+    """
+    Decide which of the texts following an attack are its damage and effect.
+
+    Parameters
+    ----------
+    texts : list[str]
+        The non-empty, stripped texts between an attack's `<div class="align">`
+        and the next one.
+
+    Returns
+    -------
+    tuple[str, str]
+        The `damage` and `effect` of the attack (`DEFAULT_EMPTY` when missing).
+    """
     # Only allow digits, "x", and "+" to account for "50x" or "30+"
-    is_pokemon_numeric = bool(re.fullmatch(r"[0-9x+]+", texts[0]))
+    is_pokemon_numeric = bool(texts) and bool(re.fullmatch(r"[0-9x+]+", texts[0]))
     if texts and is_pokemon_numeric:
         damage = texts[0]
         effect = texts[1] if len(texts) > 1 else DEFAULT_EMPTY
@@ -68,7 +95,7 @@ def extract_move_info(
         damage = DEFAULT_EMPTY
         effect = DEFAULT_EMPTY
 
-    return name, cost, damage, effect
+    return damage, effect
 
 
 def extract_cell9(cell9: bs4.element.Tag, is_trainer: bool) -> dict[str, str | None]:
@@ -179,10 +206,17 @@ def extract_cell9(cell9: bs4.element.Tag, is_trainer: bool) -> dict[str, str | N
     return cell9_data
 
 
-def extract_extra_card_details(card_full_url: str, is_trainer: bool) -> dict[str, str | None]:
+@metrics.timed("extract_extra_card_details")
+def extract_extra_card_details(
+    card_full_url: str, is_trainer: bool, full_parse: bool = False
+) -> dict[str, str | None]:
     """
     Parse additional details from the cards full page.
 
+    Only the details table of the page is scanned (see `parser_scan.scan_card_details`).
+    The whole page is parsed with BeautifulSoup (`parse_card_details`) when the scan
+    can't read the table, or with `full_parse`.
+
     Parameters
     ----------
     card_full_url : str
@@ -190,6 +224,8 @@ def extract_extra_card_details(card_full_url: str, is_trainer: bool) -> dict[str
     is_trainer : bool
         If `True`, this is a Trainer/Item/Tool card (no Stage/moves) so
         its full description goes into `ability_effect`.
+    full_parse : bool
+        If `True`, always parse the whole page (e.g. to check the scan).
 
     Returns
     -------
@@ -199,12 +235,29 @@ def extract_extra_card_details(card_full_url: str, is_trainer: bool) -> dict[str
             - `illustrator`
             - `weakness`
     """
-    # Download page
-    response = requests.get(card_full_url)
-    response.raise_for_status()
+    # Download page (or reuse the cached copy)
+    page_html = web.fetch_text(card_full_url)
+
+    with metrics.METRICS.time("parse_details"):
+        card_extra_details = None if full_parse else scan_card_details(page_html, is_trainer)
+        if card_extra_details is None:
+            metrics.METRICS.count("parse_details", full_parses=1)
+            card_extra_details = parse_card_details(page_html, is_trainer)
+
+    return card_extra_details
+
 
+def parse_card_details(page_html: str, is_trainer: bool) -> dict[str, str | None]:
+    """
+    Reads the fields of `extract_extra_card_details` from the BeautifulSoup tree of the whole page.
+
+    Raises
+    ------
+    AttributeError
+        If the page has no details table.
+    """
     # Parse total HTML with BeautifulSoup
-    soup = BeautifulSoup(response.text, "lxml")
+    soup = BeautifulSoup(page_html, "lxml")
     table = soup.select_one("table.a-table.table--fixed.a-table")
     rows = table.find_all("tr")
 
@@ -232,11 +285,12 @@ def extract_extra_card_details(card_full_url: str, is_trainer: bool) -> dict[str
     return card_extra_details
 
 
+@metrics.timed("fix_edge_cases")
 def fix_edge_cases(card: dict[str, str | None]):
     """
     Applies manual overrides to correct known card-specific data issues.
 
-    This function mutates the `card` dictionary in-place to fix edge cases
+    This function mutates the `card` in-place to fix edge cases
     where data is missing or incorrect on the original source page. These include:
     - Missing move costs
     - Incorrect damage values
@@ -244,129 +298,41 @@ def fix_edge_cases(card: dict[str, str | None]):
 
     Parameters
     ----------
-    card : dict[str, str | None]
-        A single card dictionary as returned by `extract_card()`
+    card : Card | dict[str, str | None]
+        A single card as returned by `extract_card()`, `direct.refresh_card()` or read
+        back from the CSV of a previous run.
 
     Notes
     -----
-    - Fixes are hardcoded using pattern matching on `card["number"]`.
-    - Uses lookup dictionaries for illustrator, generation, and weakness patches.
+    - The fixes are the "web" rows of `data/overrides.csv`, loaded once and indexed by
+      card number (see `overrides.Overrides`).
+    - `extract_card` returns the cards as found on Game8. `driver.main` fixes every
+      card it writes in one stage (`fix_cards`), so cards copied from a previous run
+      get new fixes too.
     - This function modifies `card` in-place and does not return anything.
     """
-    FIXED_ILLUSTRATORS = {
-        "P-A 053": "Shin Nagasawa",  # Floatzel
-        "P-A 056": "Krgc",  # Ekans
-        # "A2b 002": "",  # Kakuna
-        # "A2b 005": "",  # Sprigatito
-        # "A2b 006": "",  # Floragato
-        # "A2b 007": "",  # Meowscarada
-        # "A2b 008": "",  # Charmander
-        # "A2b 014": "",  # Tentacool
-        # "A2b 018": "",  # Wiglett
-        # "A2b 020": "",  # Dondozo
-        # "A2b 021": "",  # Tatsugiri
-        # "A2b 023": "",  # Voltorb
-        # "A2b 025": "",  # Pachirisu
-        # "A2b 040": "",  # Hitmonlee
-        # "A2b 041": "",  # Hitmonchan
-        # "A2b 047": "",  # Paldean Wooper
-        # "A2b 049": "",  # Spiritomb
-        # "A2b 068": "",  # Cyclizar
-        # "A2b 070": "",  # Pokemon Center Lady
-        # "A2b 071": "",  # Red
-        # "A2b 073": "",  # Meowscarada
-        # "A2b 074": "",  # Buizel
-        # "A2b 075": "",  # Tatsugiri
-        # "A2b 076": "",  # Grafaiai
-        # "A2b 089": "",  # Pokemon Center Lady
-        # "A2b 090": "",  # Red
-        # "A2b 095": "",  # Bibarel ex
-        # "A2b 096": "",  # Giratina ex
-        # "A2b 103": "",  # Pachirisu
-        # "A3 009": "",  # Rowlet
-        # "A3 045": "",  # Popplio
-        # "A3 073": "",  # Lunatone
-        # "A3 079": "",  # Ribombee
-        # "A3 093": "",  # Drilbur
-        # "A3 103": "",  # Mudsdale
-        # "A3 130": "",  # Delcatty
-        # "A3 135": "",  # Toucannon
-        # "A3 148": "",  # Acerola
-        # "A3 155": "",  # Lillie
-        # "A3 157": "",  # Morelull
-        # "A3 158": "",  # Tsareena
-        # "A3 162": "",  # Alolan Vulpix
-        # "A3 165": "",  # Oricorio
-        # "A3 167": "",  # Cutiefly
-        # "A3 168": "",  # Comfey
-        # "A3 171": "",  # Cosmog
-        # "A3 172": "",  # Rockruff
-        # "A3 174": "",  # Minior
-        # "A3 178": "",  # Bewear
-        # "A3 179": "",  # Komala
-        # "A3 190": "",  # Acerola
-        # "A3 197": "",  # Lillie
-        # "A3 203": "",  # Alolan Raichu ex
-        # "A3 228": "",  # Jigglypuff
-        # "A3 229": "",  # Wigglytuff
-        # "P-A 046": "",  # Gible
-        # "P-A 047": "",  # Staraptor
-        # "P-A 049": "",  # Snorlax
-        # "P-A 052": "",  # Sprigatito
-        # "P-A 060": "",  # Exeggcute
-        # "P-A 070": "",  # Alolan Ninetales
-    }
+    get_overrides("web").apply(card)
 
-    FIXED_GENERATIONS = {
-        "A1a 065": "9",  # Mythical Slab
-        "A1a 066": "9",  # Budding Expeditioner
-        "A1a 080": "9",  # Budding Expeditioner
-        "P-A 053": "4",  # Floatzel
-        "P-A 056": "1",  # Ekans
-    }
 
-    # M = Missing Page, I = Incorrect
-    FIXED_WEAKNESSES = {
-        "A1 169": "Fighting",  # Nidoran M (I)
-        "A1 170": "Fighting",  # Nidorino (I)
-        "A1 171": "Fighting",  # Nidoking (I)
-        "A1 241": "Fighting",  # Nidoking (I)
-        "A1a 048": "Grass",  # Stonjourner (I)
-        "P-A 028": "Water",  # Volcarona (I)
-        "P-A 037": "Darkness",  # Cresselia ex (I)
-        "P-A 038": "Darkness",  # Misdreavus (I)
-        "P-A 053": "Lightning",  # Floatzel (M)
-        "P-A 056": "Fighting",  # Ekans (M)
-    }
+def fix_cards(cards: Iterable[Card]) -> Iterator[Card]:
+    """
+    Applies the manual overrides of `fix_edge_cases` to a stream of cards, as one patch stage.
+
+    Parameters
+    ----------
+    cards : Iterable[Card]
+        Cards as returned by `extract_card()`, `direct.refresh_card()` or read back
+        from the CSV of a previous run.
 
-    # Specific fixes for fields in main table
-    match card["number"]:
-        case "A1 183":  # Dratini
-            # Dratini's Ram should do 40 dmg not 70
-            card["move1_damage"] = "40"
-
-        case "A1a 057":  # Pidgey
-            # Missing energy cost for Flap
-            card["move1_cost"] = "*️⃣"
-            
-        case "A2 047":  # Wash Rotom
-            # Wash Rotom's Wave Splash should do 30 dmg not 39
-            card["move1_damage"] = "30"
-
-    # General lookups for missing values on extra details page
-    for field, lookup in [
-        ("illustrator", FIXED_ILLUSTRATORS),
-        ("generation", FIXED_GENERATIONS),
-        ("weakness", FIXED_WEAKNESSES),
-    ]:
-        val = lookup.get(card["number"])
-        if val:
-            card[field] = val
-
-    # Mutates card in-place, so no need to return
-
-
-def extract_card(card_html: bs4.element.Tag) -> dict[str, str]:
+    Returns
+    -------
+    Iterator[Card]
+        The same cards, fixed in-place as they are consumed (see `overrides.Overrides.patch`).
+    """
+    return get_overrides("web").patch(cards)
+
+
+def extract_card(card_html: bs4.element.Tag) -> Card:
     """
     Convert a `<tr>` row into a full card-info dict.
 
@@ -388,7 +354,7 @@ def extract_card(card_html: bs4.element.Tag) -> dict[str, str]:
 
     Returns
     -------
-    dict[str, str]
+    Card
         Merges:
         - Basic columns: `number`, `name`, `image`, `rarity`,
           `pack_name`, `type`, `HP`, `stage`, `pack_points`, `url`
@@ -400,8 +366,10 @@ def extract_card(card_html: bs4.element.Tag) -> dict[str, str]:
 
     Notes
     -----
-    - Determines `is_trainer` by `type` in `{"Item", "Supporter", "Pokemon Tool"}`.
+    - Determines `is_trainer` by `type` in `TRAINER_TYPES`.
     - Cleans whitespace via `clean_str()` at the end.
+    - The card is returned as found on Game8: the manual fixes of `data/overrides.csv`
+      are not applied, pass it through `fix_edge_cases` (or `fix_cards`) for them.
     """
     cells = card_html.find_all("td")
     # cell_0 is checkmark (ignored)
@@ -420,26 +388,11 @@ def extract_card(card_html: bs4.element.Tag) -> dict[str, str]:
     )
 
     # Flag to determine if card is trainer card or not
-    is_trainer = clean_str(type) in ["Item", "Supporter", "Pokemon Tool"]
+    is_trainer = clean_str(type) in TRAINER_TYPES
 
     # Cell 9 contains retreat cost, effect, and moves data
     cell9 = extract_cell9(cells[9], is_trainer=is_trainer)
 
-    # Extract more information from the individual card pages
-    card_full_url = cells[2].find("a").get("href")
-    card_extra_details = {
-        "generation": DEFAULT_EMPTY,
-        "illustrator": DEFAULT_EMPTY,
-        "weakness": DEFAULT_EMPTY,
-    }
-    try:
-        card_extra_details = extract_extra_card_details(card_full_url, is_trainer=is_trainer)
-    except requests.exceptions.HTTPError:
-        print(f"Page {card_full_url} caused an error.")
-    except AttributeError:
-        # Page probably doesn't contain table
-        pass
-
     # Create dictionary with raw data
     card = {
         "number": number,
@@ -451,17 +404,49 @@ def extract_card(card_html: bs4.element.Tag) -> dict[str, str]:
         "HP": HP,
         "stage": stage,
         "pack_points": pack_points,
-        "url": card_full_url,
+        "url": cells[2].find("a").get("href"),
     }
 
-    # Merge data from cell 9 and full page
-    card = card | cell9
-    card = card | card_extra_details
+    return complete_card(card, cell9, is_trainer=is_trainer)
 
-    # Normalize spacing in all fields and replace empty string with empty
-    card = {k: clean_str(v) for k, v in card.items()}
 
-    # Fix final misc things that are card specific
-    fix_edge_cases(card)
+def complete_card(
+    card: dict[str, str | None], cell9: dict[str, str | None], is_trainer: bool
+) -> Card:
+    """
+    Finish a card read from a pack table row with the details from its own page.
+
+    Shared by every row parser so that they all clean cards the same way.
+
+    Parameters
+    ----------
+    card : dict[str, str | None]
+        The raw basic columns of the row, including the detail page `url`.
+    cell9 : dict[str, str | None]
+        The fields of the details cell, as returned by `extract_cell9`.
+    is_trainer : bool
+        If `True`, the card has no weakness to read from its page.
+
+    Returns
+    -------
+    Card
+        The merged and cleaned card, without the manual fixes (see `fix_edge_cases`).
+    """
+    # Extract more information from the individual card pages
+    card_full_url = card["url"]
+    card_extra_details = {
+        "generation": DEFAULT_EMPTY,
+        "illustrator": DEFAULT_EMPTY,
+        "weakness": DEFAULT_EMPTY,
+    }
+    try:
+        card_extra_details = extract_extra_card_details(card_full_url, is_trainer=is_trainer)
+    except requests.exceptions.HTTPError:
+        print(f"Page {card_full_url} caused an error.")
+    except AttributeError:
+        # Page probably doesn't contain table
+        pass
 
-    return card
+    # Merge data from cell 9 and full page into a single record, normalizing
+    # spacing in all fields and replacing empty string with empty
+    return Card.from_dict({**card, **cell9, **card_extra_details}, clean=True)
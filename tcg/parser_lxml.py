@@ -0,0 +1,246 @@
+import lxml.html
+from lxml import etree
+from tcg.card import Card
+from tcg.parser import TRAINER_TYPES, complete_card, split_damage_effect
+from tcg.utils import (
+    clean_str,
+    parse_energy_costs,
+    parse_retreat_cost,
+    trim_after_second_parens,
+    DEFAULT_EMPTY,
+)
+
+# Alternative to the BeautifulSoup row parser in `tcg.parser`.
+# Every selector is compiled once, and rows are read straight from `lxml.html`
+# elements, so no BeautifulSoup tree is built for the pack page.
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements with `name` as one of their classes."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+# Pack page
+CARD_TABLES = etree.XPath(
+    f"//table[{_has_class('a-table')} or {_has_class('table--fixed')} or {_has_class('flexible-cell')}]"
+)
+HEADER_CELL = etree.XPath("(((.//thead)[1]//tr)[1]//*[self::th or self::td])[1]")
+BODY_ROWS = etree.XPath("(.//tbody)[1]//tr")
+TEXT_NODES = etree.XPath(".//text()")
+
+# Pack table row
+CELLS = etree.XPath(".//td")
+FIRST_LINK = etree.XPath("(.//a)[1]")
+FIRST_IMG = etree.XPath("(.//img)[1]")
+FIRST_BOLD = etree.XPath("(.//b)[1]")
+
+# Details cell
+STAGE_LABEL = etree.XPath('(.//b[count(node()) = 1 and string() = "Stage"])[1]')
+RETREAT_LABEL = etree.XPath('(.//b[count(node()) = 1 and string() = "Retreat Cost"])[1]')
+ABILITY_LABEL = etree.XPath('(.//span[count(node()) = 1 and string() = "[Ability]"])[1]')
+ENCLOSING_DIV = etree.XPath("ancestor::div[1]")
+ALIGN_DIVS = etree.XPath(f".//div[{_has_class('align')}]")
+COST_IMGS = etree.XPath(".//img[@alt]")
+
+
+def find_card_rows(page_html: str) -> list[lxml.html.HtmlElement]:
+    """
+    Finds the `<tr>` of every card in the table of a pack page.
+
+    Selects the same table as `fetch_html_table` with `page_type="pack"`: the first
+    card table whose header starts with a "✔" cell.
+
+    Parameters
+    ----------
+    page_html : str
+        The raw HTML of the pack page.
+
+    Returns
+    -------
+    card_tr_elements : list[lxml.html.HtmlElement]
+        The `<tr>` elements of the table's `<tbody>` (empty if no table was found).
+    """
+    root = lxml.html.document_fromstring(page_html)
+    for table in CARD_TABLES(root):
+        first_cell = HEADER_CELL(table)
+        if first_cell and "".join(t.strip() for t in TEXT_NODES(first_cell[0])) == "✔":
+            return BODY_ROWS(table)
+    return []
+
+
+def _strings_after(el: lxml.html.HtmlElement, stop: lxml.html.HtmlElement | None = None):
+    """
+    Yields the strings following `el` among its siblings, until the element `stop`.
+
+    Gives the same strings as the non-tag `next_siblings` of a BeautifulSoup tag:
+    the tails of `el` and its siblings, plus the text of sibling comments.
+    """
+    if el.tail is not None:
+        yield el.tail
+    for sib in el.itersiblings():
+        if sib is stop:
+            return
+        if isinstance(sib, etree._Comment) and sib.text is not None:
+            yield sib.text
+        if sib.tail is not None:
+            yield sib.tail
+
+
+def extract_move_info(
+    div: lxml.html.HtmlElement, next_div: lxml.html.HtmlElement | None
+) -> tuple[str, str, str, str]:
+    """
+    Extract a single attack's name, cost, damage and effect.
+
+    Same as `tcg.parser.extract_move_info`, for `lxml.html` elements.
+    """
+    name_tag = FIRST_BOLD(div)
+    name = name_tag[0].text_content().strip() if name_tag else DEFAULT_EMPTY
+
+    cost_alts = [img.get("alt") for img in COST_IMGS(div)]
+    cost = parse_energy_costs(cost_alts) or DEFAULT_EMPTY
+
+    # Gather all text siblings up to next_div
+    texts = [t.strip() for t in _strings_after(div, stop=next_div) if t.strip()]
+    damage, effect = split_damage_effect(texts)
+
+    return name, cost, damage, effect
+
+
+def extract_cell9(cell9: lxml.html.HtmlElement, is_trainer: bool) -> dict[str, str | None]:
+    """
+    Parse the details cell (`<td class="left">`) into flat fields.
+
+    Same as `tcg.parser.extract_cell9`, for `lxml.html` elements.
+    """
+    cell9_data = {
+        "stage": DEFAULT_EMPTY,
+        "retreat_cost": DEFAULT_EMPTY,
+        "ultra_beast": "No",
+        "ability_name": DEFAULT_EMPTY,
+        "ability_effect": DEFAULT_EMPTY,
+        "move1_name": DEFAULT_EMPTY,
+        "move1_cost": DEFAULT_EMPTY,
+        "move1_damage": DEFAULT_EMPTY,
+        "move1_effect": DEFAULT_EMPTY,
+        "move2_name": DEFAULT_EMPTY,
+        "move2_cost": DEFAULT_EMPTY,
+        "move2_damage": DEFAULT_EMPTY,
+        "move2_effect": DEFAULT_EMPTY,
+    }
+
+    # Trainer cards only have 1 description, put in ability_effect
+    if is_trainer:
+        cell_text = clean_str(cell9.text_content())
+        trainer_desc = cell_text if cell_text[0] != "-" else cell_text[6:]
+        cell9_data["ability_effect"] = trainer_desc
+        return cell9_data
+
+    # --- Stage ---
+    stage_tag = STAGE_LABEL(cell9)
+    if stage_tag and stage_tag[0].tail:
+        cell9_data["stage"] = clean_str(stage_tag[0].tail.strip(":"))
+
+    # --- Retreat Cost ---
+    retreat_tag = RETREAT_LABEL(cell9)
+    if retreat_tag:
+        # its parent <div> holds the <img> icons
+        retreat_div = ENCLOSING_DIV(retreat_tag[0])[0]
+        retreat_img = FIRST_IMG(retreat_div)[0].get("data-src")
+        cell9_data["retreat_cost"] = str(parse_retreat_cost(retreat_img))
+
+    # --- Ability (optional for the card) ---
+    ability_span = ABILITY_LABEL(cell9)
+    if ability_span:
+        texts = [t.strip() for t in _strings_after(ability_span[0]) if t.strip()]
+        cell9_data["ability_name"] = texts[0] if texts else "N/A"
+        cell9_data["ability_effect"] = texts[1] if len(texts) > 1 else "N/A"
+
+    # --- Moves (up to 2) ---
+    move_divs = ALIGN_DIVS(cell9)[1:]  # skip first (retreat)
+    move_start_index = 2 if ability_span else 1  # shift moves if ability is present
+
+    for i, div in enumerate(move_divs):
+        # Immediately check for Ultra beats to stop future div out of range
+        if clean_str(div.text_content()) == "Ultra Beast":
+            cell9_data["ultra_beast"] = "Yes"
+            continue
+
+        j = move_start_index + i  # will be 1 or 2 depending on ability
+        next_div = move_divs[i + 1] if i + 1 < len(move_divs) else None
+        name, cost, dmg, effect = extract_move_info(div, next_div)
+
+        cell9_data[f"move{j}_name"] = name
+        cell9_data[f"move{j}_cost"] = cost
+        cell9_data[f"move{j}_damage"] = dmg
+        cell9_data[f"move{j}_effect"] = effect
+
+    return cell9_data
+
+
+def extract_card(card_html: lxml.html.HtmlElement) -> Card:
+    """
+    Convert a `<tr>` row into a full card-info dict.
+
+    Returns the same card as `tcg.parser.extract_card` does for the same row.
+
+    Parameters
+    ----------
+    card_html : lxml.html.HtmlElement
+        A `<tr>` from `find_card_rows`.
+
+    Returns
+    -------
+    Card
+        The card, see `tcg.parser.extract_card`.
+    """
+    cells = CELLS(card_html)
+    # cell_0 is checkmark (ignored)
+
+    link = FIRST_LINK(cells[2])[0]
+    number = cells[1].text_content()
+    name = link.text_content()
+    image = FIRST_IMG(cells[2])[0].get("data-src")
+    rarity = cells[3].text_content()
+    pack = trim_after_second_parens(cells[4].text_content())
+    type = FIRST_IMG(cells[5])[0].attrib["alt"].split("-")[-1]  # last word is the type
+    HP = cells[6].text_content()
+    stage = cells[7].text_content()
+    pack_points = (
+        cells[8].text_content().replace(",", "").replace("Pts", "")
+        if rarity != "Promo"
+        else DEFAULT_EMPTY
+    )
+
+    is_trainer = clean_str(type) in TRAINER_TYPES
+    cell9 = extract_cell9(cells[9], is_trainer=is_trainer)
+
+    card = {
+        "number": number,
+        "name": name,
+        "image": image,
+        "rarity": rarity,
+        "pack_name": pack,
+        "type": type,
+        "HP": HP,
+        "stage": stage,
+        "pack_points": pack_points,
+        "url": link.get("href"),
+    }
+
+    return complete_card(card, cell9, is_trainer=is_trainer)
+
+
+def row_number(card_html: lxml.html.HtmlElement) -> str | None:
+    """Returns the card number (e.g. `"A1 001"`) of a pack table row."""
+    return clean_str(CELLS(card_html)[1].text_content())
+
+
+def row_url(card_html: lxml.html.HtmlElement) -> str | None:
+    """Returns the URL of the detail page linked from a pack table row."""
+    return FIRST_LINK(CELLS(card_html)[2])[0].get("href")
+
+
+def row_html(card_html: lxml.html.HtmlElement) -> str:
+    """Returns the HTML of a pack table row."""
+    return lxml.html.tostring(card_html, encoding="unicode", with_tail=False)
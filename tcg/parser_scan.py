@@ -0,0 +1,164 @@
+import re
+from html.parser import HTMLParser
+from tcg.utils import DEFAULT_EMPTY, clean_str
+
+# Opening tag of every `<table>`, with its attributes
+TABLE_TAG = re.compile(r"<table\b[^>]*>", re.IGNORECASE)
+
+# `class` attribute inside an opening tag
+CLASS_ATTR = re.compile(r"""\sclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+
+# Classes of the details table on a card page (the `table.a-table.table--fixed` of `extract_extra_card_details`)
+DETAILS_TABLE_CLASSES = frozenset({"a-table", "table--fixed"})
+
+# Rows of the details table read for each field (same numbering as `table.find_all("tr")`)
+GENERATION_ROW = 5
+ILLUSTRATOR_ROW = 7
+WEAKNESS_ROW = 9
+
+
+class _StopScan(Exception):
+    """Raised by `_DetailsScanner` once it has read every row it needs."""
+
+
+class _DetailsScanner(HTMLParser):
+    """
+    Reads the cells of some rows of the table starting the fed HTML, without building a tree.
+
+    Rows are numbered like `table.find_all("tr")` (every `<tr>` inside the table,
+    nested ones included), and each wanted row keeps its `<td>` cells in document
+    order, like `row.find_all("td")`. For each cell, its text and the first `<img>`
+    inside its first `<a>` are kept. End tags left out by the page are implied the
+    way HTML does: a new row closes the open row, and a new cell closes the open cell.
+
+    Parameters
+    ----------
+    rows : set[int]
+        The numbers of the rows to read. Scanning stops once the last one is closed.
+    """
+
+    def __init__(self, rows: set[int]):
+        super().__init__(convert_charrefs=True)
+        self.wanted = rows
+        self.last_row = max(rows)
+        self.cells: dict[int, list[dict]] = {row: [] for row in rows}
+        self.num_rows = 0
+        # Open `table`, `tr` and `td`/`th` elements as `[tag, row number or cell]`
+        self._open = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._open.append(["table", None])
+        elif tag == "tr":
+            self._close_until({"tr"}, stop_at="table")
+            self._open.append(["tr", self.num_rows])
+            self.num_rows += 1
+        elif tag in ("td", "th"):
+            self._close_until({"td", "th"}, stop_at="tr")
+            cell = {"text": [], "a": None, "img": None} if tag == "td" else None
+            for element, row in self._open:
+                if cell is not None and element == "tr" and row in self.wanted:
+                    self.cells[row].append(cell)
+            self._open.append([tag, cell])
+        elif tag == "a":
+            for cell in self._open_cells():
+                if cell["a"] is None:
+                    cell["a"] = "open"
+        elif tag == "img":
+            for cell in self._open_cells():
+                if cell["a"] == "open":
+                    cell["img"] = dict(attrs)
+                    cell["a"] = "read"
+
+    def handle_startendtag(self, tag, attrs):
+        # Like browsers (and lxml), `<td/>` opens a cell
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            for cell in self._open_cells():
+                if cell["a"] == "open":
+                    cell["a"] = "closed"
+        elif tag in ("table", "tr", "td", "th"):
+            self._close_until({tag}, stop_at="table" if tag != "table" else None)
+
+    def handle_data(self, data):
+        for cell in self._open_cells():
+            cell["text"].append(data)
+
+    def _open_cells(self):
+        return [cell for element, cell in self._open if element == "td"]
+
+    def _close_until(self, tags: set[str], stop_at: str | None):
+        """Closes the innermost open element in `tags` and those inside it, without going past `stop_at`."""
+        for i in range(len(self._open) - 1, -1, -1):
+            element = self._open[i][0]
+            if element in tags:
+                self._close(i)
+                return
+            if element == stop_at:
+                return
+
+    def _close(self, index: int):
+        closed, self._open = self._open[index:], self._open[:index]
+        for element, row in closed:
+            if element == "tr" and row == self.last_row or element == "table" and not self._open:
+                raise _StopScan
+
+
+def find_details_table(page_html: str) -> int | None:
+    """Returns the offset of the first `<table>` with the classes of the details table, or `None`."""
+    for match in TABLE_TAG.finditer(page_html):
+        # Skip tables commented out
+        if page_html.rfind("<!--", 0, match.start()) > page_html.rfind("-->", 0, match.start()):
+            continue
+        class_attr = CLASS_ATTR.search(match.group(0))
+        if class_attr and DETAILS_TABLE_CLASSES <= set(next(filter(None, class_attr.groups()), "").split()):
+            return match.start()
+    return None
+
+
+def scan_card_details(page_html: str, is_trainer: bool) -> dict[str, str | None] | None:
+    """
+    Reads `generation`, `illustrator` and `weakness` from a card page without parsing all of it.
+
+    The raw HTML is searched for the details table, and only the table is scanned,
+    up to the end of the last row needed (row 9 for the weakness, row 7 for
+    trainers). Nothing else of the page is parsed and no tree is built.
+
+    Parameters
+    ----------
+    page_html : str
+        The raw HTML of the card page.
+    is_trainer : bool
+        If `True`, the weakness is not read.
+
+    Returns
+    -------
+    card_extra_details : dict[str, str | None] | None
+        The same fields as `parser.extract_extra_card_details`, or `None` if the page
+        does not have the expected layout (the caller then parses the whole page).
+    """
+    start = find_details_table(page_html)
+    if start is None:
+        return None
+
+    rows = {GENERATION_ROW, ILLUSTRATOR_ROW} | (set() if is_trainer else {WEAKNESS_ROW})
+    scanner = _DetailsScanner(rows)
+    try:
+        scanner.feed(page_html[start:])
+    except _StopScan:
+        pass
+
+    if scanner.num_rows <= max(rows) or not scanner.cells[GENERATION_ROW] or not scanner.cells[ILLUSTRATOR_ROW]:
+        return None
+    if not is_trainer and len(scanner.cells[WEAKNESS_ROW]) < 3:
+        return None
+
+    gen_text = clean_str("".join(scanner.cells[GENERATION_ROW][0]["text"]), empty_val=DEFAULT_EMPTY)
+    weakness_img = None if is_trainer else scanner.cells[WEAKNESS_ROW][2]["img"]
+    return {
+        "generation": gen_text[-1] if gen_text is not DEFAULT_EMPTY else DEFAULT_EMPTY,
+        "illustrator": "".join(scanner.cells[ILLUSTRATOR_ROW][0]["text"]),
+        "weakness": DEFAULT_EMPTY if weakness_img is None else weakness_img.get("alt"),
+    }
@@ -0,0 +1,251 @@
+import argparse
+import cProfile
+import importlib.util
+import linecache
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+# Modules summarized by the allocation profile
+PROFILED_MODULES = ("tcg.parser", "tcg.parser_lxml", "tcg.io", "tcg.utils")
+
+# Seconds between two samples of the call stacks
+SAMPLE_INTERVAL = 0.005
+
+# Seconds between two checks of the traced memory, to snapshot it near its peak
+MEMORY_POLL_INTERVAL = 0.1
+
+# Number of frames kept for each allocation, enough to find the profiled module calling a library
+MEMORY_FRAMES = 32
+
+
+@contextmanager
+def cpu_profile(output_file: str | Path):
+    """
+    Profiles the block with cProfile and saves the stats to `output_file`.
+
+    Threads started inside the block (e.g. the card workers of `io.imap_rows`) are
+    profiled too and merged into the same stats. The file can be read with `pstats`,
+    or turned into a flame graph (e.g. `snakeviz`, `flameprof`).
+    """
+    profiles = [cProfile.Profile()]
+
+    def profile_thread(*args):
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        profiles.append(profile)
+        profile.enable()
+
+    threading.setprofile(profile_thread)
+    profiles[0].enable()
+    try:
+        yield
+    finally:
+        profiles[0].disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            profile.create_stats()
+            if profile.stats:
+                stats.add(profile)
+        stats.dump_stats(output_file)
+        print(f"CPU profile saved to {output_file} (read it with `python -m pstats {output_file}`)")
+
+
+class StackSampler:
+    """
+    Sampling profiler recording the call stack of every thread each `interval` seconds.
+
+    Much cheaper than cProfile for long runs. The stacks are saved in the folded
+    format (`frame;frame;frame count`) read by `flamegraph.pl` and speedscope.
+
+    Parameters
+    ----------
+    interval : float
+        The number of seconds between two samples.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self._thread.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def save(self, output_file: str | Path):
+        """Writes the folded stacks, most sampled first."""
+        with open(output_file, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def sampled_profile(output_file: str | Path, interval: float = SAMPLE_INTERVAL):
+    """Samples the call stacks during the block and saves them to `output_file` (see `StackSampler`)."""
+    sampler = StackSampler(interval)
+    sampler.start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+        sampler.save(output_file)
+        print(f"{sum(sampler.stacks.values())} stack samples saved to {output_file} (folded format)")
+
+
+@contextmanager
+def memory_profile(top: int = 10, modules: tuple[str, ...] = PROFILED_MODULES):
+    """
+    Traces allocations during the block and prints where the memory went at its peak.
+
+    The traced memory is polled while the block runs, and a snapshot is taken each
+    time it grows past the largest seen so far, so the summary shows the allocations
+    alive at the peak rather than what is left at the end. Each allocation is
+    attributed to the innermost line of `modules` that led to it (e.g. the
+    `BeautifulSoup(...)` call in `tcg.parser` for the memory of a parsed page).
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(MEMORY_FRAMES)
+    tracemalloc.reset_peak()
+
+    peak = {"size": 0, "snapshot": None}
+    stop = threading.Event()
+
+    def take_snapshot():
+        current, _ = tracemalloc.get_traced_memory()
+        if current > peak["size"]:
+            peak["size"], peak["snapshot"] = current, tracemalloc.take_snapshot()
+
+    def poll():
+        while not stop.wait(MEMORY_POLL_INTERVAL):
+            if tracemalloc.get_traced_memory()[0] > 1.1 * peak["size"]:
+                take_snapshot()
+
+    poller = threading.Thread(target=poll, daemon=True)
+    poller.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        poller.join()
+        take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+        print(f"Peak traced memory: {traced_peak / 1e6:.1f} MB, snapshot at {peak['size'] / 1e6:.1f} MB")
+        print(allocation_summary(peak["snapshot"], top, modules))
+
+
+def allocation_summary(snapshot: tracemalloc.Snapshot, top: int = 10, modules=PROFILED_MODULES) -> str:
+    """
+    Returns the `top` lines of each module holding the most memory in `snapshot`.
+
+    Parameters
+    ----------
+    snapshot : tracemalloc.Snapshot
+        Allocations traced with enough frames to reach the modules.
+    top : int
+        The number of lines listed for each module.
+    modules : tuple[str, ...]
+        The modules to summarize (e.g. `"tcg.parser"`).
+
+    Returns
+    -------
+    summary : str
+        For each module, its total and its `top` lines.
+    """
+    files = {os.path.normcase(importlib.util.find_spec(module).origin): module for module in modules}
+    sizes = defaultdict(Counter)
+    for trace in snapshot.traces:
+        # Frames go from the oldest to the most recent call
+        for frame in reversed(trace.traceback):
+            module = files.get(os.path.normcase(frame.filename))
+            if module is not None:
+                sizes[module][(frame.filename, frame.lineno)] += trace.size
+                break
+
+    lines = []
+    for module in modules:
+        total = sum(sizes[module].values())
+        lines.append(f"{module}: {total / 1e6:.2f} MB")
+        for (filename, lineno), size in sizes[module].most_common(top):
+            source = linecache.getline(filename, lineno).strip()
+            lines.append(f"  {size / 1e6:8.2f} MB  line {lineno:4}: {source}")
+    return "\n".join(lines)
+
+
+def _short_path(filename: str) -> str:
+    """Returns `filename` relative to the directory it was imported from (e.g. `tcg/parser.py`)."""
+    for path in sorted(sys.path, key=len, reverse=True):
+        if path and filename.startswith(path + os.sep):
+            return filename[len(path) + 1 :]
+    return filename
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Adds the profiling options read by `from_args` to a command line parser."""
+    group = parser.add_argument_group("profiling")
+    group.add_argument(
+        "--profile",
+        metavar="FILE",
+        default=None,
+        help="Profile with cProfile and save the stats to FILE (pstats format, e.g. for snakeviz).",
+    )
+    group.add_argument(
+        "--profile-sample",
+        metavar="FILE",
+        default=None,
+        help="Sample the call stacks of every thread and save them to FILE (folded format for flamegraph.pl).",
+    )
+    group.add_argument(
+        "--sample-interval",
+        type=float,
+        default=SAMPLE_INTERVAL * 1000,
+        help=f"Milliseconds between two stack samples (default: {SAMPLE_INTERVAL * 1000:g}).",
+    )
+    group.add_argument(
+        "--profile-memory",
+        metavar="N",
+        type=int,
+        default=None,
+        help=f"Trace allocations and print the top N lines of {', '.join(PROFILED_MODULES)} at the memory peak.",
+    )
+
+
+def from_args(args: argparse.Namespace) -> ExitStack:
+    """
+    Returns a context manager running the profilers asked for on the command line (see `add_arguments`).
+
+    Only the current process is profiled (not the pack processes of `--processes`).
+    """
+    stack = ExitStack()
+    if args.profile_memory is not None:
+        stack.enter_context(memory_profile(args.profile_memory))
+    if args.profile_sample is not None:
+        stack.enter_context(sampled_profile(args.profile_sample, args.sample_interval / 1000))
+    if args.profile is not None:
+        stack.enter_context(cpu_profile(args.profile))
+    return stack
@@ -0,0 +1,286 @@
+import argparse
+import bisect
+import mmap
+import os
+import struct
+from pathlib import Path
+from tcg.direct import card_pack_id
+from tcg.io import read_from_csv
+from tcg.utils import COLUMNS
+
+# File layout (all integers little-endian):
+#   header         MAGIC, VERSION, number of cards, number of interned strings
+#   string table   (num_strings + 1) uint32 offsets into the UTF-8 blob, then the blob
+#   columns        one array of `num_cards` values per column of `STORE_COLUMNS`:
+#                  int32 for `INT_COLUMNS` (`NULL_INT` when empty), uint32 string IDs otherwise
+#   number index   `num_cards` uint32 row numbers, sorted by card number
+# The arrays are read in place with `memoryview.cast`, which uses the host byte order
+# (little-endian on every supported platform).
+MAGIC = b"TCGSTORE"
+VERSION = 1
+HEADER = struct.Struct("<8sHII")
+
+# Columns stored as fixed-width integers instead of strings
+INT_COLUMNS = frozenset({"HP", "retreat_cost", "pack_points", "generation"})
+
+# Every column of `COLUMNS`, plus the pack ID (e.g. `"A1"`) derived from `number`
+STORE_COLUMNS = COLUMNS + ["pack"]
+
+# Value stored for an empty integer field
+NULL_INT = -(2**31)
+
+# String ID of an empty string field; the interned strings get IDs 1, 2, ... in sorted order
+NULL_ID = 0
+
+
+def _align(offset: int) -> int:
+    """Rounds `offset` up to the next multiple of 4 so the arrays can be cast in place."""
+    return (offset + 3) & ~3
+
+
+def write_store(cards_data: list[dict[str, str | None]], store_file: str | Path):
+    """
+    Writes cards to a columnar store file read by `CardStore`.
+
+    Every distinct string is stored once in a sorted string table, and each string
+    column holds the IDs of its values. Integer columns are stored as int32, so their
+    text must be a plain integer (e.g. `"70"`).
+
+    Parameters
+    ----------
+    cards_data : list[dict[str, str | None]]
+        The cards, e.g. from `read_from_csv`.
+    store_file : str | Path
+        The path of the store (e.g. `data/full.cards`).
+
+    Raises
+    ------
+    ValueError
+        If a value of an integer column would not read back the same.
+    """
+    rows = [{**card, "pack": card_pack_id(card["number"])} for card in cards_data]
+
+    # Intern every string value
+    strings = sorted(
+        {row[c] for row in rows for c in STORE_COLUMNS if c not in INT_COLUMNS} - {None}
+    )
+    string_ids = {string: i + 1 for i, string in enumerate(strings)}
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, len(rows), len(strings)))
+    out += struct.pack(f"<{len(offsets)}I", *offsets)
+    out += b"".join(encoded)
+    out += bytes(_align(len(out)) - len(out))
+
+    for column in STORE_COLUMNS:
+        if column in INT_COLUMNS:
+            values = []
+            for row in rows:
+                value = row[column]
+                if value is not None and not (value.lstrip("-").isdigit() and str(int(value)) == value):
+                    raise ValueError(f"{column} <{value}> of card <{row['number']}> is not an integer")
+                values.append(NULL_INT if value is None else int(value))
+            out += struct.pack(f"<{len(values)}i", *values)
+        else:
+            out += struct.pack(f"<{len(rows)}I", *(string_ids.get(row[column], NULL_ID) for row in rows))
+
+    by_number = sorted(range(len(rows)), key=lambda i: rows[i]["number"])
+    out += struct.pack(f"<{len(by_number)}I", *by_number)
+
+    # Write to a temporary file first so open stores never see a truncated file
+    tmp_path = f"{store_file}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(out)
+    os.replace(tmp_path, store_file)
+
+
+class _StringTable:
+    """Read-only sequence view of the interned strings, indexed by string ID."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, string_id: int) -> str | None:
+        if string_id == NULL_ID:
+            return None
+        return str(self.blob[self.offsets[string_id - 1] : self.offsets[string_id]], "utf-8")
+
+    def find(self, string: str) -> int | None:
+        """Returns the ID of `string` (binary search on the sorted table), or `None`."""
+        string_id = bisect.bisect_left(self, string, lo=1)
+        if string_id < len(self) and self[string_id] == string:
+            return string_id
+        return None
+
+
+class CardStore:
+    """
+    Read-only, memory-mapped columnar store of cards written by `write_store`.
+
+    Opening a store only maps the file; queries read just the columns they filter
+    on and the rows they return, so a store is usable immediately no matter its size,
+    and processes opening the same file share its pages through the OS page cache.
+
+    Cards are returned as the same dicts as `read_from_csv` (strings, or
+    `DEFAULT_EMPTY` for empty fields).
+
+    Parameters
+    ----------
+    store_file : str | Path
+        The path of the store (e.g. `data/full.cards`).
+
+    Examples
+    --------
+    >>> with CardStore("data/full.cards") as store:
+    ...     store.get("A1 001")["name"]
+    ...     [card["number"] for card in store.query(pack="A1", type="Fire", hp_min=100)]
+    'Bulbasaur'
+    ['A1 035', 'A1 036', ...]
+    """
+
+    def __init__(self, store_file: str | Path):
+        with open(store_file, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version, num_cards, num_strings = HEADER.unpack_from(self._view)
+        if magic != MAGIC or version != VERSION:
+            self._view.release()
+            self._mmap.close()
+            raise ValueError(f"{store_file} is not a version {VERSION} card store")
+        self.num_cards = num_cards
+
+        offset = HEADER.size
+        offsets = self._view[offset : offset + 4 * (num_strings + 1)].cast("I")
+        offset += 4 * (num_strings + 1)
+        self.strings = _StringTable(offsets, self._view[offset : offset + offsets[-1]])
+        offset = _align(offset + offsets[-1])
+
+        self.columns: dict[str, memoryview] = {}
+        for column in STORE_COLUMNS:
+            fmt = "i" if column in INT_COLUMNS else "I"
+            self.columns[column] = self._view[offset : offset + 4 * num_cards].cast(fmt)
+            offset += 4 * num_cards
+        self._by_number = self._view[offset : offset + 4 * num_cards].cast("I")
+
+    def __len__(self) -> int:
+        return self.num_cards
+
+    def value(self, row: int, column: str) -> str | None:
+        """Returns the field `column` of the card in `row`, as in the CSV."""
+        value = self.columns[column][row]
+        if column in INT_COLUMNS:
+            return None if value == NULL_INT else str(value)
+        return self.strings[value]
+
+    def card(self, row: int) -> dict[str, str | None]:
+        """Returns the card in `row` with the columns of `COLUMNS`."""
+        return {column: self.value(row, column) for column in COLUMNS}
+
+    def get(self, number: str) -> dict[str, str | None] | None:
+        """Returns the card with `number` (e.g. `"A1 001"`), or `None` if it is not stored."""
+        number_id = self.strings.find(number)
+        if number_id is None:
+            return None
+
+        # Binary search on the rows sorted by number
+        numbers = self.columns["number"]
+        lo, hi = 0, self.num_cards
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.strings[numbers[self._by_number[mid]]] < number:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.num_cards and numbers[self._by_number[lo]] == number_id:
+            return self.card(self._by_number[lo])
+        return None
+
+    def query(
+        self,
+        pack: str | None = None,
+        type: str | None = None,
+        rarity: str | None = None,
+        hp_min: int | None = None,
+        hp_max: int | None = None,
+    ) -> list[dict[str, str | None]]:
+        """
+        Returns the cards matching every given filter, in stored order.
+
+        Parameters
+        ----------
+        pack : str | None
+            The pack ID (e.g. `"A1"` or `"P-A"`).
+        type : str | None
+            The card type (e.g. `"Fire"` or `"Supporter"`).
+        rarity : str | None
+            The rarity (e.g. `"◇◇"`).
+        hp_min, hp_max : int | None
+            Inclusive HP range. Cards without HP never match a range.
+
+        Returns
+        -------
+        cards : list[dict[str, str | None]]
+            The matching cards.
+        """
+        rows = range(self.num_cards)
+        for column, string in [("pack", pack), ("type", type), ("rarity", rarity)]:
+            if string is None:
+                continue
+            string_id = self.strings.find(string)
+            if string_id is None:
+                return []
+            values = self.columns[column]
+            rows = [row for row in rows if values[row] == string_id]
+
+        if hp_min is not None or hp_max is not None:
+            hp = self.columns["HP"]
+            lo = hp_min if hp_min is not None else NULL_INT + 1
+            hi = hp_max if hp_max is not None else 2**31 - 1
+            rows = [row for row in rows if hp[row] != NULL_INT and lo <= hp[row] <= hi]
+
+        return [self.card(row) for row in rows]
+
+    def close(self):
+        """Releases the mapping (cards already returned stay valid)."""
+        for view in [*self.columns.values(), self.strings.offsets, self.strings.blob, self._by_number]:
+            view.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def csv_to_store(csv_file: str | Path, store_file: str | Path) -> int:
+    """
+    Converts a CSV written by `write_to_csv` (e.g. `data/full.csv`) to a card store.
+
+    Returns
+    -------
+    num_cards : int
+        The number of cards stored.
+    """
+    cards_data = read_from_csv(csv_file)
+    write_store(cards_data, store_file)
+    return len(cards_data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a card CSV to a memory-mapped card store.")
+    parser.add_argument("--csv", default="data/full.csv", help="The CSV to convert (default: data/full.csv).")
+    parser.add_argument("--out", default="data/full.cards", help="The store file (default: data/full.cards).")
+    args = parser.parse_args()
+
+    num_cards = csv_to_store(args.csv, args.out)
+    print(f"Stored {num_cards} cards in {args.out}")
@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+import pandas as pd
+from tcg import web
+from tcg.incremental import fingerprint
+from tcg.json_convert import (
+    STRUCTURAL_MAPPINGS_URL,
+    card_schema,
+    clean_csv,
+    cleaned_csv_path,
+    flatten_cards,
+    flattend_csv_path,
+)
+
+# State of the last sync: timestamp, HTTP validators, hash of the dump and of every card
+SYNC_STATE_FILE = "data/structural_sync.json"
+
+# Latest JSON dump of the structural mappings
+SNAPSHOT_FILE = "data/RAWJSON.json"
+
+
+def card_fingerprint(card: dict) -> str:
+    """Returns a hash of the content of `card`, independent of its key order."""
+    return fingerprint(json.dumps(card, sort_keys=True, ensure_ascii=False))
+
+
+def load_sync_state(state_file: str | Path) -> dict:
+    """
+    Loads the state saved by the previous sync.
+
+    Returns
+    -------
+    state : dict
+        `{"updated_at": <epoch seconds>, "etag": ..., "last_modified": ...,
+        "content_hash": ..., "cards": {"<CARD_ID>": <hash>}}`, or `{}` if no state exists.
+    """
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_sync_state(state: dict, state_file: str | Path):
+    """Writes the state of this sync to `state_file`."""
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4, sort_keys=True)
+
+
+def download_if_changed(state: dict, updated_at: int, url: str = STRUCTURAL_MAPPINGS_URL):
+    """
+    Downloads the structural mappings, unless they did not change since the last sync.
+
+    The request is conditional on the validators of the last sync (`If-None-Match` /
+    `If-Modified-Since`), so an unchanged dump is not downloaded again when the server
+    supports them. Otherwise the body is compared to the hash of the last dump.
+
+    Parameters
+    ----------
+    state : dict
+        The state of the last sync (see `load_sync_state`).
+    updated_at : int
+        The `updatedAt` timestamp (epoch seconds) sent to the endpoint.
+    url : str
+        The endpoint.
+
+    Returns
+    -------
+    response : requests.Response | None
+        The response with the new dump, or `None` if it did not change.
+
+    Raises
+    ------
+    requests.HTTPError
+        If the request returns a bad status.
+    """
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+
+    response = web.get(f"{url}?updatedAt={updated_at}", headers=headers)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    if hashlib.sha256(response.content).hexdigest() == state.get("content_hash"):
+        return None
+    return response
+
+
+def update_csv(csv_path: str | Path, rows: pd.DataFrame, ids: list[str], id_column: str = "id") -> bool:
+    """
+    Replaces or adds `rows` in a CSV, keeping the other rows as they are.
+
+    Parameters
+    ----------
+    csv_path : str | Path
+        The CSV written by a previous sync.
+    rows : pandas.DataFrame
+        The new and changed rows, with the same columns as the CSV.
+    ids : list[str]
+        The IDs of every row the CSV should have, in order. Rows that are not listed
+        are removed.
+    id_column : str
+        The column holding the IDs.
+
+    Returns
+    -------
+    updated : bool
+        `False` if the CSV could not be updated (it is missing, its columns changed or
+        it lacks some of the rows), in which case it is left untouched.
+    """
+    try:
+        previous = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    except FileNotFoundError:
+        return False
+    if list(previous.columns) != list(rows.columns):
+        return False
+
+    merged = pd.concat([previous, rows]).drop_duplicates(subset=id_column, keep="last")
+    merged = merged.set_index(id_column, drop=False)
+    if not pd.Index(ids).isin(merged.index).all():
+        return False
+
+    merged.loc[ids].to_csv(csv_path, index=False, encoding="utf-8")
+    return True
+
+
+def sync_structural_mappings(
+    state_file: str | Path = SYNC_STATE_FILE,
+    snapshot_file: str | Path = SNAPSHOT_FILE,
+    flattened_path: str | Path = flattend_csv_path,
+    cleaned_path: str | Path = cleaned_csv_path,
+    list_key: str = "moves",
+    updated_at: int | None = None,
+    url: str = STRUCTURAL_MAPPINGS_URL,
+) -> dict[str, list[str]] | None:
+    """
+    Brings the flattened and cleaned CSVs up to date with the structural mappings.
+
+    Nothing is done when the dump did not change since the last sync (see
+    `download_if_changed`). Otherwise each card is hashed and compared to the hashes
+    of the previous snapshot, and only the added or changed cards go through
+    `flatten_cards` and `clean_csv`; the rows of the other cards are kept from the
+    CSVs. The CSVs are rebuilt from every card on the first sync, or when the
+    columns change (e.g. a card with more moves appears).
+
+    Parameters
+    ----------
+    state_file : str | Path
+        The state of the last sync (e.g. `data/structural_sync.json`).
+    snapshot_file : str | Path
+        Where the new dump is saved (e.g. `data/RAWJSON.json`).
+    flattened_path, cleaned_path : str | Path
+        The flattened and cleaned CSVs.
+    list_key : str
+        The key of the nested list to flatten.
+    updated_at : int | None
+        The `updatedAt` timestamp sent to the endpoint. Defaults to the current time.
+    url : str
+        The endpoint.
+
+    Returns
+    -------
+    changes : dict[str, list[str]] | None
+        The IDs of the `"added"`, `"changed"` and `"removed"` cards, or `None` if the
+        dump did not change.
+    """
+    state = load_sync_state(state_file)
+    if updated_at is None:
+        updated_at = int(time.time())
+
+    response = download_if_changed(state, updated_at, url)
+    if response is None:
+        print(f"Structural mappings unchanged since {state.get('updated_at')}")
+        return None
+
+    raw_json = json.loads(response.content)
+    cards = raw_json.get("cardArraySchema", {}).get("cards", [])
+    hashes = {card["id"]: card_fingerprint(card) for card in cards}
+    previous_hashes = state.get("cards", {})
+    changes = {
+        "added": [card_id for card_id in hashes if card_id not in previous_hashes],
+        "changed": [
+            card_id
+            for card_id, card_hash in hashes.items()
+            if card_id in previous_hashes and previous_hashes[card_id] != card_hash
+        ],
+        "removed": [card_id for card_id in previous_hashes if card_id not in hashes],
+    }
+
+    # Same columns for the delta as for the whole dump
+    schema, _ = card_schema(cards, list_key)
+    dirty_ids = set(changes["added"]) | set(changes["changed"])
+    delta = flatten_cards([card for card in cards if card["id"] in dirty_ids], list_key, schema=schema)
+
+    ids = list(hashes)
+    updated = bool(previous_hashes) and all(
+        update_csv(path, rows, ids) for path, rows in [(flattened_path, delta), (cleaned_path, clean_csv(delta))]
+    )
+    if not updated:
+        df = flatten_cards(cards, list_key, schema=schema)
+        df.to_csv(flattened_path, index=False, encoding="utf-8")
+        clean_csv(df).to_csv(cleaned_path, index=False, encoding="utf-8")
+
+    with open(snapshot_file, "w", encoding="utf-8") as f:
+        json.dump(raw_json, f, ensure_ascii=False, indent=2)
+    save_sync_state(
+        {
+            "updated_at": updated_at,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": hashlib.sha256(response.content).hexdigest(),
+            "cards": hashes,
+        },
+        state_file,
+    )
+
+    print(
+        f"Synced structural mappings: {len(changes['added'])} added, "
+        f"{len(changes['changed'])} changed, {len(changes['removed'])} removed"
+        + ("" if updated else " (CSVs rebuilt)")
+    )
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Update the flattened and cleaned CSVs with the cards changed in the structural mappings."
+    )
+    parser.add_argument("--state", default=SYNC_STATE_FILE, help=f"The sync state (default: {SYNC_STATE_FILE}).")
+    args = parser.parse_args()
+
+    sync_structural_mappings(state_file=args.state)
@@ -1,4 +1,8 @@
 import re
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from functools import lru_cache
 
 # Default value to fill dict and csvs for missing / not applicable field
 DEFAULT_EMPTY = None
@@ -50,6 +54,21 @@ ENERGY_SYMBOLS = {
     "Blank": "💭"
 }
 
+# Misspelled types of ENERGY_SYMBOLS, counted in TYPO_ENERGY_TYPES when they are parsed
+ENERGY_TYPOS = frozenset({"Lighting", "Fightring", "Fighitng"})
+
+# "<Type> <count>" energy token: the type is everything before the last space
+ENERGY_TOKEN = re.compile(r"(.*) ([^ ]*)", re.DOTALL)
+
+# Number of distinct cost strings / alt lists kept by `parse_energy_costs`
+ENERGY_CACHE_SIZE = 4096
+
+# Types that are not in ENERGY_SYMBOLS (parsed as "?"), and misspelled types (ENERGY_TYPOS),
+# with the number of times each was parsed
+UNKNOWN_ENERGY_TYPES: Counter[str] = Counter()
+TYPO_ENERGY_TYPES: Counter[str] = Counter()
+_energy_counts_lock = threading.Lock()
+
 # Map between url links to retreat cost images and numeric costs
 RETREAT_COSTS = {
     "https://img.game8.co/3998614/b92af68265b2e7623de5efdf8197a9bf.png/show": 0,
@@ -127,23 +146,70 @@ def parse_energy_cost(energy_str: str) -> str:
         >>> parse_energy_cost("Unknown 3")
         '???'
     """
-    parts = energy_str.rsplit(" ", 1)
-    match len(parts):
-        case 0:
-            return ""
-        case 1:
-            type_name = energy_str
-            count = 1
-        case 2:
-            type_name = parts[0]
-            count = int(parts[1]) if parts[1].isdigit() else 1
-        case _:
-            raise ValueError(
-                f"energy_str was <{energy_str}> and should be of the form <ENERGY COUNT>"
-            )
-
-    symbol = ENERGY_SYMBOLS.get(type_name, "?")
-    return symbol * count
+    return parse_energy_costs((energy_str,))
+
+
+def parse_energy_costs(costs: str | Iterable[str]) -> str:
+    """
+    Convert a whole move cost into symbols, e.g. "Grass:Colorless 2" into "🟢🔘🔘".
+
+    Each energy is parsed like `parse_energy_cost`. Results are cached per cost
+    (the same few costs repeat across cards), and every unknown or misspelled type
+    is counted in `UNKNOWN_ENERGY_TYPES` / `TYPO_ENERGY_TYPES`.
+
+    Parameters
+    ----------
+        costs : str | Iterable[str]
+            Either a cost string whose energies are separated by ":" (or ";" if
+            there is no ":"), or the energies themselves (e.g. the `alt` of the
+            cost icons: `["Grass", "Colorless 2"]`).
+
+    Returns
+    -------
+        symbols : str
+            The symbols of every energy, concatenated.
+
+    Examples:
+        >>> parse_energy_costs("Grass 2:Colorless")
+        '🟢🟢🔘'
+        >>> parse_energy_costs(["Water", "Darkness 2"])
+        '🔵⚫⚫'
+    """
+    symbols, flagged_types = _tokenize_energy_costs(costs if isinstance(costs, str) else tuple(costs))
+    if flagged_types:
+        with _energy_counts_lock:
+            for type_name in flagged_types:
+                if type_name in ENERGY_SYMBOLS:
+                    TYPO_ENERGY_TYPES[type_name] += 1
+                else:
+                    UNKNOWN_ENERGY_TYPES[type_name] += 1
+    return symbols
+
+
+@lru_cache(maxsize=ENERGY_CACHE_SIZE)
+def _tokenize_energy_costs(costs: str | tuple[str, ...]) -> tuple[str, tuple[str, ...]]:
+    """
+    Returns the symbols of `costs` (see `parse_energy_costs`), and the types of
+    `costs` that are unknown or in ENERGY_TYPOS.
+    """
+    if isinstance(costs, str):
+        tokens = [token.strip() for token in costs.split(":" if ":" in costs else ";")]
+    else:
+        tokens = costs
+
+    symbols = []
+    flagged_types = []
+    for token in tokens:
+        match = ENERGY_TOKEN.fullmatch(token)
+        if match is None:
+            type_name, count = token, 1
+        else:
+            type_name, count = match[1], int(match[2]) if match[2].isdigit() else 1
+
+        symbols.append(ENERGY_SYMBOLS.get(type_name, "?") * count)
+        if type_name not in ENERGY_SYMBOLS or type_name in ENERGY_TYPOS:
+            flagged_types.append(type_name)
+    return "".join(symbols), tuple(flagged_types)
 
 
 def parse_retreat_cost(retreat_cost_img: str) -> int:
@@ -0,0 +1,296 @@
+import random
+import threading
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from tcg import metrics
+from tcg.cache import ResponseCache
+
+
+# Maximum number of requests allowed in flight to a single host at once
+MAX_PER_HOST = 8
+
+# One semaphore per host, created lazily the first time the host is seen
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+# On-disk cache used by `fetch_text` (`None` disables caching)
+CACHE: ResponseCache | None = ResponseCache()
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by every module that downloads from Game8.
+
+    A single `requests.Session` keeps connections alive between requests, so only
+    the first request to a host pays for the TCP and TLS handshakes. Requests that
+    fail with a connection error or one of `RETRY_STATUSES` are retried with
+    exponential backoff and full jitter, waiting for `Retry-After` instead when the
+    server sends one. The number of requests, retries and bytes downloaded are
+    counted per host in `stats`, and per pack in the `download` stage of `metrics.METRICS`.
+
+    Each attempt takes a slot of its host's semaphore (see `set_max_per_host`) and
+    gives it back before backing off, so a request waiting to be retried doesn't
+    block the others. Only the time spent on the network is recorded as `download` time.
+
+    Parameters
+    ----------
+    pool_size : int
+        The number of connections kept alive per host.
+    max_retries : int
+        The number of times a failed request is retried before giving up.
+    backoff : float
+        The base delay (in seconds) of the backoff; retry `n` waits up to `backoff * 2**n`.
+    max_backoff : float
+        The longest delay (in seconds) between two attempts, including `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 16,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 60.0,
+    ):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.stats = defaultdict(lambda: {"requests": 0, "retries": 0, "bytes": 0})
+        self._stats_lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Performs a GET request, retrying transient failures.
+
+        Parameters
+        ----------
+        url : str
+            The URL to download.
+        **kwargs
+            Passed straight through to `requests.Session.get` (e.g. `timeout`, `headers`).
+
+        Returns
+        -------
+        response : requests.Response
+            The response of the last attempt. The status is not checked.
+
+        Raises
+        ------
+        requests.ConnectionError, requests.Timeout
+            If the last attempt could not connect or timed out.
+        """
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            is_last_attempt = attempt == self.max_retries
+            try:
+                with _host_semaphore(url), metrics.METRICS.time("download"):
+                    response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._count(host, requests=1)
+                metrics.METRICS.count("download", requests=1)
+                if is_last_attempt:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                self._count(host, requests=1, bytes=len(response.content))
+                metrics.METRICS.count("download", requests=1, bytes=len(response.content))
+                if response.status_code not in RETRY_STATUSES or is_last_attempt:
+                    return response
+                delay = self.retry_after(response)
+                if delay is None:
+                    delay = self.backoff_delay(attempt)
+
+            self._count(host, retries=1)
+            metrics.METRICS.count("download", retries=1)
+            time.sleep(delay)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Returns a random delay in `[0, backoff * 2**attempt]`, capped at `max_backoff`."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def retry_after(self, response: requests.Response) -> float | None:
+        """
+        Returns the delay requested by the `Retry-After` header of `response`.
+
+        The header can either be a number of seconds or an HTTP date. `None` is
+        returned if the header is missing or can't be parsed.
+        """
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        if value.strip().isdigit():
+            delay = float(value)
+        else:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+
+        return min(self.max_backoff, max(0.0, delay))
+
+    def stats_by_host(self) -> dict[str, dict[str, int]]:
+        """Returns a copy of the request, retry and byte counts for every host."""
+        with self._stats_lock:
+            return {host: dict(counts) for host, counts in self.stats.items()}
+
+    def _count(self, host: str, **counts: int):
+        with self._stats_lock:
+            for name, value in counts.items():
+                self.stats[host][name] += value
+
+
+# Client used by `get` and `fetch_text`
+CLIENT = HttpClient()
+
+
+def set_max_per_host(limit: int):
+    """
+    Changes the number of concurrent requests allowed for each host.
+
+    Semaphores created before the change are discarded so that the new
+    limit applies to every request made afterwards.
+
+    Parameters
+    ----------
+    limit : int
+        The maximum number of requests in flight per host (must be at least 1).
+    """
+    global MAX_PER_HOST
+    if limit < 1:
+        raise ValueError(f"limit was <{limit}> but must be at least 1")
+
+    with _host_semaphores_lock:
+        MAX_PER_HOST = limit
+        _host_semaphores.clear()
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """Returns the semaphore guarding requests to the host of `url`."""
+    host = urlsplit(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(MAX_PER_HOST)
+        return _host_semaphores[host]
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    Performs a GET request while respecting the per-host concurrency limit.
+
+    The request goes through the shared `CLIENT`, so connections are reused and
+    transient failures are retried. It is safe to call from many threads at once:
+    at most `MAX_PER_HOST` requests to the same host will be in flight at any time
+    (requests waiting for a retry don't count).
+
+    Parameters
+    ----------
+    url : str
+        The URL to download.
+    **kwargs
+        Passed straight through to `HttpClient.get` (e.g. `timeout`).
+
+    Returns
+    -------
+    response : requests.Response
+        The response of the request. The status is not checked.
+    """
+    return CLIENT.get(url, **kwargs)
+
+
+def set_client(client: HttpClient):
+    """
+    Replaces the shared client used by `get` and `fetch_text`.
+
+    Parameters
+    ----------
+    client : HttpClient
+        The new client (e.g. one with a bigger pool or fewer retries).
+    """
+    global CLIENT
+    CLIENT = client
+
+
+def set_cache(cache: ResponseCache | None):
+    """
+    Replaces the response cache used by `fetch_text`.
+
+    Parameters
+    ----------
+    cache : ResponseCache | None
+        The new cache, or `None` to always download pages.
+    """
+    global CACHE
+    CACHE = cache
+
+
+def fetch_text(url: str, cache_key: str | None = None, **kwargs) -> str:
+    """
+    Downloads the page at `url` and returns its text, going through `CACHE`.
+
+    - A fresh cached copy is returned without any network access.
+    - A stale copy is revalidated with a conditional request (`If-None-Match` /
+      `If-Modified-Since`). On `304 Not Modified` the cached copy is returned.
+    - Otherwise the page is downloaded and stored in the cache.
+
+    Parameters
+    ----------
+    url : str
+        The URL to download.
+    cache_key : str | None
+        The key the response is cached under. Defaults to `url`; useful when `url`
+        contains a cache-busting query parameter.
+    **kwargs
+        Passed straight through to `get` (e.g. `timeout`).
+
+    Returns
+    -------
+    text : str
+        The decoded body of the page.
+
+    Raises
+    ------
+    requests.HTTPError
+        If the request returns a bad status.
+    """
+    if CACHE is None:
+        response = get(url, **kwargs)
+        response.raise_for_status()
+        return response.text
+
+    key = cache_key or url
+    meta = CACHE.lookup(key)
+    if meta is not None and CACHE.is_fresh(meta):
+        text = CACHE.read_text(meta)
+        if text is not None:
+            return text
+        # Evicted by another thread since `lookup`: download it again
+        meta = None
+
+    headers = kwargs.pop("headers", {})
+    response = get(url, headers=headers | (CACHE.validators(meta) if meta else {}), **kwargs)
+    if response.status_code == 304 and meta is not None:
+        CACHE.refresh(meta)
+        text = CACHE.read_text(meta)
+        if text is not None:
+            return text
+        # Evicted while revalidating: the 304 has no body, so request the page unconditionally
+        response = get(url, headers=headers, **kwargs)
+
+    response.raise_for_status()
+    encoding = response.encoding or response.apparent_encoding
+    CACHE.store(key, response.content, response.headers, encoding)
+    return response.content.decode(encoding or "utf-8", errors="replace")
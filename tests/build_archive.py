@@ -0,0 +1,236 @@
+import argparse
+import csv
+from html import escape
+from pathlib import Path
+from tcg.utils import ENERGY_SYMBOLS, ENERGY_TYPOS, RETREAT_COSTS
+from tests.replay import ARCHIVE_FILE, FixtureArchive
+
+# Cards of a previous run, whose pages are rebuilt
+FULL_CSV = Path(__file__).resolve().parent.parent / "data" / "full.csv"
+
+# Cards checked by `tests/test_parser.py`, rebuilt into their pack pages and card pages
+ARCHIVE_CARDS = [
+    "A1 001", "A1 004", "A1 007", "A1 026", "A1 047", "A1 183", "A1 216", "A1 219", "A1 269",
+    "A1a 001", "A2 001", "A2a 001", "A2b 001", "A3 001", "A3 146", "A3a 001", "A3a 006",
+    "A4 001", "A4a 001", "P-A 005",
+]
+
+# Game8 pages of the Pokémon TCG Pocket card lists
+ARCHIVE_URL = "https://game8.co/games/Pokemon-TCG-Pocket/archives/"
+MAIN_URL = ARCHIVE_URL + "482685"
+
+# Pack pages whose URL is known; the others get a made-up `pack-<ID>` URL
+PACK_EXTS = {"A1": "482713"}
+
+# Move cost symbols of `data/full.csv` and the type of their icons
+COST_TYPES = {symbol: type_name for type_name, symbol in ENERGY_SYMBOLS.items() if type_name not in ENERGY_TYPOS}
+COST_TYPES["*️⃣"] = "Colorless"
+
+# An icon of each retreat cost
+RETREAT_IMAGES = {str(cost): url for url, cost in reversed(RETREAT_COSTS.items())}
+
+# Placeholder `src` of the lazy-loaded icons
+BLANK_GIF = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+PAGE = """<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title} | Pokemon TCG Pocket｜Game8</title></head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+MAIN_ROW = """        <tr>
+            <td class="center"><a class="a-link" href="{path}">{pack}</a></td>
+        </tr>
+"""
+
+PACK_TABLE = """<table class="a-table table--fixed flexible-cell">
+    <thead>
+        <tr>
+            <th class="center">✔</th><th class="center">No.</th><th class="center">Card</th>
+            <th class="center">Rarity</th><th class="center">Pack</th><th class="center">Type</th>
+            <th class="center">HP</th><th class="center">Stage</th><th class="center">Points</th>
+            <th class="center">Details</th>
+        </tr>
+    </thead>
+    <tbody>
+{rows}    </tbody>
+</table>"""
+
+PACK_ROW = """        <tr>
+            <td class="center"><input type="checkbox"></td>
+            <td class="center"><b class="a-bold">{number}</b></td>
+            <td class="center"><div class="imageLink"><img class="a-img lazy" alt="Pokemon TCG Pocket - {number} {name}" src="{blank}" data-src="{image}"></div> <a class="a-link" href="{url}">{name}</a></td>
+            <td class="center"><img class="a-img lazy" alt="Pokemon TCG Pocket - {rarity} rarity" src="{blank}"><hr class="a-table__line">{rarity}</td>
+            <td class="center"><b class="a-bold">{pack}</b> <br> {booster}</td>
+            <td class="center"><img class="a-img lazy" alt="Pokemon TCG Pocket - {type}" src="{blank}"></td>
+            <td class="center"> {HP} </td>
+            <td class="center"> {stage} </td>
+            <td class="center">{points}</td>
+            <td class="left">{details}</td>
+        </tr>
+"""
+
+DETAILS_TABLE = """<table class="a-table table--fixed a-table">
+    <tr><th colspan="3">{name}</th></tr>
+    <tr><th>Rating</th><td colspan="2">-</td></tr>
+    <tr><th>Card No.</th><td colspan="2">{number}</td></tr>
+    <tr><th>Pack</th><td colspan="2">{pack}</td></tr>
+    <tr><th>Rarity</th><td colspan="2">{rarity}</td></tr>
+    <tr><th>Generation</th><td colspan="2">{generation}</td></tr>
+    <tr><th>Expansion</th><td colspan="2">{expansion}</td></tr>
+    <tr><th>Illustrator</th><td colspan="2">{illustrator}</td></tr>
+    <tr><th>Type</th><th>HP</th><th>Weakness</th></tr>
+    <tr><td>{type}</td><td>{HP}</td><td>{weakness}</td></tr>
+</table>"""
+
+
+def split_pack_name(pack_name: str) -> tuple[str, str]:
+    """
+    Splits a `pack_name` into the pack and its booster, e.g. `"Genetic Apex (A1) Mewtwo"`
+    into `("Genetic Apex (A1)", "Mewtwo")` and `"Promo Promo-A"` into `("Promo", "Promo-A")`.
+    """
+    end = pack_name.find(")") + 1 or pack_name.find(" ")
+    return pack_name[:end].strip(), pack_name[end:].strip()
+
+
+def pack_id(number: str) -> str:
+    """Returns the pack ID of a card number, e.g. `"A1a"` for `"A1a 001"`."""
+    return number.split(" ")[0]
+
+
+def pack_url(pack: str) -> str:
+    """Returns the URL of the page listing the cards of the pack `pack`."""
+    return ARCHIVE_URL + PACK_EXTS.get(pack, f"pack-{pack}")
+
+
+def cost_icons(cost: str) -> str:
+    """Renders a move cost of `data/full.csv` (like `"🟢*️⃣"`) as the energy icons of Game8."""
+    icons = []
+    while cost:
+        symbol = next(symbol for symbol in COST_TYPES if cost.startswith(symbol))
+        icons.append(f'<a class="a-link" href="#"><img class="a-img lazy" alt="{COST_TYPES[symbol]}" src="{BLANK_GIF}"></a>')
+        cost = cost[len(symbol):]
+    return " ".join(icons)
+
+
+def details_cell(card: dict[str, str]) -> str:
+    """Renders the details cell of a card row, the inverse of `parser.extract_cell9`."""
+    if not card["stage"]:
+        return escape(card["ability_effect"])
+
+    parts = [
+        f'<br> <b class="a-bold">Stage</b>: {card["stage"]} <br>',
+        f'<div class="align"> <b class="a-bold">Retreat Cost</b>: <img class="a-img lazy" '
+        f'alt="Pokemon TCG Pocket - Retreat Cost" src="{BLANK_GIF}" data-src="{RETREAT_IMAGES[card["retreat_cost"]]}"></div>',
+        '<hr class="a-table__line">',
+    ]
+    if card["ability_name"]:
+        parts += [
+            f'<span class="a-red">[Ability]</span> {escape(card["ability_name"])} <br>',
+            f'{escape(card["ability_effect"])} <br>',
+            '<hr class="a-table__line">',
+        ]
+    for move in ("move1", "move2"):
+        if card[f"{move}_name"]:
+            parts.append(f'<div class="align"> <b class="a-bold">{escape(card[f"{move}_name"])}</b> {cost_icons(card[f"{move}_cost"])}</div>')
+            parts += [f"{escape(card[f'{move}_{text}'])} <br>" for text in ("damage", "effect") if card[f"{move}_{text}"]]
+    if card["ultra_beast"] == "Yes":
+        parts.append('<div class="align"><b class="a-bold">Ultra Beast</b></div>')
+    return "\n            ".join(parts)
+
+
+def pack_row(card: dict[str, str]) -> str:
+    """Renders the `<tr>` of a card in its pack table, the inverse of `parser.extract_card`."""
+    pack, booster = split_pack_name(card["pack_name"])
+    return PACK_ROW.format(
+        number=card["number"],
+        name=escape(card["name"]),
+        image=card["image"],
+        url=card["url"],
+        rarity=card["rarity"],
+        pack=escape(pack),
+        booster=escape(booster),
+        type=card["type"],
+        HP=card["HP"],
+        stage=card["stage"],
+        points=f'{int(card["pack_points"]):,} Pts' if card["pack_points"] else "",
+        details=details_cell(card),
+        blank=BLANK_GIF,
+    )
+
+
+def card_page(card: dict[str, str]) -> str:
+    """Renders the page of a card, holding the details table read by `parser.extract_extra_card_details`."""
+    pack = split_pack_name(card["pack_name"])[0]
+    weakness = card["weakness"] and f'<a class="a-link" href="#"><img class="a-img" alt="{card["weakness"]}" src="{BLANK_GIF}"></a>'
+    table = DETAILS_TABLE.format(
+        name=escape(card["name"]),
+        number=card["number"],
+        pack=escape(pack),
+        rarity=card["rarity"],
+        generation=card["generation"] and f'Gen {card["generation"]}',
+        expansion=escape(pack.split(" (")[0]),
+        illustrator=escape(card["illustrator"]),
+        type=card["type"],
+        HP=card["HP"] or "-",
+        weakness=weakness or "-",
+    )
+    return PAGE.format(title=f'{escape(card["name"])} {card["number"]} Card Information', body=table)
+
+
+def build_archive(cards: list[dict[str, str]]) -> FixtureArchive:
+    """
+    Renders the Game8 pages listing `cards`, as `get_pack_names_and_urls`,
+    `fetch_html_table` and `extract_card` read them.
+
+    Returns
+    -------
+    archive : FixtureArchive
+        The main page, a pack page for each pack of `cards` (listing only `cards`)
+        and the page of each card, keyed by URL.
+    """
+    packs: dict[str, list[dict[str, str]]] = {}
+    for card in cards:
+        packs.setdefault(pack_id(card["number"]), []).append(card)
+
+    pages = {}
+    main_rows = []
+    for pack, pack_cards in packs.items():
+        name = split_pack_name(pack_cards[0]["pack_name"])[0]
+        # The main page writes the promo pack ID as "Promo-"
+        label = f"{name} (Promo-)" if pack == "P-A" else name
+        main_rows.append(MAIN_ROW.format(path=pack_url(pack).removeprefix("https://game8.co"), pack=escape(label)))
+        table = PACK_TABLE.format(rows="".join(pack_row(card) for card in pack_cards))
+        pages[pack_url(pack)] = PAGE.format(title=f"{escape(name)} Card List", body=table)
+        pages.update({card["url"]: card_page(card) for card in pack_cards})
+
+    main_table = f'<table class="a-table a-table table--fixed">\n    <tbody>\n        <tr><th>Pack</th></tr>\n{"".join(main_rows)}    </tbody>\n</table>'
+    pages[MAIN_URL] = PAGE.format(title="All Cards List", body=main_table)
+
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    return FixtureArchive(
+        {url: {"status": 200, "headers": headers, "body": body, "base64": False} for url, body in pages.items()}
+    )
+
+
+def main():
+    """Builds the fixture archive from `data/full.csv`, until it is recorded from game8.co."""
+    parser = argparse.ArgumentParser(description="Build the Game8 fixture archive from the cards of data/full.csv.")
+    parser.add_argument("--csv", default=FULL_CSV, help="Cards to render (default: data/full.csv)")
+    parser.add_argument("--out", default=ARCHIVE_FILE, help="Archive to write (default: tests/fixtures/game8.json.gz)")
+    args = parser.parse_args()
+
+    with open(args.csv, encoding="utf-8", newline="") as f:
+        found = {row["number"]: row for row in csv.DictReader(f) if row["number"] in ARCHIVE_CARDS}
+    missing = [number for number in ARCHIVE_CARDS if number not in found]
+    if missing:
+        print(f"[!] Not in {args.csv}, so not in the archive: {', '.join(missing)}")
+
+    archive = build_archive([found[number] for number in ARCHIVE_CARDS if number in found])
+    archive.save(args.out)
+    print(f"Built {len(archive)} Game8 pages into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import shutil
+import pytest
+import tcg.io
+from tcg import web
+from tests import replay
+from tests.server import PAGES_DIR, FixtureServer
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--game8",
+        choices=["replay", "record", "live"],
+        default="replay",
+        help="How tests reach game8.co: replay the responses recorded in tests/fixtures/game8.json.gz "
+        "(default, no network), record them again, or download them without recording.",
+    )
+
+
+def pytest_configure(config):
+    mode = config.getoption("game8")
+    if mode == "record" and config.getoption("numprocesses", default=None):
+        raise pytest.UsageError("--game8 record must run in a single process (without -n)")
+    replay.install(mode)
+    if mode == "replay" and not replay.ARCHIVE:
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning(
+                f"No recorded Game8 responses in {replay.ARCHIVE_FILE}, so the tests needing game8.co fail. "
+                "Rebuild them with `python -m tests.build_archive` or record them with "
+                "`python -m pytest --game8 record`."
+            ),
+            stacklevel=2,
+        )
+
+
+def pytest_unconfigure(config):
+    replay.save()
+
+
+@pytest.fixture(autouse=True)
+def no_http_cache():
+    """Runs every test without the on-disk HTTP cache so results never leak between tests."""
+    cache = web.CACHE
+    web.set_cache(None)
+    yield
+    web.set_cache(cache)
+
+
+@pytest.fixture(autouse=True)
+def restore_http_client():
+    """Puts back the shared client (which replays or records Game8) if a test replaced it."""
+    client = web.CLIENT
+    yield
+    web.set_client(client)
+
+
+@pytest.fixture
+def pages_dir(tmp_path):
+    """A copy of the recorded pages that a test can edit."""
+    return shutil.copytree(PAGES_DIR, tmp_path / "pages")
+
+
+@pytest.fixture
+def server(pages_dir):
+    """Serves `pages_dir` in place of `game8.co`."""
+    with FixtureServer(pages_dir=pages_dir) as server:
+        yield server
+
+
+@pytest.fixture
+def extracted(monkeypatch):
+    """Records the number of every card passed to `extract_card`."""
+    numbers = []
+    extract_card = tcg.io.extract_card
+
+    def counting_extract_card(card_html):
+        card = extract_card(card_html)
+        numbers.append(card["number"])
+        return card
+
+    monkeypatch.setattr(tcg.io, "extract_card", counting_extract_card)
+    return numbers
@@ -2,9 +2,10 @@ import argparse
 import json
 from collections import OrderedDict
 import bs4
+from tcg import profiling
 from tcg.utils import COLUMNS
 from tcg.io import fetch_html_table, get_pack_names_and_urls
-from tcg.parser import extract_card
+from tcg.parser import extract_card, fix_edge_cases
 
 
 def debug_card_extract(pokemon_id: str, html: bs4.element.Tag | None = None) -> dict[str, str]:
@@ -77,6 +78,7 @@ def debug_card_extract(pokemon_id: str, html: bs4.element.Tag | None = None) ->
         bold = row.find("b", class_="a-bold")
         if bold and bold.text.strip() == pokemon_id:
             card = extract_card(row)
+            fix_edge_cases(card)
             return card
 
     raise Exception(f"[!] No row found for Pokémon ID: {pokemon_id}")
@@ -88,10 +90,12 @@ def main():
     parser.add_argument(
         "pokemon_id", nargs="?", default="A1 001", help="Card ID to extract (e.g., 'A1 007')"
     )
+    profiling.add_arguments(parser)
     args = parser.parse_args()
 
     # Get HTML table from url
-    card = debug_card_extract(args.pokemon_id)
+    with profiling.from_args(args):
+        card = debug_card_extract(args.pokemon_id)
 
     ordered_card = OrderedDict((key, card.get(key, "N/A")) for key in COLUMNS)
     print(json.dumps(ordered_card, indent=2, ensure_ascii=False))
@@ -0,0 +1,201 @@
+import base64
+import gzip
+import http.client
+import json
+import os
+from pathlib import Path
+from urllib.parse import urldefrag
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from tcg import web
+
+# Compressed archive of the Game8 responses recorded by `pytest --game8 record`
+ARCHIVE_FILE = Path(__file__).resolve().parent / "fixtures" / "game8.json.gz"
+
+# Requests to URLs starting with this prefix are recorded or replayed
+GAME8_PREFIX = "https://game8.co/"
+
+# Response headers kept in the archive
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# How the tests reach Game8 (`replay`, `record` or `live`), set by `tests/conftest.py`
+MODE = "live"
+
+# Responses replayed or being recorded (`None` in live mode)
+ARCHIVE: "FixtureArchive | None" = None
+
+
+class NotRecorded(LookupError):
+    """Raised when replaying a request whose response is not in the archive."""
+
+
+class FixtureArchive:
+    """
+    Recorded HTTP responses, keyed by URL.
+
+    The archive is saved as gzip-compressed JSON:
+    `{"responses": {"<URL>": {"status": 200, "headers": {...}, "body": "...", "base64": false}}}`.
+    Bodies are kept as text so that the many similar Game8 pages compress well;
+    bodies that are not UTF-8 are base64-encoded.
+
+    Parameters
+    ----------
+    responses : dict[str, dict] | None
+        The recorded responses, keyed by URL.
+    """
+
+    def __init__(self, responses: dict[str, dict] | None = None):
+        self.responses = responses or {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FixtureArchive":
+        """Reads an archive saved by `save`."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls(json.load(f)["responses"])
+
+    def save(self, path: str | Path):
+        """Writes the archive to `path`, replacing it at once so a reader never sees a partial file."""
+        tmp_path = Path(f"{path}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"responses": dict(sorted(self.responses.items()))}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+    def __contains__(self, url: str) -> bool:
+        return self.key(url) in self.responses
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Returns the key of `url` (the fragment is never sent, so it is dropped)."""
+        return urldefrag(url).url
+
+    def add(self, url: str, response: requests.Response):
+        """
+        Records `response` to a GET request of `url`.
+
+        Transient failures (`web.RETRY_STATUSES`) and `304 Not Modified` are not
+        recorded: the client retries the former, and the latter has no body.
+        """
+        if response.status_code in web.RETRY_STATUSES or response.status_code == 304:
+            return
+        try:
+            body, is_base64 = response.content.decode("utf-8"), False
+        except UnicodeDecodeError:
+            body, is_base64 = base64.b64encode(response.content).decode("ascii"), True
+
+        self.responses[self.key(url)] = {
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "body": body,
+            "base64": is_base64,
+        }
+
+    def response(self, request: requests.PreparedRequest) -> requests.Response:
+        """
+        Builds the recorded response to `request`.
+
+        Raises
+        ------
+        NotRecorded
+            If no response was recorded for the URL of `request`.
+        """
+        try:
+            recorded = self.responses[self.key(request.url)]
+        except KeyError:
+            raise NotRecorded(
+                f"No recorded response for <{request.url}> in the fixture archive, rebuild it with "
+                "`python -m tests.build_archive` or record it with `python -m pytest --game8 record`"
+            ) from None
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = http.client.responses.get(recorded["status"], "")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = (
+            base64.b64decode(recorded["body"]) if recorded["base64"] else recorded["body"].encode("utf-8")
+        )
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter sending requests over the network and recording their responses in `archive`."""
+
+    def __init__(self, archive: FixtureArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.archive.add(request.url, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering requests from `archive`, without any network access."""
+
+    def __init__(self, archive: FixtureArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = self.archive.response(request)
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def install(
+    mode: str,
+    archive_file: str | Path = ARCHIVE_FILE,
+    client: web.HttpClient | None = None,
+    prefix: str = GAME8_PREFIX,
+):
+    """
+    Routes the requests of `client` (default: `web.CLIENT`) to `prefix` according to `mode`.
+
+    Parameters
+    ----------
+    mode : str
+        - `"replay"`: answer from `archive_file`, never from the network (without the
+          archive, every request raises `NotRecorded`)
+        - `"record"`: download and record into `archive_file`, saved by `save` (responses
+          recorded earlier and not requested again are kept)
+        - `"live"`: download without recording
+    archive_file : str | Path
+        The fixture archive.
+    client : web.HttpClient | None
+        The client to mount the adapter on.
+    prefix : str
+        The URLs that are replayed or recorded.
+    """
+    global MODE, ARCHIVE
+    MODE = mode
+    client = client or web.CLIENT
+    if mode == "live":
+        ARCHIVE = None
+        return
+
+    ARCHIVE = FixtureArchive.load(archive_file) if Path(archive_file).exists() else FixtureArchive()
+    if mode == "replay":
+        client.session.mount(prefix, ReplayAdapter(ARCHIVE))
+    else:
+        client.session.mount(
+            prefix, RecordingAdapter(ARCHIVE, pool_connections=client.pool_size, pool_maxsize=client.pool_size)
+        )
+
+
+def save(archive_file: str | Path = ARCHIVE_FILE):
+    """Saves the responses recorded since `install("record")`."""
+    if MODE == "record" and ARCHIVE:
+        ARCHIVE.save(archive_file)
+        print(f"Recorded {len(ARCHIVE)} Game8 responses to {archive_file}")
+
@@ -0,0 +1,124 @@
+import hashlib
+import re
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Directory holding recorded Game8 pages, named `<URL_EXT>.html`
+PAGES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+
+# URL extensions of the recorded main page, pack page and card detail pages
+MAIN_EXT = "482685"
+PACK_EXT = "482713"
+DETAIL_EXTS = ["476002", "476005", "476008", "476184", "476220"]
+
+
+def build_pack_page(arrange_rows: Callable[[list[str]], list[str]]) -> str:
+    """
+    Returns the recorded pack page with its card rows replaced by `arrange_rows(rows)`.
+
+    Examples
+    --------
+    >>> reversed_html = build_pack_page(lambda rows: rows[::-1])
+    """
+    page_html = (PAGES_DIR / f"{PACK_EXT}.html").read_text(encoding="utf-8")
+    start = page_html.index("<tbody>", page_html.index("✔")) + len("<tbody>")
+    end = page_html.index("</tbody>", start)
+    rows = re.findall(r"<tr>.*?</tr>", page_html[start:end], flags=re.DOTALL)
+    return page_html[:start] + "".join(arrange_rows(rows)) + page_html[end:]
+
+
+class FixtureServer:
+    """
+    Local stand-in for `game8.co` serving the recorded pages in `PAGES_DIR`.
+
+    A request for `/games/Pokemon-TCG-Pocket/archives/<URL_EXT>` is answered with
+    `PAGES_DIR/<URL_EXT>.html`, where every `{base}` placeholder is replaced by the
+    server's own address so that links inside the pages point back to it.
+
+    Examples
+    --------
+    >>> with FixtureServer() as server:
+    ...     pack_url = server.url(PACK_EXT)
+    """
+
+    def __init__(self, pages_dir: Path = PAGES_DIR, delay: float = 0.0):
+        self.pages_dir = Path(pages_dir)
+        self.delay = delay
+        self.requests = []
+        self.statuses = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, ext: str | int) -> str:
+        """Returns the stand-in URL for the Game8 archive page `ext`."""
+        return f"{self.base}/games/Pokemon-TCG-Pocket/archives/{ext}"
+
+    def respond(self, path: str, headers) -> tuple[int, dict[str, str], bytes]:
+        """
+        Builds the `(status, headers, body)` answer for a request to `path`.
+
+        Every page carries an `ETag`, and a matching `If-None-Match` is answered
+        with `304 Not Modified`.
+        """
+        page = self.pages_dir / (path.rstrip("/").split("/")[-1].split("?")[0] + ".html")
+        if not page.is_file():
+            return 404, {}, b"Not Found"
+        body = page.read_text(encoding="utf-8").replace("{base}", self.base).encode("utf-8")
+
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": "text/html; charset=utf-8", "ETag": etag}, body
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive between requests like a real web server
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(self.path)
+                    server.connections.add(self.client_address)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.delay)
+                    status, headers, body = server.respond(self.path, self.headers)
+                    with server._lock:
+                        server.statuses.append(status)
+                    self.send_response(status)
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,92 @@
+import pytest
+from tcg import web
+from tcg.cache import ResponseCache
+from tcg.io import fetch_html_table
+from tests.server import PACK_EXT
+
+
+@pytest.fixture
+def use_cache(tmp_path):
+    def use(**kwargs) -> ResponseCache:
+        cache = ResponseCache(tmp_path / "http", **kwargs)
+        web.set_cache(cache)
+        return cache
+
+    return use
+
+
+def test_fresh_entry_skips_network(server, use_cache):
+    use_cache()
+    first = web.fetch_text(server.url("476002"))
+    second = web.fetch_text(server.url("476002"))
+
+    assert first == second
+    assert "Narumi Sato" in first
+    assert server.statuses == [200]
+
+
+def test_stale_entry_is_revalidated(server, use_cache):
+    use_cache(ttl=0)
+    first = web.fetch_text(server.url("476002"))
+    second = web.fetch_text(server.url("476002"))
+
+    assert first == second
+    assert server.statuses == [200, 304]
+
+
+def test_cache_key_ignores_cache_busting_url(server, use_cache):
+    use_cache()
+    web.fetch_text(server.url("476002") + "?updatedAt=1", cache_key=server.url("476002"))
+    web.fetch_text(server.url("476002") + "?updatedAt=2", cache_key=server.url("476002"))
+
+    assert server.statuses == [200]
+
+
+def test_identical_bodies_are_stored_once(server, use_cache):
+    cache = use_cache()
+    web.fetch_text(server.url("476002"))
+    web.fetch_text(server.url("476002") + "?copy")
+
+    assert len(list(cache.meta_dir.iterdir())) == 2
+    assert len(list(cache.objects_dir.iterdir())) == 1
+
+
+def test_least_recently_used_entries_are_evicted(server, use_cache):
+    cache = use_cache()
+    web.fetch_text(server.url("476002"))
+    one_page = cache.total_bytes()
+
+    cache.max_bytes = 2 * one_page + one_page // 2
+    for ext in ["476005", "476008", "476184"]:
+        web.fetch_text(server.url(ext))
+
+    assert cache.total_bytes() <= cache.max_bytes
+    assert cache.lookup(server.url("476002")) is None
+    assert cache.lookup(server.url("476184")) is not None
+
+
+def test_fetch_html_table_uses_cache(server, use_cache):
+    use_cache()
+    first = fetch_html_table(server.url(PACK_EXT), page_type="pack")
+    second = fetch_html_table(server.url(PACK_EXT), page_type="pack")
+
+    assert str(first) == str(second)
+    assert len(server.requests) == 1
+
+
+@pytest.mark.parametrize("ttl, statuses", [(60, [200, 200]), (0, [200, 304, 200])])
+def test_entry_evicted_after_lookup_is_downloaded(server, use_cache, monkeypatch, ttl, statuses):
+    cache = use_cache(ttl=ttl)
+    first = web.fetch_text(server.url("476002"))
+
+    # Another thread evicts the body right after this one looked up the entry
+    lookup = cache.lookup
+
+    def lookup_then_evict(key):
+        meta = lookup(key)
+        cache.clear()
+        return meta
+
+    monkeypatch.setattr(cache, "lookup", lookup_then_evict)
+    assert web.fetch_text(server.url("476002")) == first
+    assert server.statuses == statuses
@@ -0,0 +1,50 @@
+import pytest
+from tcg.card import Card
+from tcg.io import read_from_csv, write_to_csv
+from tcg.utils import COLUMNS
+
+FULL_CSV = "data/full.csv"
+
+
+@pytest.fixture(scope="module")
+def cards():
+    return read_from_csv(FULL_CSV)
+
+
+def test_card_round_trips_through_dict(cards):
+    card = cards[0]
+
+    assert Card.from_dict(card.to_dict()) == card
+    assert card == card.to_dict()
+    assert list(card.to_dict()) == COLUMNS
+    assert dict(card) == card.to_dict()
+
+
+def test_card_round_trips_through_csv(cards, tmp_path):
+    write_to_csv(cards, tmp_path / "full.csv")
+
+    assert (tmp_path / "full.csv").read_bytes() == open(FULL_CSV, "rb").read()
+    assert read_from_csv(tmp_path / "full.csv") == cards
+
+
+def test_repeated_values_are_shared(cards):
+    fire = [card["type"] for card in cards if card["type"] == "Fire"]
+
+    assert len(fire) > 1
+    assert all(value is fire[0] for value in fire)
+    assert cards[0].illustrator is read_from_csv(FULL_CSV)[0].illustrator
+
+
+def test_card_behaves_like_a_dict():
+    card = Card.from_dict({"number": " A1  001 ", "type": "Grass"}, clean=True)
+    card["HP"] = "70"
+
+    assert card["number"] == "A1 001"
+    assert card.get("HP") == "70"
+    assert card.get("not a column", "N/A") == "N/A"
+    assert (card | {"HP": "80"})["HP"] == "80"
+    assert card["HP"] == "70"
+    with pytest.raises(KeyError):
+        card["not a column"] = "value"
+    with pytest.raises(AttributeError):
+        card.not_a_column = "value"
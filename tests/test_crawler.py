@@ -0,0 +1,76 @@
+import asyncio
+import time
+import pytest
+from tcg import page_identify
+from tcg.crawler import TokenBucket, scan_exts
+from tcg.page_mappings import PageMappings
+from tests.server import FixtureServer
+
+
+def run_scan(exts, delay: float = 0.02, **kwargs) -> tuple[dict, float]:
+    """Scans `exts` with a fake probe that takes `delay` seconds; returns the results and duration."""
+    results = {}
+
+    def probe(ext):
+        time.sleep(delay)
+        return ext * 2
+
+    start = time.perf_counter()
+    asyncio.run(scan_exts(exts, probe, results.__setitem__, **kwargs))
+    return results, time.perf_counter() - start
+
+
+def test_scan_records_every_ext():
+    results, _ = run_scan(range(100), concurrency=8)
+
+    assert results == {ext: ext * 2 for ext in range(100)}
+
+
+def test_scan_throughput_scales_with_concurrency():
+    _, serial = run_scan(range(40), concurrency=1)
+    _, parallel = run_scan(range(40), concurrency=10)
+
+    assert parallel < serial / 4
+
+
+def test_scan_checkpoints_progress():
+    checkpoints = []
+    run_scan(range(25), delay=0, checkpoint=lambda: checkpoints.append(1), checkpoint_every=10)
+
+    # Two periodic checkpoints and a final one
+    assert len(checkpoints) == 3
+
+
+def test_token_bucket_limits_rate():
+    # 10 probes at 20 per second with a burst of 1 take at least 9 / 20 seconds
+    async def acquire_all():
+        bucket = TokenBucket(rate=20, capacity=1)
+        for _ in range(10):
+            await bucket.acquire()
+
+    start = time.perf_counter()
+    asyncio.run(acquire_all())
+
+    assert time.perf_counter() - start >= 0.4
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_scan_page_mappings(monkeypatch):
+    with FixtureServer() as server:
+        monkeypatch.setattr(page_identify, "GAMECO_PREFIX", server.url(""))
+        page_mappings = PageMappings(bad_exts=[476184])
+
+        num_probed = page_identify.scan_page_mappings(
+            [476002, 476005, 476184, 482685, 999999], page_mappings, concurrency=4
+        )
+
+    assert num_probed == 4
+    assert page_mappings.to_dict() == {
+        "GOOD_EXTS": {"A1 001": 476002, "A1 004": 476005},
+        "WRONG_EXTS": {"482685": "All Cards List"},
+        "BAD_EXTS": [476184, 999999],
+    }
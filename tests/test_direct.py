@@ -0,0 +1,52 @@
+from tcg.direct import extract_cards_direct
+from tcg.io import extract_pack
+from tcg.page_mappings import PageMappings
+from tests.server import PACK_EXT
+
+
+def run_direct(server, page_mappings, previous_cards, card_ids):
+    return extract_cards_direct(
+        page_mappings,
+        previous_cards,
+        card_ids,
+        workers=4,
+        pack_names_urls={"A1": server.url(PACK_EXT)},
+        archive_url=server.url(""),
+    )
+
+
+def test_direct_refresh_skips_pack_tables(server, pages_dir):
+    previous_cards = {card["number"]: card for card in extract_pack(server.url(PACK_EXT))}
+    page_mappings = PageMappings(good_exts={"A1 001": 476002, "A1 007": 476008})
+    server.requests.clear()
+
+    page = pages_dir / "476008.html"
+    page.write_text(page.read_text().replace("Shin Nagasawa", "Someone Else"))
+    cards_data = run_direct(server, page_mappings, previous_cards, ["A1 001", "A1 007"])
+
+    assert [card["number"] for card in cards_data] == ["A1 001", "A1 007"]
+    assert cards_data[0] == previous_cards["A1 001"]
+    assert cards_data[1]["illustrator"] == "Someone Else"
+    assert sorted(path.split("/")[-1] for path in server.requests) == ["476002", "476008"]
+
+
+def test_direct_falls_back_to_pack_table(server, extracted):
+    full_pack = {card["number"]: card for card in extract_pack(server.url(PACK_EXT))}
+    previous_cards = {"A1 001": full_pack["A1 001"], "A1 004": full_pack["A1 004"]}
+    # A1 004 is missing from the mapping, A1 219 is missing from the previous run
+    page_mappings = PageMappings(good_exts={"A1 001": 476002, "A1 219": 476220})
+    extracted.clear()
+
+    cards_data = run_direct(server, page_mappings, previous_cards, ["A1 001", "A1 004", "A1 219"])
+
+    assert [card["number"] for card in cards_data] == ["A1 001", "A1 004", "A1 219"]
+    assert cards_data == [full_pack["A1 001"], full_pack["A1 004"], full_pack["A1 219"]]
+    assert sorted(extracted) == ["A1 004", "A1 219"]
+
+
+def test_direct_fallback_skips_malformed_rows(server, pages_dir):
+    page = pages_dir / f"{PACK_EXT}.html"
+    page.write_text(page.read_text().replace("<tbody>", "<tbody><tr><td>Ad</td></tr>"))
+    cards_data = run_direct(server, PageMappings(), {}, ["A1 004"])
+
+    assert [card["number"] for card in cards_data] == ["A1 004"]
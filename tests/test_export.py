@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+from tcg.export import csv_to_parquet, read_parquet
+from tcg.io import read_from_csv
+
+FULL_CSV = "data/full.csv"
+
+
+@pytest.fixture(scope="module")
+def dataset_dir(tmp_path_factory):
+    dataset_dir = tmp_path_factory.mktemp("export") / "full_parquet"
+    csv_to_parquet(FULL_CSV, dataset_dir)
+    return dataset_dir
+
+
+def test_export_is_partitioned_by_pack(dataset_dir):
+    packs = {card["number"].split(" ")[0] for card in read_from_csv(FULL_CSV)}
+
+    assert {path.name for path in dataset_dir.iterdir()} == {f"pack={pack}" for pack in packs}
+
+
+def test_export_round_trips_every_card(dataset_dir):
+    df = read_parquet(dataset_dir).drop(columns="pack").set_index("number")
+    csv_df = pd.read_csv(FULL_CSV, dtype=str, keep_default_na=False).set_index("number")
+
+    assert sorted(df.index) == sorted(csv_df.index)
+    as_text = df.astype(object).where(df.notna(), "").astype(str).loc[csv_df.index]
+    pd.testing.assert_frame_equal(as_text, csv_df, check_dtype=False)
+
+
+def test_export_column_types(dataset_dir):
+    df = read_parquet(dataset_dir)
+
+    for column in ["HP", "retreat_cost", "pack_points", "generation"]:
+        assert pd.api.types.is_integer_dtype(df[column])
+    for column in ["rarity", "type", "stage"]:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    assert df.loc[df["number"] == "A1 001", "HP"].item() == 70
+
+
+def test_read_selected_columns_and_packs(dataset_dir):
+    df = read_parquet(dataset_dir, columns=["number", "HP"], packs=["A1", "P-A"])
+
+    assert list(df.columns) == ["number", "HP"]
+    assert set(df["number"].str.split(" ").str[0]) == {"A1", "P-A"}
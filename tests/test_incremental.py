@@ -0,0 +1,73 @@
+import pytest
+import tcg.incremental
+from tcg.incremental import detail_fingerprint, extract_pack_incremental, fingerprint_row
+from tcg.io import extract_pack, fetch_card_rows, read_from_csv, write_to_csv
+from tests.server import PACK_EXT, PAGES_DIR
+
+
+def run_incremental(server, previous_cards, manifest):
+    new_manifest = {}
+    pack_data = extract_pack_incremental(
+        server.url(PACK_EXT), previous_cards, manifest, new_manifest, workers=2
+    )
+    return pack_data, new_manifest
+
+
+def test_first_run_extracts_every_card(server, extracted):
+    pack_data, manifest = run_incremental(server, {}, {})
+
+    assert sorted(extracted) == sorted(card["number"] for card in pack_data)
+    assert sorted(manifest) == sorted(card["number"] for card in pack_data)
+    assert pack_data == extract_pack(server.url(PACK_EXT))
+
+
+def test_unchanged_run_extracts_nothing(server, extracted, tmp_path):
+    pack_data, manifest = run_incremental(server, {}, {})
+
+    # Round trip through the CSV like the driver does
+    write_to_csv(pack_data, tmp_path / "full.csv")
+    previous_cards = {card["number"]: card for card in read_from_csv(tmp_path / "full.csv")}
+    extracted.clear()
+
+    rerun_data, rerun_manifest = run_incremental(server, previous_cards, manifest)
+
+    assert extracted == []
+    assert rerun_data == pack_data
+    assert rerun_manifest == manifest
+
+
+def test_changed_detail_page_is_extracted_again(server, extracted, pages_dir):
+    pack_data, manifest = run_incremental(server, {}, {})
+    previous_cards = {card["number"]: card for card in pack_data}
+    extracted.clear()
+
+    page = pages_dir / "476008.html"
+    page.write_text(page.read_text().replace("Shin Nagasawa", "Someone Else"))
+    rerun_data, _ = run_incremental(server, previous_cards, manifest)
+
+    assert extracted == ["A1 007"]
+    assert [card["number"] for card in rerun_data] == [card["number"] for card in pack_data]
+    assert rerun_data[2]["illustrator"] == "Someone Else"
+
+
+def test_detail_fingerprint_ignores_content_outside_table(pages_dir):
+    page_html = (pages_dir / "476002.html").read_text()
+    noisy_html = page_html.replace("Great list!", "A brand new comment")
+
+    assert detail_fingerprint(page_html) == detail_fingerprint(noisy_html)
+    assert detail_fingerprint(page_html) != detail_fingerprint(page_html.replace("Fire", "Water"))
+
+
+def test_fingerprint_row_only_hides_download_errors(server, pages_dir, monkeypatch):
+    card_html = fetch_card_rows(server.url(PACK_EXT))[0]
+    (pages_dir / "476002.html").unlink()
+    number, card_fingerprint = fingerprint_row(card_html)
+    assert (number, card_fingerprint["detail"]) == ("A1 001", None)
+
+    def broken_fingerprint(page_html):
+        raise ValueError("bug")
+
+    (pages_dir / "476002.html").write_text((PAGES_DIR / "476002.html").read_text())
+    monkeypatch.setattr(tcg.incremental, "detail_fingerprint", broken_fingerprint)
+    with pytest.raises(ValueError):
+        fingerprint_row(card_html)
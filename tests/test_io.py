@@ -0,0 +1,159 @@
+import pytest
+import tcg.io
+from tcg import web
+from tcg.io import CsvStreamWriter, extract_pack, find_html_table, iter_pack, iter_packs, read_from_csv
+from tests.server import MAIN_EXT, PACK_EXT, PAGES_DIR, FixtureServer, build_pack_page
+
+PACK_NUMBERS = ["A1 001", "A1 004", "A1 007", "A1 183", "A1 219"]
+REVERSED_EXT = "900001"
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(delay=0.05) as server:
+        yield server
+
+
+@pytest.fixture
+def max_per_host():
+    yield web.set_max_per_host
+    web.set_max_per_host(8)
+
+
+def test_extract_pack_serial(server):
+    pack_data = extract_pack(server.url(PACK_EXT))
+
+    assert [card["number"] for card in pack_data] == PACK_NUMBERS
+    assert pack_data[0]["illustrator"] == "Narumi Sato"
+    assert pack_data[0]["url"] == server.url("476002")
+
+
+@pytest.mark.parametrize("workers", [2, 5, 16])
+def test_extract_pack_concurrent_matches_serial(server, workers):
+    serial = extract_pack(server.url(PACK_EXT))
+    concurrent = extract_pack(server.url(PACK_EXT), workers=workers)
+
+    assert concurrent == serial
+
+
+def test_extract_pack_respects_max_per_host(server, max_per_host):
+    max_per_host(2)
+    pack_data = extract_pack(server.url(PACK_EXT), workers=5)
+
+    assert [card["number"] for card in pack_data] == PACK_NUMBERS
+    assert server.max_in_flight <= 2
+
+
+@pytest.mark.parametrize("ext, page_type", [(MAIN_EXT, "main"), (PACK_EXT, "pack")])
+def test_partial_parse_finds_same_table_as_full_parse(ext, page_type):
+    page_html = (PAGES_DIR / f"{ext}.html").read_text()
+
+    partial = find_html_table(page_html, page_type, partial=True)
+    full = find_html_table(page_html, page_type, partial=False)
+
+    assert partial is not None
+    assert str(partial) == str(full)
+
+
+def test_partial_parse_skips_decoy_table():
+    page_html = (PAGES_DIR / f"{PACK_EXT}.html").read_text()
+
+    table = find_html_table(page_html, "pack")
+
+    assert table.find("th").get_text(strip=True) == "✔"
+    assert find_html_table("<html><body><p>No tables</p></body></html>", "pack") is None
+
+
+def test_iter_pack_yields_cards_in_table_order(server):
+    cards = iter_pack(server.url(PACK_EXT), workers=3)
+
+    assert next(cards)["number"] == PACK_NUMBERS[0]
+    assert [card["number"] for card in cards] == PACK_NUMBERS[1:]
+
+
+def test_iter_pack_skips_ids(server):
+    cards = list(iter_pack(server.url(PACK_EXT), skip_ids={"A1 001", "A1 004"}))
+
+    assert [card["number"] for card in cards] == PACK_NUMBERS[2:]
+    assert len(server.requests) == 1 + 3
+
+
+@pytest.fixture
+def packs_server(pages_dir):
+    """Serves the fixture pack, plus a second pack `REVERSED_EXT` with the same rows in reverse order."""
+    reversed_html = build_pack_page(lambda rows: rows[::-1])
+    (pages_dir / f"{REVERSED_EXT}.html").write_text(reversed_html, encoding="utf-8")
+
+    with FixtureServer(pages_dir=pages_dir) as server:
+        yield server
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_iter_packs_yields_cards_in_pack_order(packs_server, processes):
+    pack_urls = [packs_server.url(PACK_EXT), packs_server.url(REVERSED_EXT), packs_server.url(PACK_EXT)]
+    cards = list(iter_packs(pack_urls, workers=2, processes=processes, skip_ids={"A1 004"}))
+
+    numbers = [number for number in PACK_NUMBERS if number != "A1 004"]
+    assert [card["number"] for card in cards] == numbers + numbers[::-1] + numbers
+    assert cards[: len(numbers)] == [card for card in extract_pack(pack_urls[0]) if card["number"] != "A1 004"]
+
+
+def test_iter_packs_falls_back_to_one_process(packs_server, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise NotImplementedError("no sem_open")
+
+    monkeypatch.setattr(tcg.io, "ProcessPoolExecutor", unavailable)
+    cards = list(iter_packs([packs_server.url(REVERSED_EXT)], processes=4))
+
+    assert [card["number"] for card in cards] == PACK_NUMBERS[::-1]
+
+
+def test_stream_writer_replaces_output_when_done(server, tmp_path):
+    output_file = tmp_path / "full.csv"
+    pack_data = extract_pack(server.url(PACK_EXT))
+
+    with CsvStreamWriter(output_file) as writer:
+        writer.write(pack_data[0])
+        # Every row is on disk as soon as it is written
+        assert len(read_from_csv(writer.partial_file)) == 1
+        for card in pack_data[1:]:
+            writer.write(card)
+
+    assert read_from_csv(output_file) == pack_data
+    assert not writer.partial_file.exists()
+
+
+def test_stream_writer_keeps_partial_output_on_crash(server, tmp_path):
+    output_file = tmp_path / "full.csv"
+    output_file.write_text("previous run\n")
+    pack_data = extract_pack(server.url(PACK_EXT))
+
+    with pytest.raises(RuntimeError):
+        with CsvStreamWriter(output_file) as writer:
+            writer.write(pack_data[0])
+            writer.write(pack_data[1])
+            raise RuntimeError("Crash in the middle of a pack")
+
+    assert output_file.read_text() == "previous run\n"
+    assert read_from_csv(writer.partial_file) == pack_data[:2]
+
+
+def test_stream_writer_resumes_after_last_card(server, tmp_path):
+    output_file = tmp_path / "full.csv"
+    pack_data = extract_pack(server.url(PACK_EXT))
+    with pytest.raises(RuntimeError):
+        with CsvStreamWriter(output_file) as writer:
+            writer.write(pack_data[0])
+            writer.write(pack_data[1])
+            raise RuntimeError("Crash in the middle of a pack")
+
+    # Simulate the crash happening halfway through writing the third row
+    with open(writer.partial_file, "a", encoding="utf-8") as f:
+        f.write("A1 007,Butterf")
+
+    with CsvStreamWriter(output_file, resume=True) as writer:
+        assert writer.last_id == "A1 004"
+        for card in iter_pack(server.url(PACK_EXT), skip_ids=writer.resumed_ids):
+            writer.write(card)
+
+    assert read_from_csv(output_file) == pack_data
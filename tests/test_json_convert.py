@@ -0,0 +1,126 @@
+import json
+import pandas as pd
+import pytest
+from tcg import json_convert
+from tcg.json_convert import (
+    CardSchema,
+    clean_csv,
+    convert_json_streaming,
+    flatten_cards,
+    flatten_pokemon_data,
+    map_distinct,
+    scan_card_schema,
+)
+
+CARDS = [
+    {"id": "A1 001", "moves": [{"name": "Vine Whip", "damage": "40"}, {"name": "Razor Leaf"}]},
+    {"id": "A1 002", "moves": []},
+    {"id": "A1 003"},
+    {"id": "A1 004", "moves": [{"name": "Ember", "energy_cost": "Fire"}]},
+]
+
+
+def test_flatten_cards():
+    df = flatten_cards(CARDS)
+
+    assert list(df.columns) == [
+        "id",
+        "moves1_name",
+        "moves1_damage",
+        "moves1_energy_cost",
+        "moves2_name",
+        "moves2_damage",
+        "moves2_energy_cost",
+    ]
+    assert df.to_dict("records") == [
+        {
+            "id": "A1 001",
+            "moves1_name": "Vine Whip",
+            "moves1_damage": "40",
+            "moves1_energy_cost": "",
+            "moves2_name": "Razor Leaf",
+            "moves2_damage": "",
+            "moves2_energy_cost": "",
+        },
+        {"id": "A1 002", **{column: "" for column in df.columns[1:]}},
+        {"id": "A1 003", **{column: "" for column in df.columns[1:]}},
+        {
+            "id": "A1 004",
+            "moves1_name": "Ember",
+            "moves1_damage": "",
+            "moves1_energy_cost": "Fire",
+            **{column: "" for column in df.columns[4:]},
+        },
+    ]
+
+
+def test_flatten_cards_without_moves():
+    df = flatten_cards([{"id": "A1 001", "moves": []}, {"id": "A1 002"}])
+    assert list(df.columns) == ["id"]
+    assert len(df) == 2
+
+
+def test_map_distinct():
+    calls = []
+
+    def func(value):
+        calls.append(value)
+        return value.upper()
+
+    series = pd.Series(["a", "b", None, "a"], index=[3, 2, 1, 0])
+    mapped = map_distinct(series, func)
+
+    assert mapped.to_dict() == {3: "A", 2: "B", 1: "", 0: "A"}
+    assert calls == ["a", "b"]
+
+
+def test_clean_csv_matches_cleaned_csv():
+    cleaned = clean_csv(flatten_pokemon_data(json_convert.input_json_path))
+    with open(json_convert.cleaned_csv_path, encoding="utf-8") as f:
+        assert cleaned.to_csv(index=False) == f.read()
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps({"toolKey": "x", "cardArraySchema": {"cards": CARDS}}), encoding="utf-8")
+    return path
+
+
+def test_scan_card_schema(dump):
+    schema, num_cards = scan_card_schema(dump)
+
+    assert num_cards == 4
+    assert schema == CardSchema(["id"], ["name", "damage", "energy_cost"], 2)
+    assert schema.nested_columns() == list(flatten_cards(CARDS).columns[1:])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 10])
+def test_convert_json_streaming_matches_whole_dump(dump, tmp_path, chunk_size):
+    flattened, cleaned = tmp_path / "flattened.csv", tmp_path / "cleaned.csv"
+    cards = [
+        {
+            "id": card["id"],
+            "card_type": "Pokemon",
+            "pokemon_type": "Grass",
+            "ex": "ex" if i % 2 else "",
+            "hp": "70",
+            "evolution_stage": "Basic",
+            **card,
+        }
+        for i, card in enumerate(CARDS)
+    ]
+    dump.write_text(json.dumps({"cardArraySchema": {"cards": cards}}), encoding="utf-8")
+
+    assert convert_json_streaming(dump, flattened, cleaned, chunk_size=chunk_size) == 4
+
+    df = flatten_cards(cards)
+    assert flattened.read_text(encoding="utf-8") == df.to_csv(index=False)
+    assert cleaned.read_text(encoding="utf-8") == clean_csv(df).to_csv(index=False)
+
+
+def test_convert_json_streaming_without_cards(tmp_path):
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps({"cardArraySchema": {"cards": []}}), encoding="utf-8")
+
+    assert convert_json_streaming(dump, tmp_path / "f.csv", tmp_path / "c.csv") == 0
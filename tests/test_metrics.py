@@ -0,0 +1,105 @@
+import json
+import threading
+import pytest
+from tcg import metrics
+from tcg.io import extract_pack, iter_packs
+from tcg.metrics import RunMetrics
+from tests.server import PACK_EXT, FixtureServer
+
+NUM_CARDS = 5
+
+
+@pytest.fixture(autouse=True)
+def run_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class MissingDetailServer(FixtureServer):
+    """Serves the fixture pages, except the detail page of `A1 004` which is not found."""
+
+    def respond(self, path, headers):
+        if path.endswith("/476005"):
+            return 404, {}, b"Not Found"
+        return super().respond(path, headers)
+
+
+def test_time_counts_calls_seconds_and_errors():
+    run = RunMetrics()
+    with run.time("stage"):
+        pass
+    with pytest.raises(ValueError), run.time("stage"):
+        raise ValueError
+    run.count("stage", bytes=10)
+
+    counts = run.by_stage()["stage"]
+    assert counts["calls"] == 2
+    assert counts["errors"] == 1
+    assert counts["bytes"] == 10
+    assert counts["seconds"] >= 0
+
+
+def test_counts_are_recorded_under_current_pack():
+    run = RunMetrics()
+    run.count("stage", calls=1)
+    with metrics.pack("pack-a"):
+        run.count("stage", calls=2)
+
+        # Threads started without the context are not in the pack
+        thread = threading.Thread(target=run.count, args=("stage",), kwargs={"calls": 4})
+        thread.start()
+        thread.join()
+
+    assert run.snapshot() == {("stage", ""): {"calls": 5}, ("stage", "pack-a"): {"calls": 2}}
+    assert run.report()["packs"] == {"pack-a": {"stage": {"calls": 2}}}
+    assert run.report()["stages"] == {"stage": {"calls": 7}}
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_extract_pack_records_every_stage_per_pack(workers):
+    with MissingDetailServer() as server:
+        pack_url = server.url(PACK_EXT)
+        cards = extract_pack(pack_url, workers=workers)
+
+    pack = metrics.METRICS.report()["packs"][pack_url]
+    assert len(cards) == NUM_CARDS
+    assert pack["extract_pack"]["calls"] == 1
+    assert pack["fetch_html_table"]["calls"] == pack["parse_table"]["calls"] == 1
+    assert pack["extract_card"]["calls"] == NUM_CARDS
+    assert pack["extract_card"]["errors"] == 0
+    assert pack["extract_extra_card_details"]["calls"] == NUM_CARDS
+    assert pack["extract_extra_card_details"]["errors"] == 1
+    assert pack["download"]["requests"] == 1 + NUM_CARDS
+    assert pack["download"]["bytes"] > 0
+
+
+def test_pack_processes_send_back_their_metrics():
+    with FixtureServer() as server:
+        pack_url = server.url(PACK_EXT)
+        cards = list(iter_packs([pack_url], processes=2))
+
+    pack = metrics.METRICS.report()["packs"][pack_url]
+    assert len(cards) == NUM_CARDS
+    assert pack["extract_card"]["calls"] == NUM_CARDS
+    assert pack["download"]["requests"] == 1 + NUM_CARDS
+
+
+def test_save_json_and_prometheus(tmp_path):
+    run = RunMetrics()
+    with metrics.pack('pack "A1"'):
+        run.count("download", requests=3, bytes=2048)
+
+    run.save(tmp_path / "run.json")
+    run.save(tmp_path / "run.prom")
+
+    report = json.loads((tmp_path / "run.json").read_text(encoding="utf-8"))
+    assert report["stages"] == {"download": {"requests": 3, "bytes": 2048}}
+    assert (tmp_path / "run.prom").read_text(encoding="utf-8") == (
+        "# HELP tcg_stage_requests_total Number of HTTP requests sent.\n"
+        "# TYPE tcg_stage_requests_total counter\n"
+        'tcg_stage_requests_total{stage="download",pack="pack \\"A1\\""} 3\n'
+        "# HELP tcg_stage_bytes_total Number of bytes downloaded.\n"
+        "# TYPE tcg_stage_bytes_total counter\n"
+        'tcg_stage_bytes_total{stage="download",pack="pack \\"A1\\""} 2048\n'
+    )
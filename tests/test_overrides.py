@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+from tcg.card import Card
+from tcg.io import extract_pack, read_from_csv, write_to_csv
+from tcg.json_convert import CLEANED_COLUMNS
+from tcg.overrides import Overrides, get_overrides
+from tcg.parser import fix_cards
+from tcg.utils import COLUMNS, DEFAULT_EMPTY
+from tests.server import PACK_EXT
+
+OVERRIDES_CSV = """number,field,value,scope,note
+A1 001,HP,80,web,
+A1 001,weakness,,web,missing value
+A1 002,name,Ivysaur,web,
+Z9 999,name,Nobody,web,renumbered
+A1 001,hp,80,json,
+"""
+
+
+@pytest.fixture
+def overrides_file(tmp_path):
+    path = tmp_path / "overrides.csv"
+    path.write_text(OVERRIDES_CSV, encoding="utf-8")
+    return path
+
+
+def test_load_keeps_fixes_of_scope(overrides_file):
+    web = Overrides.load("web", overrides_file)
+    json = Overrides.load("json", overrides_file)
+
+    assert web.by_number == {
+        "A1 001": {"HP": "80", "weakness": DEFAULT_EMPTY},
+        "A1 002": {"name": "Ivysaur"},
+        "Z9 999": {"name": "Nobody"},
+    }
+    assert json.by_number == {"A1 001": {"hp": "80"}}
+    with pytest.raises(ValueError):
+        Overrides.load("html", overrides_file)
+
+
+def test_apply_fixes_card_and_records_matches(overrides_file):
+    overrides = Overrides.load("web", overrides_file)
+    card = Card.from_dict({"number": "A1 001", "HP": "70", "weakness": "Fire"})
+    other = Card.from_dict({"number": "A1 002", "name": "Ivysaur"})
+    untouched = Card.from_dict({"number": "A1 003", "name": "Venusaur"})
+
+    for c in [card, other, untouched]:
+        overrides.apply(c)
+
+    assert (card["HP"], card["weakness"]) == ("80", DEFAULT_EMPTY)
+    assert untouched["name"] == "Venusaur"
+    assert overrides.summary() == "Overrides: 2 applied, 1 already correct, 1 matched no card (<Z9 999> name)"
+
+
+def test_patch_fixes_stream_and_records_matches_at_end(overrides_file):
+    overrides = Overrides.load("web", overrides_file)
+    cards = [
+        Card.from_dict({"number": "A1 003", "name": "Venusaur"}),
+        Card.from_dict({"number": "A1 001", "HP": "70", "weakness": "Fire"}),
+        Card.from_dict({"number": "A1 002", "name": "Ivysaur"}),
+    ]
+
+    patched = overrides.patch(cards)
+    assert next(patched) is cards[0]
+    assert next(patched)["HP"] == "80"
+    assert overrides.matches == {}
+
+    assert list(patched) == cards[2:]
+    assert overrides.summary() == "Overrides: 2 applied, 1 already correct, 1 matched no card (<Z9 999> name)"
+
+
+def test_apply_frame_matches_apply(overrides_file):
+    overrides = Overrides.load("web", overrides_file)
+    df = pd.DataFrame(
+        {"number": ["A1 003", "A1 001", "A1 002"], "HP": ["60", "70", "90"], "name": ["C", "A", "B"]}
+    )
+
+    overrides.apply_frame(df, id_column="number")
+
+    assert df.to_dict("list") == {
+        "number": ["A1 003", "A1 001", "A1 002"],
+        "HP": ["60", "80", "90"],
+        "name": ["C", "A", "Ivysaur"],
+    }
+    # `weakness` is not a column, so its fix is not matched
+    assert overrides.matches == {("A1 001", "HP"): True, ("A1 002", "name"): True}
+
+
+def test_shipped_overrides_use_known_fields():
+    for scope, columns in [("web", COLUMNS), ("json", CLEANED_COLUMNS)]:
+        overrides = get_overrides(scope)
+        assert len(overrides) > 0
+        assert set(overrides.fixes["field"]) <= set(columns)
+        assert not overrides.fixes.duplicated(["number", "field"]).any()
+
+
+def test_fixes_apply_to_extracted_and_copied_cards(server, tmp_path):
+    # Dratini's page gives 70 damage for Ram, fixed to 40 by the shipped overrides
+    extracted = {card["number"]: card for card in extract_pack(server.url(PACK_EXT))}
+    assert extracted["A1 183"]["move1_damage"] == "70"
+
+    # An incremental or direct run copies the cards of the previous CSV
+    write_to_csv(list(extracted.values()), tmp_path / "full.csv")
+    copied = {card["number"]: card for card in read_from_csv(tmp_path / "full.csv")}
+
+    for card in fix_cards([extracted["A1 183"], copied["A1 183"]]):
+        assert card["move1_damage"] == "40"
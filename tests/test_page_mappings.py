@@ -0,0 +1,114 @@
+import json
+from tcg.page_mappings import PageMappings, ProbeJournal
+
+PAGE_MAPPINGS_PATH = "data/page_mappings.json"
+
+
+def test_round_trip_keeps_json_layout(tmp_path):
+    page_mappings = PageMappings.load(PAGE_MAPPINGS_PATH)
+    page_mappings.save(tmp_path / "page_mappings.json")
+
+    with open(PAGE_MAPPINGS_PATH) as f, open(tmp_path / "page_mappings.json") as g:
+        assert f.read() == g.read()
+
+
+def test_lookups():
+    page_mappings = PageMappings.from_dict(
+        {
+            "GOOD_EXTS": {"A1 001": 476002},
+            "WRONG_EXTS": {"475019": "Best Device to Play Pokemon TCG Pocket on"},
+            "BAD_EXTS": [475000],
+        }
+    )
+
+    assert page_mappings.category(476002) == "GOOD_EXTS"
+    assert page_mappings.category(475019) == "WRONG_EXTS"
+    assert page_mappings.category(475000) == "BAD_EXTS"
+    assert page_mappings.category(123456) is None
+    assert page_mappings.card_for_ext(476002) == "A1 001"
+    assert page_mappings.ext_for_card("A1 001") == 476002
+    assert 475000 in page_mappings and 123456 not in page_mappings
+    assert len(page_mappings) == 3
+
+
+def test_add_good_replaces_previous_page_of_card():
+    page_mappings = PageMappings(good_exts={"A1 001": 476002})
+    page_mappings.add_good("A1 001", 476999)
+
+    assert page_mappings.ext_for_card("A1 001") == 476999
+    assert page_mappings.card_for_ext(476999) == "A1 001"
+    assert page_mappings.card_for_ext(476002) is None
+
+
+def test_to_dict_is_sorted():
+    page_mappings = PageMappings(
+        good_exts={"A2 010": 3, "A1 100": 2, "A1 020": 1},
+        wrong_exts={20: "b", 10: "a"},
+        bad_exts=[5, 1, 3],
+    )
+
+    assert json.dumps(page_mappings.to_dict()) == json.dumps(
+        {
+            "GOOD_EXTS": {"A1 020": 1, "A1 100": 2, "A2 010": 3},
+            "WRONG_EXTS": {"10": "a", "20": "b"},
+            "BAD_EXTS": [1, 3, 5],
+        }
+    )
+
+
+def test_journal_survives_crash_and_replays(tmp_path):
+    journal_path = tmp_path / "page_mappings.journal.jsonl"
+    page_mappings = PageMappings()
+    page_mappings.journal = ProbeJournal(journal_path, sync_every=1000)
+    page_mappings.add_good("A1 001", 476002)
+    page_mappings.add_wrong(482685, "All Cards List")
+    page_mappings.add_bad(999999)
+
+    # Simulate a crash: nothing was compacted and the last line was cut mid-write
+    with open(journal_path, "a") as f:
+        f.write('{"category": "BAD_')
+
+    restarted = PageMappings()
+    assert restarted.replay(journal_path) == 3
+    assert restarted.to_dict() == page_mappings.to_dict()
+    page_mappings.journal.close()
+
+    # Resuming after the crash appends after the last complete line
+    with ProbeJournal(journal_path) as journal:
+        restarted.journal = journal
+        restarted.add_bad(999998)
+
+    resumed = PageMappings()
+    assert resumed.replay(journal_path) == 4
+    assert resumed.to_dict() == restarted.to_dict()
+
+
+def test_compact_folds_journal_into_json(tmp_path):
+    json_path = tmp_path / "page_mappings.json"
+    journal_path = tmp_path / "page_mappings.journal.jsonl"
+    PageMappings(good_exts={"A1 001": 476002}).save(json_path)
+
+    page_mappings = PageMappings.load(json_path)
+    with ProbeJournal(journal_path) as journal:
+        page_mappings.journal = journal
+        page_mappings.add_good("A1 002", 476003)
+        page_mappings.compact(json_path, journal_path)
+
+    assert journal_path.read_text() == ""
+    assert PageMappings.load(json_path).to_dict() == page_mappings.to_dict()
+
+    # Replaying an already compacted journal changes nothing
+    reloaded = PageMappings.load(json_path)
+    assert reloaded.replay(journal_path) == 0
+    assert reloaded.to_dict() == page_mappings.to_dict()
+
+
+def test_journal_is_not_written_while_loading(tmp_path):
+    journal_path = tmp_path / "page_mappings.journal.jsonl"
+    page_mappings = PageMappings.load(PAGE_MAPPINGS_PATH)
+    with ProbeJournal(journal_path) as journal:
+        page_mappings.journal = journal
+        page_mappings.replay(journal_path)
+        page_mappings.add_bad(1)
+
+    assert len(journal_path.read_text().splitlines()) == 1
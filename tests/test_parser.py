@@ -1,3 +1,4 @@
+from functools import cache
 from bs4 import BeautifulSoup
 from tests.debug import debug_card_extract
 from tcg.io import fetch_html_table, get_pack_names_and_urls
@@ -5,10 +6,15 @@ from tcg.parser import extract_card
 from tcg.parser import DEFAULT_EMPTY
 
 
-PACK_NAMES_URLS = get_pack_names_and_urls()
-PACK_NAMES_HTML = {
-    key_id: fetch_html_table(url, page_type="pack") for key_id, url in PACK_NAMES_URLS.items()
-}
+@cache
+def pack_urls() -> dict[str, str]:
+    return get_pack_names_and_urls()
+
+
+@cache
+def pack_table(pack_id: str):
+    """Returns the table of cards of the pack `pack_id`, fetched the first time a test needs it."""
+    return fetch_html_table(pack_urls()[pack_id], page_type="pack")
 
 
 def test_extract_card_raw_from_html():
@@ -158,7 +164,7 @@ def test_extract_card_pokemon_A1():
         "url",
     }
 
-    card = debug_card_extract("A1 001", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 001", html=pack_table("A1"))
 
     assert set(card.keys()) == expected_keys
     assert card["number"] == "A1 001"
@@ -190,7 +196,7 @@ def test_extract_card_pokemon_A1():
 
 def test_extract_card_pokemon_A1a():
     """Testing `A1a 001` (Exeggcute)"""
-    card = debug_card_extract("A1a 001", html=PACK_NAMES_HTML["A1a"])
+    card = debug_card_extract("A1a 001", html=pack_table("A1a"))
 
     assert card["number"] == "A1a 001"
     assert card["name"] == "Exeggcute"
@@ -224,7 +230,7 @@ def test_extract_card_pokemon_A1a():
 
 def test_extract_card_pokemon_A2():
     """Testing `A2 001` (Oddish)"""
-    card = debug_card_extract("A2 001", html=PACK_NAMES_HTML["A2"])
+    card = debug_card_extract("A2 001", html=pack_table("A2"))
 
     assert card["number"] == "A2 001"
     assert card["name"] == "Oddish"
@@ -255,7 +261,7 @@ def test_extract_card_pokemon_A2():
 
 def test_extract_card_pokemon_A2a():
     """Testing `A2a 001` (Heracross)"""
-    card = debug_card_extract("A2a 001", html=PACK_NAMES_HTML["A2a"])
+    card = debug_card_extract("A2a 001", html=pack_table("A2a"))
 
     assert card["number"] == "A2a 001"
     assert card["name"] == "Heracross"
@@ -286,7 +292,7 @@ def test_extract_card_pokemon_A2a():
 
 def test_extract_card_pokemon_A2b():
     """Testing `A2b 001` (Weedle)"""
-    card = debug_card_extract("A2b 001", html=PACK_NAMES_HTML["A2b"])
+    card = debug_card_extract("A2b 001", html=pack_table("A2b"))
 
     assert card["number"] == "A2b 001"
     assert card["name"] == "Weedle"
@@ -317,7 +323,7 @@ def test_extract_card_pokemon_A2b():
 
 def test_extract_card_pokemon_A3():
     """Testing `A3 001` (Exeggcute)"""
-    card = debug_card_extract("A3 001", html=PACK_NAMES_HTML["A3"])
+    card = debug_card_extract("A3 001", html=pack_table("A3"))
 
     assert card["number"] == "A3 001"
     assert card["name"] == "Exeggcute"
@@ -348,7 +354,7 @@ def test_extract_card_pokemon_A3():
 
 def test_extract_card_pokemon_A3a():
     """Testing `A3a 001` (Petilil)"""
-    card = debug_card_extract("A3a 001", html=PACK_NAMES_HTML["A3a"])
+    card = debug_card_extract("A3a 001", html=pack_table("A3a"))
 
     assert card["number"] == "A3a 001"
     assert card["name"] == "Petilil"
@@ -379,7 +385,7 @@ def test_extract_card_pokemon_A3a():
 
 def test_extract_card_pokemon_A3b():
     """Testing `A3b 001` (Tropius)"""
-    card = debug_card_extract("A3b 001", html=PACK_NAMES_HTML["A3a"])
+    card = debug_card_extract("A3b 001", html=pack_table("A3a"))
 
     assert card["number"] == "A3b 001"
     assert card["name"] == "Tropius"
@@ -410,7 +416,7 @@ def test_extract_card_pokemon_A3b():
 
 def test_extract_card_pokemon_A4():
     """Testing `A4 001` (Oddish)"""
-    card = debug_card_extract("A4 001", html=PACK_NAMES_HTML["A4"])
+    card = debug_card_extract("A4 001", html=pack_table("A4"))
 
     assert card["number"] == "A4 001"
     assert card["name"] == "Oddish"
@@ -441,7 +447,7 @@ def test_extract_card_pokemon_A4():
 
 def test_extract_card_pokemon_A4a():
     """Testing `A4a 001` (Hoppip)"""
-    card = debug_card_extract("A4a 001", html=PACK_NAMES_HTML["A4a"])
+    card = debug_card_extract("A4a 001", html=pack_table("A4a"))
 
     assert card["number"] == "A4a 001"
     assert card["name"] == "Hoppip"
@@ -472,7 +478,7 @@ def test_extract_card_pokemon_A4a():
 
 def test_extract_card_pokemon_two_attacks():
     """Testing `A1 004` (Venusaur ex)"""
-    card = debug_card_extract("A1 004", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 004", html=pack_table("A1"))
 
     assert card["number"] == "A1 004"
     assert card["name"] == "Venusaur ex"
@@ -503,7 +509,7 @@ def test_extract_card_pokemon_two_attacks():
 
 def test_extract_card_pokemon_move_desc_no_dmg():
     """Testing `A1 047` (Moltres ex)"""
-    card = debug_card_extract("A1 047", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 047", html=pack_table("A1"))
 
     assert card["number"] == "A1 047"
     assert card["name"] == "Moltres ex"
@@ -537,7 +543,7 @@ def test_extract_card_pokemon_move_desc_no_dmg():
 
 def test_extract_card_pokemon_dynamic_dmg():
     """Testing `A1 026` (Pinsir)"""
-    card = debug_card_extract("A1 026", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 026", html=pack_table("A1"))
 
     assert card["number"] == "A1 026"
     assert card["name"] == "Pinsir"
@@ -568,7 +574,7 @@ def test_extract_card_pokemon_dynamic_dmg():
 
 def test_extract_card_pokemon_ability():
     """Testing `A1 007` (Butterfree)"""
-    card = debug_card_extract("A1 007", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 007", html=pack_table("A1"))
 
     assert card["number"] == "A1 007"
     assert card["name"] == "Butterfree"
@@ -602,7 +608,7 @@ def test_extract_card_pokemon_ability():
 
 def test_extract_card_pokemon_dragon_weakness():
     """Testing `A1 183` (Dratini)"""
-    card = debug_card_extract("A1 183", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 183", html=pack_table("A1"))
 
     assert card["number"] == "A1 183"
     assert card["name"] == "Dratini"
@@ -633,7 +639,7 @@ def test_extract_card_pokemon_dragon_weakness():
 
 def test_extract_card_pokemon_ultra_beast():
     """Testing `A3a 006` (Buzzwole ex)"""
-    card = debug_card_extract("A3a 006", html=PACK_NAMES_HTML["A3a"])
+    card = debug_card_extract("A3a 006", html=pack_table("A3a"))
 
     assert card["number"] == "A3a 006"
     assert card["name"] == "Buzzwole ex"
@@ -664,7 +670,7 @@ def test_extract_card_pokemon_ultra_beast():
 
 def test_extract_card_fossil():
     """Testing `A1 216` (Helix Fossil)"""
-    card = debug_card_extract("A1 216", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 216", html=pack_table("A1"))
 
     assert card["number"] == "A1 216"
     assert card["name"] == "Helix Fossil"
@@ -698,7 +704,7 @@ def test_extract_card_fossil():
 
 def test_extract_card_supporter():
     """Testing `A1 219` (Erika)"""
-    card = debug_card_extract("A1 219", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 219", html=pack_table("A1"))
 
     assert card["number"] == "A1 219"
     assert card["name"] == "Erika"
@@ -729,7 +735,7 @@ def test_extract_card_supporter():
 
 def test_extract_card_full_art_supporter():
     """Testing `A1 269` (Full Art Koga)"""
-    card = debug_card_extract("A1 269", html=PACK_NAMES_HTML["A1"])
+    card = debug_card_extract("A1 269", html=pack_table("A1"))
 
     assert card["number"] == "A1 269"
     assert card["name"] == "Koga"
@@ -760,7 +766,7 @@ def test_extract_card_full_art_supporter():
 
 def test_extract_card_tool():
     """Testing `A3 146` (Poison Barb)"""
-    card = debug_card_extract("A3 146", html=PACK_NAMES_HTML["A3"])
+    card = debug_card_extract("A3 146", html=pack_table("A3"))
 
     assert card["number"] == "A3 146"
     assert card["name"] == "Poison Barb"
@@ -794,7 +800,7 @@ def test_extract_card_tool():
 
 def test_extract_card_promo_item():
     """Testing `P-A 005` (Poke Ball)"""
-    card = debug_card_extract("P-A 005", html=PACK_NAMES_HTML["P-A"])
+    card = debug_card_extract("P-A 005", html=pack_table("P-A"))
 
     assert card["number"] == "P-A 005"
     assert card["name"] == "Poke Ball"
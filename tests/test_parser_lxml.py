@@ -0,0 +1,92 @@
+import lxml.html
+import pytest
+from bs4 import BeautifulSoup
+from tcg import io, parser, parser_lxml
+from tcg.io import extract_pack
+from tcg.utils import DEFAULT_EMPTY
+from tests.server import MAIN_EXT, PACK_EXT, PAGES_DIR
+
+# Row variants not found in the fixture pack page
+EDGE_CASE_CELL9 = {
+    "ultra_beast": """
+        <td class="left"> <b>Stage</b>: Basic <br>
+        <div class="align"> <b>Retreat Cost</b>: <img data-src="x.png"></div>
+        <div class="align"> <b>Ultra Beast</b> </div>
+        <div class="align"> <b>Beast Punch</b> <img alt="Fighting 2"> </div>
+        50x <!-- a comment --> Flip a coin. <br>
+        </td>""",
+    "ability_only": """
+        <td class="left"> <b>Stage</b>: Stage 1 <br>
+        <span>[Ability]</span> <!-- hidden --> Sturdy <br> Cannot be knocked out. <br>
+        </td>""",
+    "attack_without_text": """
+        <td class="left"> <b>Stage</b>: Basic <br>
+        <div class="align"> <b>Splash</b> <img alt="Colorless"> </div>
+        </td>""",
+    "trainer_with_dash": """
+        <td class="left"> - Item Draw a card. </td>""",
+}
+
+
+@pytest.fixture
+def use_parser():
+    yield io.set_parser
+    io.set_parser("bs4")
+
+
+def test_lxml_extract_pack_matches_bs4(server, use_parser):
+    bs4_data = extract_pack(server.url(PACK_EXT))
+    use_parser("lxml")
+    lxml_data = extract_pack(server.url(PACK_EXT), workers=3)
+
+    assert len(bs4_data) == 5
+    assert lxml_data == bs4_data
+
+
+def test_lxml_rows_match_bs4_rows():
+    page_html = (PAGES_DIR / f"{PACK_EXT}.html").read_text()
+    soup = BeautifulSoup(page_html, "lxml")
+    bs4_rows = soup.find("table", class_="flexible-cell").find("tbody").find_all("tr")
+    lxml_rows = parser_lxml.find_card_rows(page_html)
+
+    assert [io.row_number(row) for row in lxml_rows] == [io.row_number(row) for row in bs4_rows]
+    for bs4_row, lxml_row in zip(bs4_rows, lxml_rows):
+        is_trainer = io.row_number(bs4_row) == "A1 219"
+        bs4_cells, lxml_cells = bs4_row.find_all("td"), lxml_row.findall("td")
+        assert parser_lxml.extract_cell9(lxml_cells[9], is_trainer) == parser.extract_cell9(
+            bs4_cells[9], is_trainer
+        )
+
+
+@pytest.mark.parametrize("case", sorted(EDGE_CASE_CELL9))
+def test_lxml_cell9_edge_cases_match_bs4(case):
+    html = f"<table><tr>{EDGE_CASE_CELL9[case]}</tr></table>"
+    is_trainer = case.startswith("trainer")
+    bs4_cell = BeautifulSoup(html, "lxml").find("td")
+    lxml_cell = lxml.html.fromstring(html).find(".//td")
+
+    assert parser_lxml.extract_cell9(lxml_cell, is_trainer) == parser.extract_cell9(
+        bs4_cell, is_trainer
+    )
+
+
+@pytest.mark.parametrize(
+    "texts, expected",
+    [
+        ([], (DEFAULT_EMPTY, DEFAULT_EMPTY)),
+        (["50x"], ("50x", DEFAULT_EMPTY)),
+        (["30+", "Flip a coin."], ("30+", "Flip a coin.")),
+        (["Heal 30 damage."], (DEFAULT_EMPTY, "Heal 30 damage.")),
+    ],
+)
+def test_split_damage_effect(texts, expected):
+    assert parser.split_damage_effect(texts) == expected
+
+
+def test_find_card_rows_without_card_table():
+    assert parser_lxml.find_card_rows((PAGES_DIR / f"{MAIN_EXT}.html").read_text()) == []
+
+
+def test_set_parser_rejects_unknown_parser():
+    with pytest.raises(ValueError):
+        io.set_parser("html5lib")
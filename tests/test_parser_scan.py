@@ -0,0 +1,97 @@
+import pytest
+import tcg.parser
+from tcg import metrics
+from tcg.parser import extract_extra_card_details, parse_card_details
+from tcg.parser_scan import find_details_table, scan_card_details
+from tcg.utils import DEFAULT_EMPTY
+from tests.server import DETAIL_EXTS, PAGES_DIR, FixtureServer
+
+
+def detail_page(ext: str) -> str:
+    return (PAGES_DIR / f"{ext}.html").read_text(encoding="utf-8")
+
+
+def details_table(rows: list[str], classes: str = "a-table table--fixed a-table") -> str:
+    return f'<html><body><table class="{classes}">' + "".join(rows) + "</table></body></html>"
+
+
+ROWS = [f"<tr><th>Row {i}</th><td>Value {i}</td></tr>" for i in range(10)]
+ROWS[5] = "<tr><th>Generation</th><td colspan='2'>Gen <b>4</b></td></tr>"
+ROWS[7] = "<tr><th>Illustrator</th><td>Ken &amp; Sugimori</td></tr>"
+ROWS[9] = '<tr><td>-</td><td>-</td><td><a href="#"><img alt="Water"></a></td></tr>'
+
+
+@pytest.mark.parametrize("is_trainer", [False, True])
+@pytest.mark.parametrize("ext", DETAIL_EXTS)
+def test_scan_matches_full_parse(ext, is_trainer):
+    page_html = detail_page(ext)
+    assert scan_card_details(page_html, is_trainer) == parse_card_details(page_html, is_trainer)
+
+
+@pytest.mark.parametrize("ext", DETAIL_EXTS)
+def test_scan_matches_full_parse_without_end_tags(ext):
+    page_html = detail_page(ext).replace("</td>", "").replace("</tr>", "").replace("</th>", "")
+    assert scan_card_details(page_html, False) == parse_card_details(page_html, False)
+
+
+@pytest.mark.parametrize(
+    "page_html",
+    [
+        details_table(ROWS),
+        details_table(ROWS, classes="table--fixed a-table"),
+        # A decoy table in a comment, and another table before the details table
+        '<!-- <table class="a-table table--fixed"><tr><td>x</td></tr></table> -->'
+        '<table class="a-table"><tr><td>Deck</td></tr></table>' + details_table(ROWS),
+        # A nested table adds rows, like `find_all("tr")`
+        details_table(ROWS[:2] + ["<tr><td><table><tr><td>nested</td></tr></table></td></tr>"] + ROWS[4:]),
+        # Weakness cells without a link or without an image
+        details_table(ROWS[:9] + ["<tr><td>-</td><td>-</td><td>None</td></tr>"]),
+        details_table(ROWS[:9] + ['<tr><td>-</td><td>-</td><td><a href="#">x</a><img alt="Fire"></td></tr>']),
+    ],
+)
+def test_scan_matches_full_parse_on_edge_cases(page_html):
+    assert scan_card_details(page_html, False) == parse_card_details(page_html, False)
+
+
+def test_scan_reads_fields():
+    details = scan_card_details(details_table(ROWS), False)
+    assert details == {"generation": "4", "illustrator": "Ken & Sugimori", "weakness": "Water"}
+
+
+def test_scan_stops_after_last_row():
+    # Markup after the rows read is never scanned
+    broken_tail = "<tr><td><a><img alt='x'" * 1000
+    assert scan_card_details(details_table(ROWS + [broken_tail]), False)["weakness"] == "Water"
+    assert scan_card_details(details_table(ROWS[:8] + [broken_tail]), True)["weakness"] == DEFAULT_EMPTY
+
+
+@pytest.mark.parametrize(
+    "page_html",
+    [
+        "<html><body><p>No table</p></body></html>",
+        details_table(ROWS[:9]),
+        details_table(ROWS[:9] + ["<tr><td>-</td></tr>"]),
+        details_table(ROWS[:5] + ["<tr><th>Generation</th></tr>"] + ROWS[6:]),
+    ],
+)
+def test_scan_gives_up_on_unexpected_layout(page_html):
+    assert scan_card_details(page_html, False) is None
+
+
+def test_find_details_table():
+    page_html = detail_page("476002")
+    assert page_html[find_details_table(page_html) :].startswith('<table class="a-table table--fixed a-table">')
+
+
+def test_extract_extra_card_details_falls_back_to_full_parse(monkeypatch):
+    metrics.reset()
+    with FixtureServer() as server:
+        scanned = extract_extra_card_details(server.url("476002"), is_trainer=False)
+        assert metrics.METRICS.by_stage()["parse_details"].get("full_parses", 0) == 0
+
+        monkeypatch.setattr(tcg.parser, "scan_card_details", lambda page_html, is_trainer: None)
+        parsed = extract_extra_card_details(server.url("476002"), is_trainer=False)
+        forced = extract_extra_card_details(server.url("476002"), is_trainer=False, full_parse=True)
+
+    assert scanned == parsed == forced == {"generation": "1", "illustrator": "Narumi Sato", "weakness": "Fire"}
+    assert metrics.METRICS.by_stage()["parse_details"]["full_parses"] == 2
@@ -0,0 +1,67 @@
+import argparse
+import pstats
+import re
+import time
+import tracemalloc
+from tcg import profiling, utils
+from tcg.io import map_rows
+from tcg.profiling import allocation_summary, cpu_profile, sampled_profile
+
+
+def busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def parse_args(*argv: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    profiling.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_cpu_profile_includes_worker_threads(tmp_path):
+    with cpu_profile(tmp_path / "run.pstats"):
+        map_rows(utils.clean_str, [" a ", " b ", " c "], workers=3)
+
+    stats = pstats.Stats(str(tmp_path / "run.pstats")).stats
+    calls = sum(stat[1] for (filename, _, name), stat in stats.items() if name == "clean_str")
+    assert calls == 3
+
+
+def test_sampled_profile_writes_folded_stacks(tmp_path):
+    with sampled_profile(tmp_path / "run.folded", interval=0.001):
+        busy(0.1)
+
+    lines = (tmp_path / "run.folded").read_text(encoding="utf-8").splitlines()
+    assert all(re.fullmatch(r".+ \d+", line) for line in lines)
+    assert any("busy (tests/test_profiling.py:" in line for line in lines)
+
+
+def test_allocation_summary_attributes_memory_to_module_lines():
+    tracemalloc.start(profiling.MEMORY_FRAMES)
+    try:
+        strings = [utils.clean_str(f" card {i} " * 20) for i in range(2000)]
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    summary = allocation_summary(snapshot, top=1, modules=("tcg.utils", "tcg.io"))
+    lines = summary.splitlines()
+    assert len(strings) == 2000
+    assert lines[0].startswith("tcg.utils: ")
+    assert 'output = " ".join(string.strip().split())' in lines[1]
+    assert lines[2] == "tcg.io: 0.00 MB"
+
+
+def test_from_args_runs_requested_profilers(tmp_path, capsys):
+    args = parse_args("--profile", str(tmp_path / "run.pstats"), "--profile-memory", "2")
+    with profiling.from_args(args):
+        busy(0.01)
+
+    assert (tmp_path / "run.pstats").exists()
+    assert "tcg.parser:" in capsys.readouterr().out
+    assert not tracemalloc.is_tracing()
+
+    with profiling.from_args(parse_args()):
+        pass
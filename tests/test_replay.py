@@ -0,0 +1,115 @@
+import csv
+import time
+import pytest
+from tcg import web
+from tcg.io import fetch_html_table, get_pack_names_and_urls
+from tcg.parser import extract_card
+from tests import build_archive, replay
+from tests.replay import FixtureArchive, NotRecorded
+from tests.server import FixtureServer
+
+
+@pytest.fixture
+def game8(monkeypatch):
+    """Restores the replay mode of the test session after `replay.install`."""
+    monkeypatch.setattr(replay, "MODE", replay.MODE)
+    monkeypatch.setattr(replay, "ARCHIVE", replay.ARCHIVE)
+
+
+def test_recorded_responses_are_replayed_offline(game8, tmp_path):
+    archive_file = tmp_path / "game8.json.gz"
+    with FixtureServer() as server:
+        client = web.HttpClient()
+        replay.install("record", archive_file, client=client, prefix=server.base)
+        recorded = client.get(server.url("476002"))
+        missing = client.get(server.url("999999"))
+        replay.save(archive_file)
+
+    client = web.HttpClient(max_retries=0)
+    replay.install("replay", archive_file, client=client, prefix=server.base)
+    replayed = client.get(server.url("476002") + "#section")
+
+    assert replayed.status_code == 200
+    assert replayed.text == recorded.text
+    assert replayed.headers["ETag"] == recorded.headers["ETag"]
+    assert replayed.encoding == "utf-8"
+    assert client.get(server.url("999999")).status_code == missing.status_code == 404
+
+
+def test_recording_keeps_earlier_responses(game8, tmp_path):
+    archive_file = tmp_path / "game8.json.gz"
+    with FixtureServer() as server:
+        for ext in ["476002", "476005"]:
+            client = web.HttpClient()
+            replay.install("record", archive_file, client=client, prefix=server.base)
+            client.get(server.url(ext))
+            replay.save(archive_file)
+
+        assert set(FixtureArchive.load(archive_file).responses) == {server.url("476002"), server.url("476005")}
+
+
+def test_unrecorded_request_fails_without_retries(game8, tmp_path):
+    FixtureArchive().save(tmp_path / "empty.json.gz")
+    client = web.HttpClient(backoff=10)
+    replay.install("replay", tmp_path / "empty.json.gz", client=client, prefix="https://game8.co/")
+
+    start = time.perf_counter()
+    with pytest.raises(NotRecorded, match="476002"):
+        client.get("https://game8.co/games/Pokemon-TCG-Pocket/archives/476002")
+    assert time.perf_counter() - start < 1
+
+
+def test_replay_without_archive_never_downloads(game8, tmp_path):
+    with FixtureServer() as server:
+        client = web.HttpClient(max_retries=0)
+        replay.install("replay", tmp_path / "missing.json.gz", client=client, prefix=server.base)
+
+        with pytest.raises(NotRecorded):
+            client.get(server.url("476002"))
+        assert replay.MODE == "replay"
+        assert server.requests == []
+
+
+@pytest.mark.parametrize("status", [304, 503])
+def test_transient_and_empty_responses_are_not_recorded(status):
+    class Response:
+        status_code = status
+        content = b""
+        headers = {}
+
+    archive = FixtureArchive()
+    archive.add("https://game8.co/", Response())
+    assert len(archive) == 0
+
+
+def test_binary_body_round_trip(tmp_path):
+    class Response:
+        status_code = 200
+        content = b"\x89PNG\xff\x00"
+        headers = {"Content-Type": "image/png", "Set-Cookie": "x"}
+
+    archive = FixtureArchive()
+    archive.add("https://game8.co/image.png", Response())
+    archive.save(tmp_path / "game8.json.gz")
+
+    class Request:
+        url = "https://game8.co/image.png"
+
+    response = FixtureArchive.load(tmp_path / "game8.json.gz").response(Request())
+    assert response.content == b"\x89PNG\xff\x00"
+    assert dict(response.headers) == {"Content-Type": "image/png"}
+
+
+@pytest.mark.parametrize("number", ["A2 001", "A1 219", "A3a 007"])
+def test_built_archive_round_trip(game8, tmp_path, number):
+    with open(build_archive.FULL_CSV, encoding="utf-8", newline="") as f:
+        row = next(row for row in csv.DictReader(f) if row["number"] == number)
+    build_archive.build_archive([row]).save(tmp_path / "game8.json.gz")
+    client = web.HttpClient(max_retries=0)
+    replay.install("replay", tmp_path / "game8.json.gz", client=client)
+    web.set_client(client)
+
+    table = fetch_html_table(get_pack_names_and_urls()[number.split(" ")[0]], page_type="pack")
+    card = extract_card(table.find("tbody").find("tr"))
+
+    assert {key: card[key] or "" for key in row} == row
@@ -0,0 +1,69 @@
+import pytest
+from tcg.io import read_from_csv
+from tcg.store import CardStore, csv_to_store, write_store
+
+FULL_CSV = "data/full.csv"
+
+
+@pytest.fixture(scope="module")
+def cards():
+    return read_from_csv(FULL_CSV)
+
+
+@pytest.fixture(scope="module")
+def store(cards, tmp_path_factory):
+    store_file = tmp_path_factory.mktemp("store") / "full.cards"
+    csv_to_store(FULL_CSV, store_file)
+    with CardStore(store_file) as store:
+        yield store
+
+
+def test_store_round_trips_every_card(store, cards):
+    assert len(store) == len(cards)
+    assert [store.card(row) for row in range(len(store))] == cards
+
+
+def test_get_by_number(store, cards):
+    assert all(store.get(card["number"]) == card for card in cards[::50])
+    assert store.get("A1 001")["name"] == "Bulbasaur"
+    assert store.get("Z9 999") is None
+    # Existing strings that are not card numbers
+    assert store.get("Bulbasaur") is None
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"pack": "A1"},
+        {"pack": "P-A", "type": "Psychic"},
+        {"rarity": "◇◇", "hp_min": 100},
+        {"type": "Fire", "hp_min": 60, "hp_max": 90},
+        {"type": "Supporter"},
+        {"type": "Not a type"},
+    ],
+)
+def test_query_matches_filtering_the_csv(store, cards, filters):
+    def matches(card):
+        hp = int(card["HP"]) if card["HP"] is not None else None
+        return (
+            card["number"].split(" ")[0] == filters.get("pack", card["number"].split(" ")[0])
+            and card["type"] == filters.get("type", card["type"])
+            and card["rarity"] == filters.get("rarity", card["rarity"])
+            and ("hp_min" not in filters or (hp is not None and hp >= filters["hp_min"]))
+            and ("hp_max" not in filters or (hp is not None and hp <= filters["hp_max"]))
+        )
+
+    assert store.query(**filters) == [card for card in cards if matches(card)]
+
+
+def test_write_store_rejects_non_integer_hp(cards, tmp_path):
+    with pytest.raises(ValueError):
+        write_store([cards[0] | {"HP": "70+"}], tmp_path / "bad.cards")
+
+
+def test_open_rejects_other_files(tmp_path):
+    other_file = tmp_path / "full.csv"
+    other_file.write_text("number,name\n" * 10)
+
+    with pytest.raises(ValueError):
+        CardStore(other_file)
@@ -0,0 +1,129 @@
+import copy
+import hashlib
+import json
+import pytest
+import tcg.sync
+from tcg.json_convert import clean_csv, flatten_cards, input_json_path
+from tcg.sync import load_sync_state, sync_structural_mappings
+from tests.server import FixtureServer
+
+with open(input_json_path, "r", encoding="utf-8") as f:
+    RAW_JSON = json.load(f)
+RAW_JSON["cardArraySchema"]["cards"] = RAW_JSON["cardArraySchema"]["cards"][:40]
+
+
+class MappingsServer(FixtureServer):
+    """Stand-in for the structural mappings endpoint serving `dump` as JSON."""
+
+    def __init__(self, etag: bool = True):
+        super().__init__()
+        self.dump = copy.deepcopy(RAW_JSON)
+        self.etag = etag
+
+    def respond(self, path, headers):
+        body = json.dumps(self.dump, ensure_ascii=False).encode("utf-8")
+        response_headers = {"Content-Type": "application/json"}
+        if self.etag:
+            response_headers["ETag"] = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            if headers.get("If-None-Match") == response_headers["ETag"]:
+                return 304, response_headers, b""
+        return 200, response_headers, body
+
+
+@pytest.fixture
+def sync(tmp_path):
+    def sync(server, updated_at=1):
+        return sync_structural_mappings(
+            state_file=tmp_path / "state.json",
+            snapshot_file=tmp_path / "RAWJSON.json",
+            flattened_path=tmp_path / "flattened.csv",
+            cleaned_path=tmp_path / "cleaned.csv",
+            updated_at=updated_at,
+            url=f"{server.base}/api/tool_structural_mappings/551.json",
+        )
+
+    return sync
+
+
+@pytest.fixture
+def flattened(monkeypatch):
+    """Records the IDs of the cards passed to `flatten_cards`."""
+    ids = []
+
+    def recording_flatten_cards(cards, *args, **kwargs):
+        ids.extend(card["id"] for card in cards)
+        return flatten_cards(cards, *args, **kwargs)
+
+    monkeypatch.setattr(tcg.sync, "flatten_cards", recording_flatten_cards)
+    return ids
+
+
+def assert_csvs_match(tmp_path, dump):
+    df = flatten_cards(dump["cardArraySchema"]["cards"])
+    assert (tmp_path / "flattened.csv").read_text(encoding="utf-8") == df.to_csv(index=False)
+    assert (tmp_path / "cleaned.csv").read_text(encoding="utf-8") == clean_csv(df).to_csv(index=False)
+
+
+def test_first_sync_converts_every_card(sync, tmp_path):
+    with MappingsServer() as server:
+        changes = sync(server, updated_at=123)
+
+    assert len(changes["added"]) == 40
+    assert changes["changed"] == changes["removed"] == []
+    assert_csvs_match(tmp_path, server.dump)
+    assert json.loads((tmp_path / "RAWJSON.json").read_text(encoding="utf-8")) == server.dump
+
+    state = load_sync_state(tmp_path / "state.json")
+    assert state["updated_at"] == 123
+    assert len(state["cards"]) == 40
+    assert server.requests == ["/api/tool_structural_mappings/551.json?updatedAt=123"]
+
+
+@pytest.mark.parametrize("etag", [True, False])
+def test_unchanged_sync_does_nothing(sync, tmp_path, flattened, etag):
+    with MappingsServer(etag=etag) as server:
+        sync(server)
+        flattened.clear()
+        cleaned = (tmp_path / "cleaned.csv").stat().st_mtime_ns
+
+        assert sync(server, updated_at=2) is None
+
+    assert server.statuses == ([200, 304] if etag else [200, 200])
+    assert flattened == []
+    assert (tmp_path / "cleaned.csv").stat().st_mtime_ns == cleaned
+    assert load_sync_state(tmp_path / "state.json")["updated_at"] == 1
+
+
+def test_sync_only_converts_added_and_changed_cards(sync, tmp_path, flattened):
+    with MappingsServer() as server:
+        sync(server)
+        flattened.clear()
+
+        cards = server.dump["cardArraySchema"]["cards"]
+        cards[3]["hp"] = "999"
+        cards[10]["moves"][0]["energy_cost"] = "Fire 2:Colorless"
+        removed = cards.pop(20)
+        cards.insert(5, {**cards[0], "id": "Z1 001", "name": "New card"})
+        changes = sync(server, updated_at=2)
+
+    assert changes == {
+        "added": ["Z1 001"],
+        "changed": [cards[3]["id"], cards[11]["id"]],
+        "removed": [removed["id"]],
+    }
+    assert sorted(flattened) == sorted(changes["added"] + changes["changed"])
+    assert_csvs_match(tmp_path, server.dump)
+
+
+def test_sync_rebuilds_csvs_when_columns_change(sync, tmp_path, flattened):
+    with MappingsServer() as server:
+        sync(server)
+        flattened.clear()
+
+        cards = server.dump["cardArraySchema"]["cards"]
+        cards[0]["moves"].append(dict(cards[0]["moves"][0]))
+        changes = sync(server, updated_at=2)
+
+    assert changes["changed"] == [cards[0]["id"]]
+    assert len(flattened) > 1
+    assert_csvs_match(tmp_path, server.dump)
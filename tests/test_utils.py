@@ -2,10 +2,13 @@ import pytest
 from tcg.utils import (
     clean_str,
     parse_energy_cost,
+    parse_energy_costs,
     parse_retreat_cost,
     trim_after_second_parens,
     ENERGY_SYMBOLS,
     RETREAT_COSTS,
+    TYPO_ENERGY_TYPES,
+    UNKNOWN_ENERGY_TYPES,
 )
 
 
@@ -44,6 +47,37 @@ def test_parse_energy_cost(energy_str, expected):
     assert parse_energy_cost(energy_str) == expected
 
 
+# ── parse_energy_costs ─────────────────────────────────────────────────────────
+@pytest.mark.parametrize(
+    "costs, expected",
+    [
+        ("Grass 2:Colorless", ENERGY_SYMBOLS["Grass"] * 2 + ENERGY_SYMBOLS["Colorless"]),
+        ("Water;Psychic", ENERGY_SYMBOLS["Water"] + ENERGY_SYMBOLS["Psychic"]),
+        (" Fire : Metal 2 ", ENERGY_SYMBOLS["Fire"] + ENERGY_SYMBOLS["Metal"] * 2),
+        (["Darkness 2", "Colorless"], ENERGY_SYMBOLS["Darkness"] * 2 + ENERGY_SYMBOLS["Colorless"]),
+        (("Grass X",), ENERGY_SYMBOLS["Grass"]),
+        ([], ""),
+    ],
+)
+def test_parse_energy_costs(costs, expected):
+    assert parse_energy_costs(costs) == expected
+    # cached result
+    assert parse_energy_costs(costs) == expected
+
+
+def test_parse_energy_costs_counts_unknown_and_misspelled_types():
+    UNKNOWN_ENERGY_TYPES.clear()
+    TYPO_ENERGY_TYPES.clear()
+
+    assert parse_energy_costs("Lighting 2:Unknown") == ENERGY_SYMBOLS["Lightning"] * 2 + "?"
+    assert parse_energy_costs("Lighting 2:Unknown") == ENERGY_SYMBOLS["Lightning"] * 2 + "?"
+    assert parse_energy_costs(["Fire", "Unknown 3"]) == ENERGY_SYMBOLS["Fire"] + "???"
+
+    # cached parses are counted too
+    assert UNKNOWN_ENERGY_TYPES == {"Unknown": 3}
+    assert TYPO_ENERGY_TYPES == {"Lighting": 2}
+
+
 # ── parse_retreat_cost ─────────────────────────────────────────────────────────
 @pytest.mark.parametrize(
     "url, expected",
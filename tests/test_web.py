@@ -0,0 +1,118 @@
+import threading
+import time
+import pytest
+import requests
+from tcg import metrics, web
+from tests.server import FixtureServer
+
+
+class FlakyServer(FixtureServer):
+    """Answers the first `failures` requests with `status` before serving pages normally."""
+
+    def __init__(self, failures: int, status: int = 503, retry_after: str | None = None):
+        super().__init__()
+        self.failures = failures
+        self.status = status
+        self.retry_after = retry_after
+
+    def respond(self, path, headers):
+        if self.failures > 0:
+            self.failures -= 1
+            extra = {"Retry-After": self.retry_after} if self.retry_after else {}
+            return self.status, extra, b"Try again later"
+        return super().respond(path, headers)
+
+
+@pytest.fixture
+def client():
+    client = web.HttpClient(max_retries=3, backoff=0.01)
+    previous = web.CLIENT
+    web.set_client(client)
+    yield client
+    web.set_client(previous)
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_transient_statuses_are_retried(client, status):
+    with FlakyServer(failures=2, status=status) as server:
+        response = web.get(server.url("476002"))
+
+        assert response.status_code == 200
+        assert server.statuses == [status, status, 200]
+
+    counts = client.stats_by_host()[server.base.removeprefix("http://")]
+    assert counts["requests"] == 3
+    assert counts["retries"] == 2
+    assert counts["bytes"] >= len(response.content)
+
+
+def test_gives_up_after_max_retries(client):
+    with FlakyServer(failures=10) as server:
+        response = web.get(server.url("476002"))
+
+        assert response.status_code == 503
+        assert len(server.statuses) == client.max_retries + 1
+
+
+def test_not_found_is_not_retried(client):
+    with FixtureServer() as server:
+        with pytest.raises(requests.HTTPError):
+            web.fetch_text(server.url("123456"))
+
+        assert server.statuses == [404]
+
+
+def test_retry_after_is_honored(client):
+    with FlakyServer(failures=1, retry_after="1") as server:
+        start = time.perf_counter()
+        web.get(server.url("476002"))
+
+        assert time.perf_counter() - start >= 1
+
+
+def test_backoff_releases_host_slot(client):
+    metrics.reset()
+    web.set_max_per_host(1)
+    try:
+        with FlakyServer(failures=1, retry_after="1") as server:
+            retried = threading.Thread(target=web.get, args=(server.url("476002"),))
+            retried.start()
+            while not server.statuses:
+                time.sleep(0.01)
+
+            # The only slot is free while the first request waits for its retry
+            start = time.perf_counter()
+            web.get(server.url("476005"))
+            assert time.perf_counter() - start < 0.5
+            retried.join()
+    finally:
+        web.set_max_per_host(8)
+
+    download = metrics.METRICS.by_stage()["download"]
+    assert download["requests"] == download["calls"] == 3
+    assert download["seconds"] < 1
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("3", 3.0), ("0", 0.0), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0), ("soon", None)],
+)
+def test_retry_after_parsing(client, value, expected):
+    response = requests.Response()
+    response.headers["Retry-After"] = value
+
+    assert client.retry_after(response) == expected
+
+
+def test_backoff_is_capped(client):
+    client.max_backoff = 0.05
+    assert all(0 <= client.backoff_delay(attempt) <= 0.05 for attempt in range(20))
+
+
+def test_connections_are_reused(client):
+    with FixtureServer() as server:
+        for ext in ["476002", "476005", "476008"]:
+            web.get(server.url(ext))
+
+        assert len(server.requests) == 3
+        assert len(server.connections) == 1